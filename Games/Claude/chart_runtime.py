@@ -0,0 +1,93 @@
+import numpy as np
+
+
+class ChartRuntime:
+    """The notes of one play-through of a Chart, kept as per-column arrays of target times.
+
+    Each column has its target times sorted, an `alive` mask, a spawn cursor
+    (notes before it are on screen) and a head cursor (notes before it are
+    hit or missed). Spawning and miss expiry only move the cursors forward,
+    and the nearest note to a key press is found by binary search, so the
+    cost per frame doesn't grow with the length of the chart.
+
+    Times are song milliseconds. A note appears `approach_ms` before its
+    target, sits at the top until it starts scrolling, reaches
+    `hit_position` at its target time and is missed once it has scrolled
+    past `height`, matching the old sprite-per-note behaviour.
+    """
+
+    def __init__(self, chart, scroll_speed, hit_position, height, approach_ms):
+        self.scroll_speed = scroll_speed
+        self.hit_position = hit_position
+        self.approach_ms = approach_ms
+        # Pixels per millisecond, and how long after its target a note's (rounded) top passes `height`
+        self.pixels_per_ms = scroll_speed / 10.0
+        self.miss_after_ms = (height + 0.5 - hit_position) / self.pixels_per_ms
+        self.now = 0.0
+
+        times = np.asarray(chart.times, dtype=np.float64)
+        columns = np.asarray(chart.columns)
+        self.times = [np.sort(times[columns == column]) for column in range(chart.num_columns)]
+        self.alive = [np.ones(len(column_times), dtype=bool) for column_times in self.times]
+        self.head = [0] * chart.num_columns
+        self.spawned = [0] * chart.num_columns
+        self.remaining = len(times)  # Notes not yet hit or missed
+
+    def __len__(self):
+        """Notes left to hit or miss."""
+        return self.remaining
+
+    def update(self, now):
+        """Spawns notes that have come into view and returns how many were missed."""
+        self.now = now
+        misses = 0
+        for column, times in enumerate(self.times):
+            self.spawned[column] = int(np.searchsorted(times, now + self.approach_ms, side='right'))
+            head = self.head[column]
+            alive = self.alive[column]
+            expire = now - self.miss_after_ms
+            while head < self.spawned[column] and (not alive[head] or times[head] <= expire):
+                if alive[head]:
+                    alive[head] = False
+                    misses += 1
+                head += 1
+            self.head[column] = head
+        self.remaining -= misses
+        return misses
+
+    def nearest(self, column, now):
+        """Index of the on-screen note in `column` whose target is closest to `now`, or None."""
+        times = self.times[column]
+        alive = self.alive[column]
+        head = self.head[column]
+        end = self.spawned[column]
+        split = head + int(np.searchsorted(times[head:end], now))
+        after = split
+        while after < end and not alive[after]:
+            after += 1
+        before = split - 1
+        while before >= head and not alive[before]:
+            before -= 1
+        candidates = [i for i in (before, after) if head <= i < end]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda i: abs(now - times[i]))
+
+    def target_time(self, column, index):
+        return self.times[column][index]
+
+    def remove(self, column, index):
+        """Marks a note as hit. Removing it again does nothing."""
+        if self.alive[column][index]:
+            self.alive[column][index] = False
+            self.remaining -= 1
+
+    def visible(self):
+        """(column, y) of every note on screen at the last update(), as arrays per column."""
+        for column, times in enumerate(self.times):
+            head, end = self.head[column], self.spawned[column]
+            if head == end:
+                continue
+            alive = self.alive[column][head:end]
+            y = (self.now - times[head:end][alive]) * self.pixels_per_ms + self.hit_position
+            yield column, np.floor(np.maximum(y, 0) + 0.5).astype(np.int32)
@@ -0,0 +1,221 @@
+import os
+import random
+import struct
+import numpy as np
+from asset_cache import params_hash
+from game_log import get_logger
+
+log = get_logger("charts")
+
+# Charts are compiled once per song and difficulty and cached next to the
+# song PCM cache. Bump the version whenever note_map_from_melody picks
+# different notes.
+CHART_VERSION = 1
+CHART_SEED = 2024  # Each chart draws from random.Random(f"{CHART_SEED}:{song}:{difficulty}")
+CHART_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'charts')
+MMAP_THRESHOLD_BYTES = 64 * 1024  # Larger chart files are memory-mapped instead of read
+SECTION_BEATS = 8
+
+# Note letter -> column
+COLUMN_MAP = {
+    'C': 0, 'D': 1, 'E': 2, 'F': 3,
+    'G': 0, 'A': 1, 'B': 2
+}
+
+# Difficulty -> (chance of charting a melody note, minimum gap in beats)
+DIFFICULTY_SETTINGS = {
+    "Easy": (0.6, 1.0),      # One beat
+    "Medium": (0.8, 0.5),    # Half beat
+    "Hard": (1.0, 0.25),     # Quarter beat
+}
+
+# Header: magic, format version, columns, note count, section count, section ms, length ms
+_HEADER = struct.Struct('<4sHHIIII')
+_MAGIC = b'RCHT'
+
+
+def note_map_from_melody(melody, bpm, difficulty, rng=random):
+    """Picks the notes to play from a melody. Returns ([(target ms, column)], length ms).
+
+    Notes are at least the difficulty's minimum gap apart and each is kept
+    with the difficulty's chance, drawn from `rng`.
+    """
+    note_chance, gap_beats = DIFFICULTY_SETTINGS.get(difficulty, DIFFICULTY_SETTINGS["Hard"])
+    min_interval = gap_beats * 60 / bpm
+    note_map = []
+    current_time = 0
+    last_spawn_time = -min_interval
+
+    for note, duration in melody:
+        if (current_time - last_spawn_time) >= min_interval and rng.random() < note_chance:
+            # Target time is when the note should be hit (on the beat)
+            note_map.append((int(current_time * 1000), COLUMN_MAP[note[0]]))
+            last_spawn_time = current_time
+        current_time += duration
+
+    return note_map, current_time * 1000
+
+
+class Chart:
+    """A compiled chart: target times (int32 ms) and columns (uint8) in time order.
+
+    `section_counts` holds how many notes fall in each `section_ms` slice of
+    the song, for density displays and for reviewing charts without playing
+    them.
+    """
+
+    def __init__(self, times, columns, length_ms, section_ms, section_counts=None, num_columns=4):
+        self.times = times
+        self.columns = columns
+        self.length_ms = int(length_ms)
+        self.section_ms = int(section_ms)
+        self.num_columns = num_columns
+        if section_counts is None:
+            sections = max(1, -(-self.length_ms // self.section_ms))
+            section_counts = np.bincount(np.asarray(times) // self.section_ms, minlength=sections).astype(np.uint32)
+        self.section_counts = section_counts
+
+    @classmethod
+    def from_note_map(cls, note_map, length_ms, section_ms, num_columns=4):
+        note_map = sorted(note_map)
+        times = np.array([target for target, _ in note_map], dtype=np.int32)
+        columns = np.array([column for _, column in note_map], dtype=np.uint8)
+        return cls(times, columns, length_ms, section_ms, num_columns=num_columns)
+
+    def __len__(self):
+        return len(self.times)
+
+    def notes_per_second(self):
+        return self.section_counts / (self.section_ms / 1000.0)
+
+    def stats(self):
+        density = self.notes_per_second()
+        return {
+            'notes': len(self),
+            'length_s': self.length_ms / 1000.0,
+            'mean_nps': float(len(self) / max(self.length_ms / 1000.0, 1e-9)),
+            'peak_nps': float(density.max()) if density.size else 0.0,
+            'column_counts': np.bincount(self.columns, minlength=self.num_columns).tolist(),
+        }
+
+    def save(self, path):
+        """Writes the chart as a header followed by the times, columns and section counts."""
+        count = len(self)
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, CHART_VERSION, self.num_columns, count,
+                                 len(self.section_counts), self.section_ms, self.length_ms))
+            f.write(np.asarray(self.times, dtype='<i4').tobytes())
+            f.write(np.asarray(self.columns, dtype=np.uint8).tobytes())
+            f.write(b'\0' * (-count % 4))  # Keep the section counts 4-byte aligned
+            f.write(np.asarray(self.section_counts, dtype='<u4').tobytes())
+
+    @classmethod
+    def load(cls, path):
+        """Reads a chart file, memory-mapping its arrays when the file is large."""
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f"{path} is not a chart file")
+        magic, version, num_columns, count, sections, section_ms, length_ms = _HEADER.unpack(header)
+        if magic != _MAGIC or version != CHART_VERSION:
+            raise ValueError(f"{path} is not a version {CHART_VERSION} chart file")
+
+        times_at = _HEADER.size
+        columns_at = times_at + 4 * count
+        sections_at = columns_at + count + (-count % 4)
+        if os.path.getsize(path) != sections_at + 4 * sections:
+            raise ValueError(f"{path} is truncated")
+        if sections_at + 4 * sections > MMAP_THRESHOLD_BYTES:
+            def read(dtype, offset, n):
+                return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(n,)) if n else np.empty(0, dtype)
+        else:
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            def read(dtype, offset, n):
+                return np.frombuffer(data, dtype=dtype, count=n, offset=offset)
+        return cls(read('<i4', times_at, count), read(np.uint8, columns_at, count), length_ms, section_ms,
+                   read('<u4', sections_at, sections), num_columns)
+
+
+def chart_params(song, difficulty):
+    """Everything that decides a song's chart, for cache keys."""
+    return {
+        'version': CHART_VERSION,
+        'seed': CHART_SEED,
+        'song': song.name,
+        'bpm': song.bpm,
+        'melody': [list(note) for note in song.melody()],
+        'difficulty': difficulty,
+    }
+
+
+def compile_chart(song, difficulty):
+    """Builds the chart for a Song and difficulty. The same inputs always give the same chart."""
+    rng = random.Random(f"{CHART_SEED}:{song.name}:{difficulty}")
+    note_map, length_ms = note_map_from_melody(song.melody(), song.bpm, difficulty, rng)
+    section_ms = int(SECTION_BEATS * 60000 / song.bpm)
+    return Chart.from_note_map(note_map, length_ms, section_ms)
+
+
+class ChartCache:
+    """Compiled charts, loaded lazily from disk and kept in memory once used.
+
+    get() returns the chart for a song and difficulty, reading its file on
+    first use or compiling and saving it when there is none, so restarting
+    a song never regenerates its chart.
+    """
+
+    def __init__(self, cache_dir=CHART_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._charts = {}
+
+    def path(self, song, difficulty):
+        return os.path.join(self.cache_dir, f"{params_hash(chart_params(song, difficulty))}.chart")
+
+    def get(self, song, difficulty):
+        key = (song.name, difficulty)
+        chart = self._charts.get(key)
+        if chart is None:
+            chart = self._load_or_compile(song, difficulty)
+            self._charts[key] = chart
+        return chart
+
+    def _load_or_compile(self, song, difficulty):
+        path = self.path(song, difficulty)
+        try:
+            return Chart.load(path)
+        except (OSError, ValueError):
+            pass
+        chart = compile_chart(song, difficulty)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write under a private name first so a crash never leaves a half-written chart
+            tmp_path = f"{path}.tmp{os.getpid()}"
+            chart.save(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log.warning("Could not write chart cache %s: %s", path, e)
+        return chart
+
+
+_chart_cache = None
+
+
+def get_chart_cache():
+    """Returns the shared ChartCache."""
+    global _chart_cache
+    if _chart_cache is None:
+        _chart_cache = ChartCache()
+    return _chart_cache
+
+
+if __name__ == '__main__':
+    # Compile every bundled chart and print its density, for reviewing charts without playing them
+    import rythmgame
+    for song in rythmgame.SONGS:
+        for difficulty in DIFFICULTY_SETTINGS:
+            chart = get_chart_cache().get(song, difficulty)
+            stats = chart.stats()
+            print(f"{song.name:12} {difficulty:6} {stats['notes']:4d} notes  {stats['mean_nps']:.2f} nps mean  "
+                  f"{stats['peak_nps']:.2f} nps peak  columns {stats['column_counts']}")
@@ -1,5 +1,6 @@
 import pygame
 import numpy as np
+from synth import Arrangement, Envelope, Voice
 
 class MusicGenerator:
     def __init__(self):
@@ -108,34 +109,14 @@ class MusicGenerator:
                                       bass_intense * 4 + 
                                       bass_pattern * 12, 0.125)
 
-        # Generate the audio
+        # Generate the audio in one vectorised pass, mixed in float32 so voices can't overflow
         total_duration = sum(duration for _, duration in melody)
-        buffer = np.zeros((int(total_duration * self.sample_rate), 2), dtype=np.int16)
-
-        # Add melody
-        current_time = 0
-        for note, duration in melody:
-            freq = self.notes[note]
-            wave = self.generate_square_wave(freq, duration, amplitude=0.2)
-            end_time = current_time + len(wave)
-            buffer[current_time:end_time] += np.column_stack((wave, wave))
-            current_time = end_time
-
-        # Add bass
-        current_time = 0
-        for note, duration in bass_line:
-            if current_time >= len(buffer):
-                break
-            freq = self.notes[note]
-            wave = self.generate_square_wave(freq, duration, amplitude=0.15, duty_cycle=0.3)
-            end_time = min(current_time + len(wave), len(buffer))
-            buffer[current_time:end_time] += np.column_stack((wave[:end_time-current_time], wave[:end_time-current_time]))
-            current_time = end_time
-
-        # Normalize to prevent clipping
-        buffer = (buffer * 0.7).astype(np.int16)
+        arrangement = Arrangement([
+            Voice(melody, amplitude=0.2, envelope=Envelope()),
+            Voice(bass_line, amplitude=0.15, duty=0.3, envelope=Envelope(decay=0.1, sustain=0.7, release=0.03)),
+        ], int(total_duration * self.sample_rate), gain=0.7, sample_rate=self.sample_rate)  # Gain prevents clipping
         
-        return pygame.sndarray.make_sound(buffer), total_duration
+        return pygame.sndarray.make_sound(arrangement.render_pcm()), total_duration
 
     def generate_hit_sound(self):
         duration = 0.1
@@ -0,0 +1,291 @@
+"""Offline chart generation from a WAV file.
+
+Streams the file in blocks through a log-magnitude STFT, turns the spectral
+flux into onsets, estimates the tempo and quantises the onsets to it, then
+writes an Easy, Medium and Hard chart in the format charts.py uses:
+
+    python Games/Claude/onset_charts.py song.wav --output-dir charts/
+
+Only the onset envelope (one value per hop) is kept for the whole track, so
+the analysis itself adds only a few MB however long the song is. Importing
+charts.py loads pygame as well, which puts the process at around 50-60 MB.
+"""
+import argparse
+import bisect
+import os
+import sys
+import time
+import wave
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from charts import Chart, DIFFICULTY_SETTINGS, SECTION_BEATS
+
+N_FFT = 1024
+HOP = 512
+BLOCK_FRAMES = 1 << 16  # Samples read from the WAV per block
+LOG_COMPRESSION = 100.0
+
+# Peak picking, in seconds and relative to the 99th percentile of the envelope
+PEAK_WINDOW = 0.03
+MEAN_WINDOW = 0.1
+PEAK_DELTA = 0.05
+MIN_ONSET_GAP = 0.05
+NOISE_FLOOR_MADS = 6  # Onsets must also clear the envelope's median by this many median absolute deviations
+
+MIN_BPM = 60
+MAX_BPM = 200
+PRIOR_BPM = 120
+TEMPO_BATCH = 32
+GRID_DIVISIONS = 4  # Onsets snap to sixteenth notes
+
+
+class OnsetAnalysis:
+    """Onsets of one track: times (s), strengths and spectral centroids (Hz), plus the beat grid."""
+
+    def __init__(self, times, strengths, centroids, bpm, phase, duration):
+        self.times = times
+        self.strengths = strengths
+        self.centroids = centroids
+        self.bpm = bpm
+        self.phase = phase  # Offset of the quantisation grid, in seconds
+        self.duration = duration
+
+
+def read_blocks(path, block_frames=BLOCK_FRAMES):
+    """Yields the WAV's samples as mono float32 blocks in [-1, 1]."""
+    with wave.open(path, 'rb') as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        while True:
+            data = wav.readframes(block_frames)
+            if not data:
+                break
+            yield _to_mono(data, width, channels)
+
+
+def wav_info(path):
+    with wave.open(path, 'rb') as wav:
+        return wav.getframerate(), wav.getnframes()
+
+
+def _to_mono(data, width, channels):
+    if width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768
+    elif width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        ints = (raw[:, 0].astype(np.int32) | (raw[:, 1].astype(np.int32) << 8) | (raw[:, 2].astype(np.int32) << 16))
+        samples = ((ints << 8) >> 8).astype(np.float32) / 8388608
+    elif width == 4:
+        samples = np.frombuffer(data, dtype='<i4').astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported sample width: {width} bytes")
+    return samples.reshape(-1, channels).mean(axis=1)
+
+
+def onset_envelope(blocks, sample_rate, n_fft=N_FFT, hop=HOP):
+    """Spectral flux and spectral centroid per hop, computed block by block.
+
+    Frame k is centred on sample k * hop. The STFT state carried between
+    blocks is the unconsumed tail of samples and the previous frame's
+    log magnitudes.
+    """
+    window = np.hanning(n_fft).astype(np.float32)
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate).astype(np.float32)
+    tail = np.zeros(n_fft // 2, dtype=np.float32)
+    previous = np.zeros(n_fft // 2 + 1, dtype=np.float32)
+    flux_parts = []
+    centroid_parts = []
+
+    def process(samples):
+        nonlocal previous
+        frames = (len(samples) - n_fft) // hop + 1
+        if frames <= 0:
+            return samples
+        windows = np.lib.stride_tricks.sliding_window_view(samples, n_fft)[:frames * hop:hop] * window
+        magnitude = np.abs(np.fft.rfft(windows, axis=1)).astype(np.float32)
+        log_mag = np.log1p(LOG_COMPRESSION * magnitude)
+        diff = np.diff(log_mag, axis=0, prepend=previous[None, :])
+        flux_parts.append(np.maximum(diff, 0).sum(axis=1))
+        centroid_parts.append((magnitude @ freqs) / np.maximum(magnitude.sum(axis=1), 1e-9))
+        previous = log_mag[-1]
+        return samples[frames * hop:]
+
+    for block in blocks:
+        tail = process(np.concatenate((tail, block)))
+    process(np.concatenate((tail, np.zeros(n_fft // 2, dtype=np.float32))))  # Flush the last frames
+
+    if not flux_parts:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+    return np.concatenate(flux_parts), np.concatenate(centroid_parts)
+
+
+def pick_peaks(envelope, frame_rate):
+    """Indices of local maxima that stand out from the local mean, at least MIN_ONSET_GAP apart.
+
+    Most frames are between onsets, so the envelope's median and spread
+    measure the noise floor; peaks that don't clear it are ignored, which
+    keeps hiss in quiet passages from turning into notes.
+    """
+    if envelope.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    median = np.median(envelope)
+    noise_floor = median + NOISE_FLOOR_MADS * np.median(np.abs(envelope - median))
+    scale = np.percentile(envelope, 99) or 1.0
+    env = envelope / scale
+    half_max = max(1, int(PEAK_WINDOW * frame_rate))
+    half_mean = max(1, int(MEAN_WINDOW * frame_rate))
+    padded = np.pad(env, half_max, mode='constant')
+    local_max = np.lib.stride_tricks.sliding_window_view(padded, 2 * half_max + 1).max(axis=1)
+    kernel = np.ones(2 * half_mean + 1, dtype=np.float32) / (2 * half_mean + 1)
+    local_mean = np.convolve(env, kernel, mode='same')
+    candidates = np.flatnonzero((env == local_max) & (env >= local_mean + PEAK_DELTA) & (envelope >= noise_floor))
+
+    gap = max(1, int(MIN_ONSET_GAP * frame_rate))
+    keep = []
+    last = -gap
+    for index in candidates:
+        if index - last >= gap:
+            keep.append(index)
+            last = index
+    return np.array(keep, dtype=np.int64)
+
+
+def estimate_tempo(envelope, frame_rate, onset_times, onset_strengths):
+    """Returns (bpm, grid offset in s).
+
+    A coarse tempo comes from the envelope's autocorrelation, weighted
+    towards PRIOR_BPM to settle octave ambiguity. It is then refined, with
+    the offset, by how coherently the onsets line up with each candidate's
+    GRID_DIVISIONS-per-beat grid; lining up with the grid (rather than the
+    beat) is what quantisation needs, and it still works when onsets fall
+    evenly on every subdivision.
+    """
+    if envelope.size < 2 or onset_times.size == 0:
+        return float(PRIOR_BPM), 0.0
+    centred = envelope - envelope.mean()
+    spectrum = np.fft.rfft(centred, 2 * centred.size)
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum))[:centred.size]
+    lags = np.arange(max(1, int(frame_rate * 60 / MAX_BPM)), min(centred.size, int(frame_rate * 60 / MIN_BPM) + 1))
+    if lags.size == 0:
+        return float(PRIOR_BPM), 0.0
+    bpms = 60 * frame_rate / lags
+    prior = np.exp(-0.5 * np.log2(bpms / PRIOR_BPM) ** 2)
+    coarse = bpms[np.argmax(autocorr[lags] * prior)]
+
+    candidates = np.linspace(coarse * 0.96, coarse * 1.04, 401)
+    steps = 60.0 / candidates / GRID_DIVISIONS
+    resultant = np.empty(candidates.size, dtype=np.complex128)
+    for start in range(0, candidates.size, TEMPO_BATCH):
+        # Batched so the candidates x onsets matrix stays small on long tracks
+        angles = 2 * np.pi * onset_times[None, :] / steps[start:start + TEMPO_BATCH, None]
+        resultant[start:start + TEMPO_BATCH] = (onset_strengths[None, :] * np.exp(1j * angles)).sum(axis=1)
+    best = int(np.argmax(np.abs(resultant)))
+    step = steps[best]
+    phase = (np.angle(resultant[best]) / (2 * np.pi) * step) % step
+    return float(candidates[best]), float(phase)
+
+
+def analyse(path):
+    """Runs the onset and tempo analysis on a WAV file."""
+    sample_rate, total_frames = wav_info(path)
+    flux, centroids = onset_envelope(read_blocks(path), sample_rate)
+    frame_rate = sample_rate / HOP
+    peaks = pick_peaks(flux, frame_rate)
+    times = peaks / frame_rate
+    strengths = flux[peaks].astype(np.float64)
+    bpm, phase = estimate_tempo(flux, frame_rate, times, strengths)
+    return OnsetAnalysis(times, strengths, centroids[peaks], bpm, phase, total_frames / sample_rate)
+
+
+def quantise(analysis, divisions=GRID_DIVISIONS):
+    """Snaps onsets to the beat grid. Returns (times s, strengths, centroids) with one onset per grid slot."""
+    step = 60.0 / analysis.bpm / divisions
+    slots = np.round((analysis.times - analysis.phase) / step).astype(np.int64)
+    order = np.lexsort((-analysis.strengths, slots))  # Strongest onset first within each slot
+    first = np.ones(order.size, dtype=bool)
+    first[1:] = slots[order][1:] != slots[order][:-1]
+    chosen = order[first]
+    times = analysis.phase + slots[chosen] * step
+    valid = times >= 0
+    return times[valid], analysis.strengths[chosen][valid], analysis.centroids[chosen][valid]
+
+
+def select_notes(times, strengths, bpm, difficulty):
+    """Indices of the onsets charted for a difficulty, in time order.
+
+    The strongest onsets are kept first, skipping any closer than the
+    difficulty's minimum gap to one already kept, then the weakest are
+    dropped so the kept fraction matches the difficulty's note chance.
+    """
+    note_chance, gap_beats = DIFFICULTY_SETTINGS[difficulty]
+    min_gap = gap_beats * 60.0 / bpm - 1e-6
+    kept_times = []
+    kept = []
+    for index in np.argsort(-strengths, kind='stable').tolist():
+        t = times[index]
+        position = bisect.bisect_left(kept_times, t)
+        if position > 0 and t - kept_times[position - 1] < min_gap:
+            continue
+        if position < len(kept_times) and kept_times[position] - t < min_gap:
+            continue
+        kept_times.insert(position, t)
+        kept.append(index)
+    kept = kept[:max(1, int(round(len(kept) * note_chance)))] if kept else []
+    return np.sort(np.array(kept, dtype=np.int64))
+
+
+def assign_columns(centroids, num_columns=4):
+    """Columns from brightness: the onsets' spectral centroids split into equal-sized bands."""
+    if centroids.size == 0:
+        return np.zeros(0, dtype=np.uint8)
+    edges = np.quantile(centroids, np.linspace(0, 1, num_columns + 1)[1:-1])
+    return np.searchsorted(edges, centroids, side='right').astype(np.uint8)
+
+
+def build_charts(analysis):
+    """Returns {difficulty: Chart} for every difficulty the game offers."""
+    times, strengths, centroids = quantise(analysis)
+    section_ms = int(SECTION_BEATS * 60000 / analysis.bpm)
+    length_ms = int(analysis.duration * 1000)
+    charts = {}
+    for difficulty in DIFFICULTY_SETTINGS:
+        chosen = select_notes(times, strengths, analysis.bpm, difficulty)
+        columns = assign_columns(centroids[chosen])
+        note_map = list(zip((times[chosen] * 1000).round().astype(int).tolist(), columns.tolist()))
+        charts[difficulty] = Chart.from_note_map(note_map, length_ms, section_ms)
+    return charts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate rhythm game charts from a WAV file")
+    parser.add_argument('wav', help='16-bit (or 8/24/32-bit) PCM WAV file')
+    parser.add_argument('--output-dir', help='where to write <name>.<difficulty>.chart (default: next to the WAV)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        analysis = analyse(args.wav)
+    except (wave.Error, EOFError, ValueError) as e:
+        parser.error(f"can't read {args.wav}: {str(e) or 'the file is empty'}")
+    charts = build_charts(analysis)
+    elapsed = time.perf_counter() - start
+
+    output_dir = args.output_dir or os.path.dirname(os.path.abspath(args.wav))
+    os.makedirs(output_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(args.wav))[0]
+    print(f"{name}: {analysis.duration:.1f}s, {analysis.times.size} onsets, {analysis.bpm:.1f} BPM "
+          f"(grid offset {analysis.phase * 1000:.0f} ms), analysed in {elapsed:.2f}s")
+    for difficulty, chart in charts.items():
+        path = os.path.join(output_dir, f"{name}.{difficulty.lower()}.chart")
+        chart.save(path)
+        stats = chart.stats()
+        print(f"  {difficulty:6} {stats['notes']:5d} notes  {stats['mean_nps']:.2f} nps mean  "
+              f"{stats['peak_nps']:.2f} nps peak  -> {path}")
+
+
+if __name__ == '__main__':
+    main()
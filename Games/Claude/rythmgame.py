@@ -1,10 +1,19 @@
 from typing import Dict, List, Optional
 import pygame
-import random
 import numpy as np
 import json
 import math
-from gpio_manager import read_gpio_input
+import os
+from gpio_manager import poll_input
+from profiler import profiler
+from text_cache import render_text, get_font
+import procedural
+from synth import Arrangement, Envelope, Voice, SAMPLE_RATE
+from song_cache import get_song_cache, mixer_matches
+from song_stream import SongStream
+from song_clock import SongClock
+from chart_runtime import ChartRuntime
+from charts import get_chart_cache
 
 running = True
 
@@ -62,29 +71,16 @@ KEY_MAP = {
     pygame.K_k: 3
 }
 
-def generate_square_wave(frequency, duration, amplitude=0.3, duty_cycle=0.5):
-    sample_rate = 44100
-    num_samples = int(duration * sample_rate)
-    t = np.linspace(0, duration, num_samples, False)
-    wave = (np.sin(2 * np.pi * frequency * t) > -duty_cycle) * 2 - 1
-    return (wave * amplitude * 32767).astype(np.int16)
-
 def create_section(notes, pattern, durations, base_octave=4):
     return [(f"{note}{base_octave + octave}", dur) 
             for note, octave, dur in zip(pattern, durations[0], durations[1])]
 
-def generate_music(melody):
-    """Generate music from melody pattern"""
-    notes = {
-        'C3': 130.81, 'D3': 146.83, 'E3': 164.81, 'F3': 174.61,
-        'G3': 196.00, 'A3': 220.00, 'B3': 246.94,
-        'C4': 261.63, 'D4': 293.66, 'E4': 329.63, 'F4': 349.23,
-        'G4': 392.00, 'A4': 440.00, 'B4': 493.88,
-        'C5': 523.25, 'D5': 587.33, 'E5': 659.25, 'F5': 698.46,
-        'G5': 783.99, 'A5': 880.00, 'B5': 987.77,
-        'C6': 1046.50
-    }
-    
+# Short attack and release so notes start and stop without clicks
+MELODY_ENVELOPE = Envelope(attack=0.005, decay=0.05, sustain=0.8, release=0.02)
+BASS_ENVELOPE = Envelope(attack=0.005, decay=0.1, sustain=0.7, release=0.03)
+
+def build_arrangement(melody):
+    """Melody plus a steady bass line, ready to be rendered by the synth"""
     # Bass line with steady rhythm
     base_duration = melody[0][1]  # Use first note's duration as reference
     half_note = base_duration * 2
@@ -101,37 +97,32 @@ def generate_music(melody):
     num_repeats = int(total_melody_duration / bass_pattern_duration) + 1
     bass_line = bass_pattern * num_repeats
     
-    sample_rate = 44100
+    voices = [
+        Voice(melody, amplitude=0.15, envelope=MELODY_ENVELOPE),
+        Voice(bass_line, amplitude=0.1, duty=0.3, envelope=BASS_ENVELOPE),  # Bass with lower amplitude
+    ]
+    # 0.8 gain leaves headroom so the mix doesn't clip
+    return Arrangement(voices, int(total_melody_duration * SAMPLE_RATE), gain=0.8)
+
+def generate_music(melody, stream=None):
+    """Generate music from melody pattern.
+
+    Songs played before load from the on-disk PCM cache. Otherwise the song
+    is streamed while it renders (and cached once it has), unless `stream`
+    is False or ARCADE_SONG_STREAM=0.
+    """
+    if stream is None:
+        stream = os.environ.get('ARCADE_SONG_STREAM', '1') != '0'
+    arrangement = build_arrangement(melody)
     total_duration = sum(duration for _, duration in melody)
-    buffer_size = int(total_duration * sample_rate)
-    buffer = np.zeros((buffer_size, 2), dtype=np.int16)
-    
-    # Add melody
-    current_time = 0
-    for note, duration in melody:
-        freq = notes[note]
-        wave = generate_square_wave(freq, duration, amplitude=0.15)
-        end_time = min(current_time + len(wave), buffer_size)
-        if end_time > current_time:
-            buffer[current_time:end_time] += np.column_stack((wave[:end_time-current_time], wave[:end_time-current_time]))
-        current_time = end_time
-    
-    # Add bass with lower amplitude
-    current_time = 0
-    for note, duration in bass_line:
-        if current_time >= buffer_size:
-            break
-        freq = notes[note]
-        wave = generate_square_wave(freq, duration, amplitude=0.1, duty_cycle=0.3)
-        end_time = min(current_time + len(wave), buffer_size)
-        if end_time > current_time:
-            buffer[current_time:end_time] += np.column_stack((wave[:end_time-current_time], wave[:end_time-current_time]))
-        current_time = end_time
-    
-    # Normalize to prevent clipping
-    buffer = (buffer * 0.8).astype(np.int16)
-    
-    return pygame.sndarray.make_sound(buffer), total_duration, melody
+    cache = get_song_cache()
+    music = cache.load(arrangement)
+    if music is None:
+        if stream and mixer_matches(arrangement):
+            music = SongStream(arrangement, on_complete=lambda pcm: cache.store(arrangement, pcm))
+        else:
+            music = cache.render_and_store(arrangement)
+    return music, total_duration, melody
 
 
 class Song:
@@ -140,6 +131,13 @@ class Song:
         self.bpm = bpm
         self.base_duration = base_duration
         self.melody_func = melody_func
+        self._melody = None
+
+    def melody(self):
+        """The song's note list, built once"""
+        if self._melody is None:
+            self._melody = self.melody_func()
+        return self._melody
 
 def create_slow_melody():
     base_duration = 0.25  # Quarter note at 120 BPM
@@ -295,66 +293,6 @@ HIT_POSITION = HEIGHT - 100
 MIN_SCROLL_SPEED = 2
 MAX_SCROLL_SPEED = 10
 
-class Note(pygame.sprite.Sprite):
-    def __init__(self, column, speed, target_time):
-        super().__init__()
-        self.image = pygame.Surface((90, 20))
-        self.image.fill(GRAY)
-        self.rect = self.image.get_rect()
-        self.rect.x = PLAY_AREA_LEFT + (column * 100)
-        self.rect.y = 0
-        self.column = column
-        self.speed = speed
-        self.target_time = target_time
-        self.spawn_time = target_time - ((HIT_POSITION / (speed * 100)) * 1000)
-        self.hit_status = None
-        
-    def update(self, current_time):
-        time_since_spawn = current_time - self.spawn_time
-        if time_since_spawn >= 0:
-            self.rect.y = (time_since_spawn / 1000.0) * (self.speed * 100)
-            if self.rect.top > HEIGHT and not self.hit_status:
-                self.hit_status = "MISS"
-                return "MISS"  # Let the game state handle scoring
-        return None
-
-def generate_note_map(melody, song, difficulty):
-    note_map = []
-    current_time = 0
-    
-    # Adjust timing based on song's BPM
-    if difficulty == "Easy":
-        note_chance = 0.6
-        min_interval = 60 / song.bpm  # One beat
-    elif difficulty == "Medium":
-        note_chance = 0.8
-        min_interval = 30 / song.bpm  # Half beat
-    else:  # Hard
-        note_chance = 1.0
-        min_interval = 15 / song.bpm  # Quarter beat
-    
-    last_spawn_time = -min_interval
-    
-    for note, duration in melody:
-        ms_time = int(current_time * 1000)
-        
-        if (current_time - last_spawn_time) >= min_interval and random.random() < note_chance:
-            note_name = note[0]
-            column_map = {
-                'C': 0, 'D': 1, 'E': 2, 'F': 3,
-                'G': 0, 'A': 1, 'B': 2
-            }
-            column = column_map[note_name]
-            
-            # Target time is when the note should be hit (on the beat)
-            target_time = ms_time
-            note_map.append((target_time, column))
-            last_spawn_time = current_time
-            
-        current_time += duration
-    
-    return note_map, current_time * 1000
-
 class ScoreTracker:
     def __init__(self):
         self.score = 0
@@ -418,10 +356,10 @@ class GameState:
         self.current_state = STATE_MENU
         self.previous_state = None
         self.score_tracker = ScoreTracker()
-        self.notes = pygame.sprite.Group()
-        self.waiting_notes = []
-        self.game_start_time = 0
+        self.chart = None  # ChartRuntime for the song being played
+        self.clock = SongClock()  # Song time for spawning, scrolling and judging notes
         self.current_song = None
+        self.music = None  # Sound or SongStream for the current song
         
         # Menu state
         self.difficulties = ["Easy", "Medium", "Hard"]
@@ -432,7 +370,6 @@ class GameState:
         self.pause_options = ["Restart", "Exit to Menu"]  # Remove Resume option
         self.selected_pause_option = 0
         self.music_position = 0  # Track music position for pausing
-        self.music_start_timer = 0  # Track when to start music
         self.song_finished = False  # Track if song is complete
 
 def create_melody():
@@ -441,31 +378,6 @@ def create_melody():
     """
     return create_slow_melody()  # Use slow melody as default
 
-def update(game_state, notes, waiting_notes, scroll_speed, score_tracker, current_time, song_duration):
-    """Updates game logic"""
-    
-    if game_state.current_state == STATE_PLAY:
-        # Update notes
-        for note in notes.sprites():
-            result = note.update(current_time) 
-            if result == "MISS":
-                score_tracker.combo = 0
-                score_tracker.misses += 1
-                note.kill()
-                
-        # Spawn new notes if available
-        if waiting_notes:
-            while waiting_notes and waiting_notes[0][0] - (APPROACH_TIME * 1000) <= current_time:
-                target_time, column = waiting_notes.pop(0)
-                new_note = Note(column, scroll_speed, target_time)
-                notes.add(new_note)
-            
-        # Check if song finished
-        if current_time >= song_duration * 1000 and not notes and not waiting_notes:
-            game_state.current_state = STATE_RESULTS
-            
-    return game_state.current_state
-
 def render(screen, game_state, notes, score_tracker, menu_font):
     """Renders game graphics"""
     # Draw background
@@ -493,22 +405,18 @@ def render(screen, game_state, notes, score_tracker, menu_font):
                         (PLAY_AREA_LEFT, HIT_POSITION),
                         (PLAY_AREA_LEFT + PLAY_WIDTH, HIT_POSITION), 2)
         
-        # Draw notes with neon effect
-        if notes:
-            for note in notes:
-                pygame.draw.rect(screen, VAPORWAVE_BLUE, 
-                               note.rect.inflate(4, 4))
-                pygame.draw.rect(screen, WHITE,
-                               note.rect)
+        # Draw notes with neon effect, all in one batch
+        if notes is not None:
+            note_image = get_note_image()
+            screen.blits([(note_image, (PLAY_AREA_LEFT + column * 100 - 2, y - 2))
+                          for column, ys in notes.visible() for y in ys.tolist()], doreturn=False)
         
         # Draw UI elements with vaporwave style
-        score_text = menu_font.render(f"Score: {score_tracker.score}", 
-                                    True, VAPORWAVE_PINK)
+        score_text = render_text(menu_font, f"Score: {score_tracker.score}", VAPORWAVE_PINK)
         screen.blit(score_text, (10, 10))
         
         if score_tracker.combo > 0:
-            combo_text = menu_font.render(str(score_tracker.combo), 
-                                        True, VAPORWAVE_BLUE)
+            combo_text = render_text(menu_font, str(score_tracker.combo), VAPORWAVE_BLUE)
             combo_pos = (WIDTH//2 - combo_text.get_width()//2, 
                         HEIGHT//2 - 50)
             screen.blit(combo_text, combo_pos)
@@ -519,7 +427,7 @@ def render(screen, game_state, notes, score_tracker, menu_font):
                       score_tracker.great_hits * 75 + 
                       score_tracker.good_hits * 50) / 
                       (score_tracker.total_notes * 100)) * 100
-            acc_text = menu_font.render(f"{accuracy:.1f}%", True, VAPORWAVE_BLUE)
+            acc_text = render_text(menu_font, f"{accuracy:.1f}%", VAPORWAVE_BLUE)
             screen.blit(acc_text, (WIDTH - acc_text.get_width() - 10, 10))
 
 def handle_menu_input(event, game_state):
@@ -549,19 +457,15 @@ def calculate_music_delay(scroll_speed):
 # First, create a helper function to handle song start (add this before main()):
 def start_song(game_state):
     """Helper function to start/restart songs with consistent behavior"""
-    game_state.notes.empty()
     game_state.score_tracker.reset()
-    game_state.waiting_notes = generate_note_map(
-        game_state.current_song.melody_func(),
-        game_state.current_song,
-        game_state.difficulties[game_state.selected_difficulty]
-    )[0]
+    # Charts are compiled once per song and difficulty, then loaded from the chart cache
+    chart = get_chart_cache().get(game_state.current_song, game_state.difficulties[game_state.selected_difficulty])
+    game_state.chart = ChartRuntime(chart, game_state.scroll_speed, HIT_POSITION, HEIGHT, APPROACH_TIME * 1000)
     
     # Calculate delay based on current scroll speed
     music_delay = calculate_music_delay(game_state.scroll_speed)
     
-    game_state.game_start_time = pygame.time.get_ticks() + music_delay
-    game_state.music_start_timer = pygame.time.get_ticks() + music_delay
+    game_state.clock.start(music_delay)
     game_state.current_state = STATE_PLAY
 
 def main():
@@ -573,11 +477,14 @@ def main():
     resources = ResourceManager()
     resources.load_game_sounds()
     game_state = GameState(resources)
-    menu_font = pygame.font.Font(None, 36)
+    menu_font = get_font(None, 36)
     
     running = True
+    profiler.start_session("rhythm")
     while running:
-        gpio_states = read_gpio_input()
+        profiler.tick()
+        with profiler.scope("input"):
+            gpio_states = poll_input().pressed
         if gpio_states.get("esc"):
             running = False
         elif gpio_states.get("select"):
@@ -586,16 +493,18 @@ def main():
                     return  # Exit main() so control goes back to main.py
                 else:
                     game_state.current_song = SONGS[game_state.selected_song_index]
-                    melody = game_state.current_song.melody_func()
+                    melody = game_state.current_song.melody()
                     game_state.music, duration, _ = generate_music(melody)
+                    if isinstance(game_state.music, SongStream):
+                        game_state.music.on_chunk_started = game_state.clock.sync
                     start_song(game_state)
             elif game_state.current_state == STATE_PLAY:
                 if gpio_states.get("pause"):
                     game_state.current_state = STATE_PAUSE
-                    game_state.music_position = pygame.time.get_ticks() - game_state.game_start_time
+                    game_state.music_position = game_state.clock.now()
                     game_state.music.stop()
                 elif gpio_states.get("hit"):
-                    handle_note_hit(gpio_states.get("hit"), game_state, game_state.notes, game_state.score_tracker)
+                    handle_note_hit(gpio_states.get("hit"), game_state, game_state.chart, game_state.score_tracker)
             elif game_state.current_state == STATE_PAUSE:
                 if gpio_states.get("up"):
                     game_state.selected_pause_option = (game_state.selected_pause_option - 1) % len(game_state.pause_options)
@@ -606,41 +515,33 @@ def main():
                         start_song(game_state)
                     elif game_state.selected_pause_option == 1:  # Exit to Menu
                         game_state.current_state = STATE_MENU
-                        game_state.notes.empty()
+                        game_state.chart = None
                         game_state.score_tracker.reset()
                         game_state.music.stop()
         
         # Update game state
         if game_state.current_state == STATE_PLAY:
-            current_time = pygame.time.get_ticks() - game_state.game_start_time
-            
-            # Handle music start delay
-            if game_state.music_start_timer and pygame.time.get_ticks() >= game_state.music_start_timer:
-                game_state.music.play()
-                game_state.music_start_timer = 0
-            
-            # Spawn new notes
-            while game_state.waiting_notes and game_state.waiting_notes[0][0] - (APPROACH_TIME * 1000) <= current_time:
-                target_time, column = game_state.waiting_notes.pop(0)
-                new_note = Note(column, game_state.scroll_speed, target_time)
-                game_state.notes.add(new_note)
+            with profiler.scope("update"):
+                # Handle music start delay
+                if game_state.clock.music_due():
+                    game_state.music.play()
+                    game_state.clock.music_started()
+                if isinstance(game_state.music, SongStream):
+                    game_state.music.update()
+                current_time = game_state.clock.now()
             
-            # Update existing notes
-            for note in game_state.notes:
-                result = note.update(current_time)
-                if result == "MISS":
+                # Spawn notes coming into view and expire the ones that scrolled past
+                for _ in range(game_state.chart.update(current_time)):
                     game_state.score_tracker.combo = 0
                     game_state.score_tracker.misses += 1
                     game_state.score_tracker.add_hit("MISS", 0)  # Add the miss to score tracking
-                    note.kill()
             
-            # Check for song completion
-            if (not game_state.waiting_notes and 
-                not game_state.notes and 
-                not game_state.music_start_timer and 
-                current_time >= duration * 1000):
-                game_state.current_state = STATE_RESULTS
-                game_state.song_finished = True
+                # Check for song completion
+                if (not game_state.chart and 
+                    game_state.clock.started and 
+                    current_time >= duration * 1000):
+                    game_state.current_state = STATE_RESULTS
+                    game_state.song_finished = True
         
         elif game_state.current_state == STATE_RESULTS:
             if gpio_states.get("select"):
@@ -649,26 +550,31 @@ def main():
                 game_state.song_finished = False
 
         # Render current state
-        screen.fill((0, 0, 0))
+        with profiler.scope("draw"):
+            screen.fill((0, 0, 0))
         
-        if game_state.current_state == STATE_MENU:
-            draw_menu(screen, menu_font, game_state.difficulties, 
-                     game_state.selected_difficulty, game_state.scroll_speed, 
-                     game_state.selected_song_index, game_state.selected_menu_item)
+            if game_state.current_state == STATE_MENU:
+                draw_menu(screen, menu_font, game_state.difficulties, 
+                         game_state.selected_difficulty, game_state.scroll_speed, 
+                         game_state.selected_song_index, game_state.selected_menu_item)
         
-        elif game_state.current_state == STATE_PLAY:
-            render(screen, game_state, game_state.notes, game_state.score_tracker, menu_font)
+            elif game_state.current_state == STATE_PLAY:
+                render(screen, game_state, game_state.chart, game_state.score_tracker, menu_font)
         
-        elif game_state.current_state == STATE_PAUSE:
-            draw_pause_menu(screen, menu_font, game_state.pause_options, 
-                          game_state.selected_pause_option)
+            elif game_state.current_state == STATE_PAUSE:
+                draw_pause_menu(screen, menu_font, game_state.pause_options, 
+                              game_state.selected_pause_option)
         
-        elif game_state.current_state == STATE_RESULTS:
-            draw_results_screen(screen, game_state.score_tracker, menu_font)
+            elif game_state.current_state == STATE_RESULTS:
+                draw_results_screen(screen, game_state.score_tracker, menu_font)
         
-        pygame.display.flip()
+        profiler.draw_overlay(screen)
+        with profiler.scope("flip"):
+            pygame.display.flip()
         clock.tick(60)
 
+    if game_state.music is not None:
+        game_state.music.stop()  # Also stops a streaming song's render thread
     pygame.quit()
 
 def draw_menu(screen, font, difficulties, selected_difficulty, scroll_speed, selected_song_index, selected_menu_item):
@@ -678,8 +584,8 @@ def draw_menu(screen, font, difficulties, selected_difficulty, scroll_speed, sel
     screen.blit(background, (0, 0))
     
     # Title with neon effect (moved up)
-    title = font.render("RHYTHM GAME", True, VAPORWAVE_PINK)
-    title_shadow = font.render("RHYTHM GAME", True, VAPORWAVE_BLUE)
+    title = render_text(font, "RHYTHM GAME", VAPORWAVE_PINK)
+    title_shadow = render_text(font, "RHYTHM GAME", VAPORWAVE_BLUE)
     screen.blit(title_shadow, (WIDTH//2 - title.get_width()//2 + 2, 70))
     screen.blit(title, (WIDTH//2 - title.get_width()//2, 68))
     
@@ -690,7 +596,7 @@ def draw_menu(screen, font, difficulties, selected_difficulty, scroll_speed, sel
             pygame.draw.rect(screen, (40, 40, 80), (WIDTH//4, song_y, WIDTH//2, 30))
         prefix = "> " if (i == selected_song_index and selected_menu_item == 0) else "  "
         color = WHITE if i == selected_song_index else GRAY
-        text = font.render(prefix + song.name, True, color)
+        text = render_text(font, prefix + song.name, color)
         screen.blit(text, (WIDTH//2 - text.get_width()//2, song_y))
     
     # Settings section moved upward
@@ -700,24 +606,24 @@ def draw_menu(screen, font, difficulties, selected_difficulty, scroll_speed, sel
     # Difficulty option
     diff_y = settings_y + 15
     prefix = "> " if selected_menu_item == 1 else "  "
-    diff_text = font.render(prefix + f"Difficulty: {difficulties[selected_difficulty]}", True, WHITE)
+    diff_text = render_text(font, prefix + f"Difficulty: {difficulties[selected_difficulty]}", WHITE)
     screen.blit(diff_text, (WIDTH//2 - diff_text.get_width()//2, diff_y))
     
     # Speed option
     speed_y = diff_y + 50
     prefix = "> " if selected_menu_item == 2 else "  "
-    speed_text = font.render(prefix + f"Scroll Speed: {scroll_speed}", True, WHITE)
+    speed_text = render_text(font, prefix + f"Scroll Speed: {scroll_speed}", WHITE)
     screen.blit(speed_text, (WIDTH//2 - speed_text.get_width()//2, speed_y))
     
     # Return to Main Menu option
     exit_y = speed_y + 50
     prefix = "> " if selected_menu_item == 3 else "  "
-    exit_text = font.render(prefix + "Return to Main Menu", True, WHITE)
+    exit_text = render_text(font, prefix + "Return to Main Menu", WHITE)
     screen.blit(exit_text, (WIDTH//2 - exit_text.get_width()//2, exit_y))
     
     # Instructions at bottom
     pygame.draw.rect(screen, (40, 40, 80), (0, HEIGHT - 60, WIDTH, 60))
-    instruction = font.render("Press ENTER to start", True, WHITE)
+    instruction = render_text(font, "Press ENTER to start", WHITE)
     screen.blit(instruction, (WIDTH//2 - instruction.get_width()//2, HEIGHT - 40))
 
 def draw_pause_menu(screen, font, options, selected_option):
@@ -735,7 +641,7 @@ def draw_pause_menu(screen, font, options, selected_option):
     pygame.draw.rect(screen, WHITE, menu_rect, 2)
     
     # Pause title
-    title = font.render("PAUSED", True, WHITE)
+    title = render_text(font, "PAUSED", WHITE)
     screen.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//2 - 80))
     pygame.draw.line(screen, WHITE, 
                     (WIDTH//2 - 100, HEIGHT//2 - 40),
@@ -747,13 +653,13 @@ def draw_pause_menu(screen, font, options, selected_option):
             pygame.draw.rect(screen, (60, 60, 100), 
                            (WIDTH//4 + 20, HEIGHT//2 + i*50 - 10, WIDTH//2 - 40, 40))
         color = WHITE if i == selected_option else GRAY
-        text = font.render(option, True, color)
+        text = render_text(font, option, color)
         screen.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 + i*50))
 
 def draw_results(screen, font, score_tracker):
     """Draw the results screen"""
     # Results title
-    title = font.render("Results", True, WHITE)
+    title = render_text(font, "Results", WHITE)
     screen.blit(title, (WIDTH//2 - title.get_width()//2, 100))
     
     # Score breakdown
@@ -767,7 +673,7 @@ def draw_results(screen, font, score_tracker):
     ]
     
     for i, stat in enumerate(stats):
-        text = font.render(stat, True, WHITE)
+        text = render_text(font, stat, WHITE)
         screen.blit(text, (WIDTH//2 - text.get_width()//2, 200 + i*50))
 
 def handle_note_hit(key, game_state, notes, score_tracker):
@@ -776,16 +682,13 @@ def handle_note_hit(key, game_state, notes, score_tracker):
         return
         
     column = KEY_MAP[key]
-    current_time = pygame.time.get_ticks() - game_state.game_start_time
+    current_time = game_state.clock.now()
     
-    # Find closest note in column
-    column_notes = [note for note in notes if note.column == column]
-    if not column_notes:
+    # Find closest on-screen note in column
+    closest_note = notes.nearest(column, current_time)
+    if closest_note is None:
         return
-        
-    closest_note = min(column_notes, 
-                      key=lambda n: abs(current_time - n.target_time))
-    time_diff = abs(current_time - closest_note.target_time)
+    time_diff = abs(current_time - notes.target_time(column, closest_note))
     
     # Determine hit quality
     if time_diff <= PERFECT_WINDOW:
@@ -807,11 +710,11 @@ def handle_note_hit(key, game_state, notes, score_tracker):
         score_tracker.max_combo = max(score_tracker.max_combo, score_tracker.combo)
         score_tracker.add_hit(hit_type, score)
         game_state.resources.sounds['hit'].play()
-        closest_note.kill()
+        notes.remove(column, closest_note)
     else:
         score_tracker.combo = 0
         score_tracker.add_hit(hit_type, 0)  # Add this line to count misses
-        closest_note.kill()
+        notes.remove(column, closest_note)
 
 
 
@@ -852,15 +755,15 @@ def draw_results_screen(screen, score_tracker, font):
     pygame.draw.rect(screen, VAPORWAVE_PINK, box_rect, 2)
     
     # Title with glow effect
-    title = font.render("RESULTS", True, VAPORWAVE_PINK)
-    title_glow = font.render("RESULTS", True, VAPORWAVE_BLUE)
+    title = render_text(font, "RESULTS", VAPORWAVE_PINK)
+    title_glow = render_text(font, "RESULTS", VAPORWAVE_BLUE)
     screen.blit(title_glow, (WIDTH//2 - title.get_width()//2 + 2, HEIGHT//6 + 22))
     screen.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//6 + 20))
     
     # Grade display
-    grade_font = pygame.font.Font(None, 120)
-    grade_text = grade_font.render(grade, True, VAPORWAVE_PINK)
-    grade_glow = grade_font.render(grade, True, VAPORWAVE_BLUE)
+    grade_font = get_font(None, 120)
+    grade_text = render_text(grade_font, grade, VAPORWAVE_PINK)
+    grade_glow = render_text(grade_font, grade, VAPORWAVE_BLUE)
     screen.blit(grade_glow, (WIDTH//2 - grade_text.get_width()//2 + 2, HEIGHT//6 + 82))
     screen.blit(grade_text, (WIDTH//2 - grade_text.get_width()//2, HEIGHT//6 + 80))
     
@@ -873,13 +776,13 @@ def draw_results_screen(screen, score_tracker, font):
     
     start_y = HEIGHT//2
     for i, stat in enumerate(stats):
-        text = font.render(stat, True, VAPORWAVE_PINK)
+        text = render_text(font, stat, VAPORWAVE_PINK)
         screen.blit(text, (WIDTH//2 - text.get_width()//2, start_y + i*40))
     
     # Continue prompt with pulsing effect
     time = pygame.time.get_ticks()
     alpha = int(abs(math.sin(time/500)) * 255)
-    prompt = font.render("Press Enter to continue", True, VAPORWAVE_PINK)
+    prompt = render_text(font, "Press Enter to continue", VAPORWAVE_PINK).copy()  # Cached text is shared
     prompt.set_alpha(alpha)
     screen.blit(prompt, (WIDTH//2 - prompt.get_width()//2, HEIGHT - 60))
 
@@ -890,30 +793,23 @@ VAPORWAVE_PURPLE = (148, 0, 211)
 CYBER_GRID = (40, 0, 80)
 
 def create_background():
-    """Create stylized background with city and grid"""
-    background = pygame.Surface((WIDTH, HEIGHT))
-    
-    # Gradient sky
-    for y in range(HEIGHT):
-        color = (
-            int(40 + (y/HEIGHT) * 20),  # R
-            int((y/HEIGHT) * 89),        # G
-            int(80 + (y/HEIGHT) * 145)   # B
-        )
-        pygame.draw.line(background, color, (0, y), (WIDTH, y))
-    
-    # Cyber grid
-    grid_spacing = 40
-    for x in range(0, WIDTH, grid_spacing):
-        pygame.draw.line(background, VAPORWAVE_PURPLE, 
-                        (x, HEIGHT//2), (WIDTH//2, HEIGHT),
-                        1)
-    for x in range(WIDTH, 0, -grid_spacing):
-        pygame.draw.line(background, VAPORWAVE_PURPLE,
-                        (x, HEIGHT//2), (WIDTH//2, HEIGHT),
-                        1)
-    
-    return background
+    """Create stylized background with city and grid (built once, then shared)"""
+    return procedural.build(
+        (WIDTH, HEIGHT),
+        procedural.gradient(((40, 0, 80), (60, 89, 225))),  # Gradient sky
+        procedural.converging_lines(VAPORWAVE_PURPLE, 40, HEIGHT // 2, (WIDTH // 2, HEIGHT)),  # Cyber grid
+    )
+
+_note_image = None
+
+def get_note_image():
+    """One note with its neon outline, shared by every note on screen"""
+    global _note_image
+    if _note_image is None:
+        _note_image = pygame.Surface((94, 24))
+        _note_image.fill(VAPORWAVE_BLUE)
+        _note_image.fill(WHITE, (2, 2, 90, 20))
+    return _note_image
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
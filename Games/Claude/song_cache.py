@@ -0,0 +1,129 @@
+import os
+import numpy as np
+import pygame
+from asset_cache import params_hash
+from game_log import get_logger
+
+log = get_logger("song_cache")
+
+SONG_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'songs')
+SONG_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Bump when synth.py changes how a given arrangement sounds
+SYNTH_VERSION = 1
+
+
+class SongCache:
+    """Rendered songs kept on disk as raw interleaved int16 stereo, keyed by a hash of the arrangement.
+
+    A hit memory-maps the file and hands it straight to pygame.mixer.Sound,
+    so a song that has been played before starts without synthesising
+    anything. File modification times track recency, and the least recently
+    played songs are removed once the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=SONG_CACHE_DIR, max_bytes=SONG_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, arrangement):
+        return params_hash({'synth_version': SYNTH_VERSION, **arrangement.key()})
+
+    def path(self, arrangement):
+        return os.path.join(self.cache_dir, f"{self.key(arrangement)}.pcm")
+
+    def get_sound(self, arrangement):
+        """Returns a Sound for the arrangement, rendering and storing it on a miss."""
+        sound = self.load(arrangement) if mixer_matches(arrangement) else None
+        return sound if sound is not None else self.render_and_store(arrangement)
+
+    def render_and_store(self, arrangement):
+        """Renders the arrangement into a Sound and caches it, for callers that already missed in load()."""
+        pcm = arrangement.render_pcm()
+        if not mixer_matches(arrangement):
+            # The raw files are only valid for a matching mixer format
+            return pygame.sndarray.make_sound(pcm)
+        self.store(arrangement, pcm)
+        return pygame.mixer.Sound(buffer=pcm)
+
+    def load(self, arrangement):
+        """Returns the cached Sound for the arrangement, or None on a miss."""
+        sound = None
+        if mixer_matches(arrangement):
+            sound = self._load(self.path(arrangement), arrangement.total_samples)
+        if sound is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return sound
+
+    def store(self, arrangement, pcm):
+        """Saves rendered int16 stereo samples for the arrangement. Safe to call from a worker thread."""
+        path = self.path(arrangement)
+        try:
+            self._store(path, pcm)
+        except OSError as e:
+            log.warning("Could not write song cache %s: %s", path, e)
+
+    def _load(self, path, total_samples):
+        try:
+            if os.path.getsize(path) != total_samples * 4:
+                return None
+            pcm = np.memmap(path, dtype=np.int16, mode='r')
+            sound = pygame.mixer.Sound(buffer=pcm)
+            os.utime(path)  # Mark as recently played for eviction
+            return sound
+        except (OSError, ValueError, pygame.error):
+            return None
+
+    def _store(self, path, pcm):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write under a private name first so a crash never leaves a truncated song behind
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        pcm.tofile(tmp_path)
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        """Removes least recently played songs until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pcm'):
+                continue
+            entry = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(entry)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            try:
+                os.remove(entry)
+                total -= size
+            except OSError:
+                pass
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+def mixer_matches(arrangement):
+    """True when the mixer plays int16 stereo at the arrangement's sample rate."""
+    return pygame.mixer.get_init() == (arrangement.sample_rate, -16, 2)
+
+
+_song_cache = None
+
+
+def get_song_cache():
+    """Returns the shared SongCache."""
+    global _song_cache
+    if _song_cache is None:
+        _song_cache = SongCache()
+    return _song_cache
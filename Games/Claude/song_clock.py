@@ -0,0 +1,79 @@
+import os
+import time
+from collections import deque
+
+# pygame 2's default mixer buffer; one buffer is being filled while another plays
+MIXER_BUFFER_SAMPLES = 512
+DRIFT_WINDOW = 8  # Chunk boundaries considered per drift correction
+DRIFT_GAIN = 0.5
+MAX_DRIFT_STEP_MS = 10.0
+
+
+def default_latency_ms(sample_rate=44100):
+    """Output latency to compensate for: ARCADE_AUDIO_LATENCY_MS, or two mixer buffers."""
+    value = os.environ.get('ARCADE_AUDIO_LATENCY_MS')
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return 2 * MIXER_BUFFER_SAMPLES / sample_rate * 1000
+
+
+class SongClock:
+    """Song time in milliseconds, where 0 is the moment the song's first sample is heard.
+
+    Driven by time.perf_counter() instead of pygame's millisecond ticks.
+    start() begins a lead-in during which the time is negative; the music
+    should be started once music_due() is true and music_started() called
+    right after, which re-anchors the clock to the real start plus the output
+    latency. While the song plays, sync() compares the clock with the sample
+    position the mixer has reached and slews out any drift.
+    """
+
+    def __init__(self, latency_ms=None, clock=time.perf_counter):
+        self.latency_ms = default_latency_ms() if latency_ms is None else latency_ms
+        self._clock = clock
+        self._origin = None
+        self.started = False
+        self.corrections = 0
+        self._errors = deque(maxlen=DRIFT_WINDOW)
+
+    def start(self, lead_in_ms):
+        """Starts the lead-in. Song time runs from -(lead_in_ms + latency) up to 0."""
+        self._origin = self._clock() + (lead_in_ms + self.latency_ms) / 1000.0
+        self.started = False
+        self._errors.clear()
+
+    def now(self):
+        if self._origin is None:
+            return 0.0
+        return (self._clock() - self._origin) * 1000.0
+
+    def music_due(self):
+        """True once playback has to begin for the first sample to be heard at time 0."""
+        return not self.started and self._origin is not None and self.now() >= -self.latency_ms
+
+    def music_started(self):
+        """Call right after starting playback."""
+        self._origin = self._clock() + self.latency_ms / 1000.0
+        self.started = True
+
+    def sync(self, sample_index, sample_rate):
+        """Reports that the mixer has just started playing `sample_index` of the song.
+
+        The report can only arrive late (it is noticed once per frame), so the
+        smallest error over the last few reports is taken as the clock's real
+        offset and part of it is corrected.
+        """
+        if not self.started:
+            return
+        mixer_ms = self.now() + self.latency_ms
+        self._errors.append(mixer_ms - sample_index * 1000.0 / sample_rate)
+        if len(self._errors) < self._errors.maxlen:
+            return
+        step = max(-MAX_DRIFT_STEP_MS, min(MAX_DRIFT_STEP_MS, DRIFT_GAIN * min(self._errors)))
+        if step:
+            self._origin += step / 1000.0
+            self._errors = deque((error - step for error in self._errors), maxlen=DRIFT_WINDOW)
+            self.corrections += 1
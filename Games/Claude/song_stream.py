@@ -0,0 +1,154 @@
+import queue
+import threading
+import numpy as np
+import pygame
+from game_log import get_logger
+
+log = get_logger("song_stream")
+
+CHUNK_SAMPLES = 8192  # ~186 ms at 44.1 kHz
+CHUNKS_AHEAD = 4
+FIRST_CHUNK_TIMEOUT = 1.0  # Seconds play() waits before leaving the first chunk to update()
+
+_END = None
+
+
+def music_channel():
+    """The mixer channel reserved for song playback, so hit sounds never steal it."""
+    pygame.mixer.set_reserved(1)
+    return pygame.mixer.Channel(0)
+
+
+class SongStream:
+    """Plays an Arrangement while it is still being synthesised.
+
+    A worker thread renders CHUNK_SAMPLES at a time into a queue that holds
+    at most `chunks_ahead` chunks, blocking when it is full. The main thread
+    moves chunks from that queue onto the reserved music channel with
+    Channel.queue(), so play() only waits for the first chunk no matter how
+    long the song is. update() must be called every frame while playing.
+
+    Has the play()/stop()/get_length() subset of pygame.mixer.Sound the game
+    uses. `on_complete(pcm)` receives the whole song once it has been
+    rendered, e.g. to store it in the song cache. `on_chunk_started(sample,
+    sample_rate)` is called from update() when the mixer moves on to a new
+    chunk, which lets a SongClock correct its drift.
+    """
+
+    def __init__(self, arrangement, chunk_samples=CHUNK_SAMPLES, chunks_ahead=CHUNKS_AHEAD, on_complete=None):
+        self.arrangement = arrangement
+        self.chunk_samples = chunk_samples
+        self.chunks_ahead = chunks_ahead
+        self.on_complete = on_complete
+        self.on_chunk_started = None
+        self.channel = None
+        self.underruns = 0
+        self._chunks = None
+        self._stop_event = None
+        self._thread = None
+        self._finished = True
+        self._next_sample = 0
+        self._queued_sample = None
+
+    def get_length(self):
+        return self.arrangement.duration
+
+    def play(self):
+        """Starts the song from the beginning, waiting only for its first chunk."""
+        self.stop()
+        self.channel = music_channel()
+        self._chunks = queue.Queue(maxsize=self.chunks_ahead)
+        self._stop_event = threading.Event()
+        self._finished = False
+        self._next_sample = 0
+        self._queued_sample = None
+        self._thread = threading.Thread(target=self._produce, args=(self._chunks, self._stop_event), daemon=True)
+        self._thread.start()
+        self._feed(block=True)
+
+    def update(self):
+        """Keeps the channel's queue topped up. Call once per frame."""
+        if not self._finished:
+            self._feed(block=False)
+
+    def stop(self):
+        if self._stop_event is not None:
+            self._stop_event.set()
+            # Unblock a producer waiting on a full queue
+            while True:
+                try:
+                    self._chunks.get_nowait()
+                except queue.Empty:
+                    break
+            self._thread.join()
+            self._stop_event = None
+        if self.channel is not None:
+            self.channel.stop()
+        self._finished = True
+
+    def _feed(self, block):
+        if self._queued_sample is not None and self.channel.get_queue() is None:
+            self._chunk_started(self._queued_sample)
+            self._queued_sample = None
+        # The channel holds one playing and one queued sound; keep the queued slot filled
+        while self.channel.get_queue() is None:
+            waiting = block and not self.channel.get_busy()
+            try:
+                pcm = self._chunks.get(block=waiting, timeout=FIRST_CHUNK_TIMEOUT if waiting else None)
+            except queue.Empty:
+                if waiting:
+                    # update() starts the channel through the underrun path once a chunk arrives
+                    log.warning("Song stream's first chunk took over %.1fs", FIRST_CHUNK_TIMEOUT)
+                return
+            if pcm is _END:
+                self._finished = True
+                return
+            sound = pygame.mixer.Sound(buffer=pcm)
+            start = self._next_sample
+            self._next_sample += len(pcm)
+            if self.channel.get_busy():
+                self.channel.queue(sound)
+                self._queued_sample = start
+            else:
+                if not block:
+                    self.underruns += 1
+                    log.debug("Song stream underrun, restarting channel")
+                self.channel.play(sound)
+                self._chunk_started(start)
+
+    def _chunk_started(self, sample):
+        if self.on_chunk_started is not None:
+            self.on_chunk_started(sample, self.arrangement.sample_rate)
+
+    def _produce(self, chunks, stop_event):
+        song = None
+        complete = False
+        try:
+            total = self.arrangement.total_samples
+            song = np.empty((total, 2), dtype=np.int16) if self.on_complete else None
+            for start in range(0, total, self.chunk_samples):
+                pcm = self.arrangement.render_pcm(start, start + self.chunk_samples)
+                if song is not None:
+                    song[start:start + len(pcm)] = pcm
+                if not self._put(chunks, stop_event, pcm):
+                    return
+            complete = True
+        except Exception:
+            log.exception("Song stream failed to render")
+        finally:
+            # Always end the stream, so the main thread never waits on a dead worker
+            self._put(chunks, stop_event, _END)
+        if complete and song is not None:
+            try:
+                self.on_complete(song)
+            except Exception:
+                log.exception("Song stream completion callback failed")
+
+    def _put(self, chunks, stop_event, item):
+        while not stop_event.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
@@ -0,0 +1,185 @@
+import math
+import numpy as np
+
+SAMPLE_RATE = 44100
+
+NOTE_FREQUENCIES = {
+    'C3': 130.81, 'D3': 146.83, 'E3': 164.81, 'F3': 174.61,
+    'G3': 196.00, 'A3': 220.00, 'B3': 246.94,
+    'C4': 261.63, 'D4': 293.66, 'E4': 329.63, 'F4': 349.23,
+    'G4': 392.00, 'A4': 440.00, 'B4': 493.88,
+    'C5': 523.25, 'D5': 587.33, 'E5': 659.25, 'F5': 698.46,
+    'G5': 783.99, 'A5': 880.00, 'B5': 987.77,
+    'C6': 1046.50
+}
+
+
+class Envelope:
+    """Linear ADSR envelope. Times are in seconds, `sustain` is a level from 0 to 1.
+
+    The release ramps down over the last `release` seconds of each note, so
+    notes never run into the next one.
+    """
+
+    def __init__(self, attack=0.005, decay=0.05, sustain=0.8, release=0.02):
+        self.attack = attack
+        self.decay = decay
+        self.sustain = sustain
+        self.release = release
+
+    def key(self):
+        return (self.attack, self.decay, self.sustain, self.release)
+
+    def apply(self, wave, offset, length, sample_rate):
+        """Scales `wave` in place. `offset` is each sample's position in its note, `length` that note's length."""
+        a = max(int(self.attack * sample_rate), 1)
+        d = max(int(self.decay * sample_rate), 1)
+        r = max(int(self.release * sample_rate), 1)
+        env = np.full(wave.shape, self.sustain, dtype=np.float32)
+        attacking = offset < a
+        env[attacking] = offset[attacking] / a
+        decaying = ~attacking & (offset < a + d)
+        env[decaying] = 1.0 - (1.0 - self.sustain) * (offset[decaying] - a) / d
+        remaining = length - offset
+        releasing = remaining < r
+        env[releasing] *= remaining[releasing] / r
+        wave *= env
+
+
+class Voice:
+    """One monophonic line: a list of (note name, seconds) played back to back as a pulse wave.
+
+    `duty` is the old generate_square_wave threshold, where the wave is high
+    while sin(2*pi*f*t) > -duty. It is converted to the equivalent pulse
+    width and phase offset, so a voice sounds like the per-note code did,
+    minus the aliasing.
+
+    Each note restarts its phase, so a note's samples depend only on its
+    frequency and length. Every distinct note is rendered once, in one
+    vectorised pass, into a bank that render() mixes from.
+    """
+
+    def __init__(self, notes, amplitude, duty=0.5, envelope=None, sample_rate=SAMPLE_RATE):
+        self.amplitude = amplitude
+        self.duty = duty
+        self.envelope = envelope
+        self.sample_rate = sample_rate
+        self.pulse_width = 0.5 + math.asin(duty) / math.pi
+        # Rising edge of the sine threshold sits asin(duty)/2pi before phase 0
+        self.phase_offset = math.asin(duty) / (2 * math.pi)
+
+        # Note table. Lengths are truncated per note and starts accumulate, like the old loops
+        self.frequencies = np.array([NOTE_FREQUENCIES[note] for note, _ in notes], dtype=np.float64)
+        self.lengths = np.array([int(duration * sample_rate) for _, duration in notes], dtype=np.int64)
+        self.ends = np.cumsum(self.lengths)
+        self.starts = self.ends - self.lengths
+        self._bank = None
+
+    def key(self):
+        return (self.frequencies.tolist(), self.lengths.tolist(), self.amplitude, self.duty,
+                self.envelope.key() if self.envelope else None, self.sample_rate)
+
+    def _build_bank(self):
+        table = np.stack([self.frequencies, self.lengths.astype(np.float64)])
+        unique, self._bank_ids = np.unique(table, axis=1, return_inverse=True)
+        self._bank_ids = self._bank_ids.ravel()
+        frequencies = unique[0]
+        lengths = unique[1].astype(np.int64)
+        self._bank_starts = np.cumsum(lengths) - lengths
+
+        # Sample index within its note and that note's phase increment, for the whole bank
+        note = np.repeat(np.arange(lengths.size), lengths)
+        offset = np.arange(lengths.sum(), dtype=np.int64) - self._bank_starts[note]
+        dt = (frequencies / self.sample_rate)[note]
+        phase = offset * dt
+        phase += self.phase_offset
+        phase -= np.floor(phase)
+        phase = phase.astype(np.float32)
+        dt = dt.astype(np.float32)
+
+        wave = np.where(phase < self.pulse_width, np.float32(1.0), np.float32(-1.0))
+        _add_poly_blep(wave, phase, dt, 1.0)
+        falling = phase - np.float32(self.pulse_width)
+        falling += falling < 0
+        _add_poly_blep(wave, falling, dt, -1.0)
+        if self.envelope is not None:
+            self.envelope.apply(wave, offset, lengths[note], self.sample_rate)
+        wave *= self.amplitude
+        self._bank = wave
+
+    def render(self, out, start):
+        """Adds this voice's samples for out's window (beginning at sample `start`) into `out`."""
+        if self._bank is None:
+            self._build_bank()
+        stop = start + out.size
+        first = int(np.searchsorted(self.ends, start, side='right'))
+        last = int(np.searchsorted(self.starts, stop, side='left'))
+        for i in range(first, last):
+            note_start = int(self.starts[i])
+            lo = max(note_start, start)
+            hi = min(int(self.ends[i]), stop)
+            bank = int(self._bank_starts[self._bank_ids[i]]) - note_start
+            out[lo - start:hi - start] += self._bank[bank + lo:bank + hi]
+
+
+def _add_poly_blep(wave, t, dt, sign):
+    """Adds the polynomial band-limited step correction for an edge at phase 0 of `t`.
+
+    Only the samples within one step of the edge are touched.
+    """
+    rising = np.flatnonzero(t < dt)
+    x = t[rising] / dt[rising]
+    wave[rising] += sign * (x + x - x * x - 1.0)
+    falling = np.flatnonzero(t > 1.0 - dt)
+    x = (t[falling] - 1.0) / dt[falling]
+    wave[falling] += sign * (x * x + x + x + 1.0)
+
+
+class Arrangement:
+    """Voices mixed into one song of `total_samples` samples.
+
+    render() produces any window of the song, so it can be rendered whole or
+    in chunks for streaming. The mix is accumulated in float32 and converted
+    to int16 once, with clipping instead of wrap-around.
+    """
+
+    def __init__(self, voices, total_samples, gain=1.0, sample_rate=SAMPLE_RATE):
+        self.voices = voices
+        self.total_samples = int(total_samples)
+        self.gain = gain
+        self.sample_rate = sample_rate
+
+    @property
+    def duration(self):
+        return self.total_samples / self.sample_rate
+
+    def key(self):
+        """Everything that affects the rendered samples, for cache keys."""
+        return {
+            'voices': [voice.key() for voice in self.voices],
+            'total_samples': self.total_samples,
+            'gain': self.gain,
+            'sample_rate': self.sample_rate,
+        }
+
+    def render(self, start=0, stop=None):
+        """Returns the float32 mono mix for samples [start, stop)."""
+        stop = self.total_samples if stop is None else min(stop, self.total_samples)
+        out = np.zeros(max(stop - start, 0), dtype=np.float32)
+        if out.size:
+            for voice in self.voices:
+                voice.render(out, start)
+            out *= self.gain
+        return out
+
+    def render_pcm(self, start=0, stop=None):
+        """Returns int16 stereo samples for [start, stop), ready for pygame.sndarray.make_sound."""
+        return to_pcm16(self.render(start, stop))
+
+
+def to_pcm16(mono):
+    """Converts a float mix to interleaved int16 stereo with saturation."""
+    pcm = np.empty((mono.size, 2), dtype=np.int16)
+    pcm[:, 0] = np.clip(mono, -1.0, 1.0) * 32767
+    pcm[:, 1] = pcm[:, 0]
+    return pcm
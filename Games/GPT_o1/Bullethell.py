@@ -4,7 +4,17 @@ import sys
 import math
 import os
 import shutil
-from gpio_manager import read_gpio_input
+import numpy as np
+from gpio_manager import poll_input, current_input
+from profiler import profiler
+from text_cache import render_text, get_font
+import procedural
+from bullet_pool import BulletPool
+from spatial_hash import SpatialHash
+from sprite_atlas import SpriteAtlas, blit_batch
+from pickup_pool import PickupPool, PICKUP_POINT, PICKUP_POWER
+from dirty_renderer import DirtyRectRenderer
+import asset_cache
 
 #test
 
@@ -14,19 +24,8 @@ current_dir = os.path.dirname(os.path.realpath(__file__))
 # Define assets directory path inside GPT-o1 folder
 ASSETS_DIR = os.path.join(current_dir, 'assets')
 
-# Create assets directory if it doesn't exist
-os.makedirs(ASSETS_DIR, exist_ok=True)
-
-# Define directories using ASSETS_DIR
-sprites_dir = os.path.join(ASSETS_DIR, 'sprites')
-backgrounds_dir = os.path.join(ASSETS_DIR, 'backgrounds')
-
-# Create directories if they don't exist
-os.makedirs(sprites_dir, exist_ok=True)
-os.makedirs(backgrounds_dir, exist_ok=True)
-
-# Initialize Pygame
-pygame.init()
+# Generated sprites and backgrounds are cached here, keyed by a hash of ASSET_PARAMS
+ASSET_CACHE_DIR = os.path.join(ASSETS_DIR, 'cache')
 
 # Constants
 SCREEN_WIDTH = 800
@@ -35,6 +34,7 @@ FPS = 60
 PLAYER_AREA_Y = SCREEN_HEIGHT * (2 / 3)  # Now ~320 pixels
 TOP_THIRD_Y_LIMIT = SCREEN_HEIGHT / 3     # Now ~160 pixels
 WATERMARK_TEXT = "*Continued Run*"
+DIRTY_RECTS_ENV = "ARCADE_DIRTY_RECTS"  # Set to 1 to redraw only the changed parts of the screen
 
 # Colors
 WHITE  = (255, 255, 255)
@@ -47,10 +47,21 @@ ORANGE = (255, 165,    0)
 PURPLE = (128,   0, 128)
 LIGHT_BLUE = (0, 191, 255)
 
-# Helper function to save images
-def save_image(surface, path):
-    pygame.image.save(surface, path)
-    print(f"Saved {path}")
+# Everything build_assets() reads. Changing any value (or bumping 'version'
+# after editing the drawing code) makes the next start rebuild the cache.
+ASSET_PARAMS = {
+    'version': 1,
+    'screen_size': [SCREEN_WIDTH, SCREEN_HEIGHT],
+    'seed': 1337,
+    'player_size': 30,
+    'enemy_size': 30,
+    'enemy_patterns': ['aimed', 'random', 'circle'],
+    'boss_size': [100, 80],
+    'boss_patterns': ['burst_homing', 'spiral', 'circle', 'aimed', 'random', 'mass_acceleration', 'final_phase'],
+    'levels': 11,
+    'stars_per_level': 100,
+    'menu_stars': 250,
+}
 
 # Helper function to clean assets directory
 def clean_assets():
@@ -58,241 +69,179 @@ def clean_assets():
         shutil.rmtree(ASSETS_DIR)
     os.makedirs(ASSETS_DIR, exist_ok=True)
 
-# Create Player Image
-player_path = os.path.join(sprites_dir, 'player.png')
-player_image = pygame.Surface((30, 30), pygame.SRCALPHA)
-player_image.fill((0, 0, 0, 0))  # Transparent background
-pygame.draw.circle(player_image, BLUE, (15, 15), 15)  # Blue circle
-pygame.draw.circle(player_image, RED, (15, 15), 3)    # Red dot at center (hitbox)
-save_image(player_image, player_path)
-
-# Enemy Patterns
-enemy_patterns = ['aimed', 'random', 'circle']
-for pattern in enemy_patterns:
-    path = os.path.join(sprites_dir, f'enemy_{pattern}.png')
-    enemy_image = pygame.Surface((30, 30), pygame.SRCALPHA)
-    if pattern == 'aimed':
-        pygame.draw.polygon(enemy_image, GREEN, [(15, 0), (30, 30), (0, 30)])
-    elif pattern == 'random':
-        pygame.draw.rect(enemy_image, (0, 255, 0), enemy_image.get_rect())
-        pygame.draw.circle(enemy_image, BLACK, (15, 15), 5)
-    elif pattern == 'circle':
-        pygame.draw.circle(enemy_image, (0, 200, 0), (15, 15), 15)
-        pygame.draw.circle(enemy_image, BLACK, (15, 15), 5)
-    save_image(enemy_image, path)
-
-# Boss Patterns
-boss_patterns = ['burst_homing', 'spiral', 'circle', 'aimed', 'random', 'mass_acceleration']
-for pattern in boss_patterns:
-    path = os.path.join(sprites_dir, f'boss_{pattern}.png')
-    boss_image = pygame.Surface((100, 80), pygame.SRCALPHA)
-    if pattern == 'burst_homing':
-        pygame.draw.polygon(boss_image, ORANGE, [(50, 0), (100, 80), (0, 80)])
-    elif pattern == 'spiral':
-        pygame.draw.arc(boss_image, (255, 100, 0), (10, 10, 80, 60), 0, 3.14, 5)
-    elif pattern == 'circle':
-        pygame.draw.circle(boss_image, (255, 165, 0), (50, 40), 40)
-        pygame.draw.circle(boss_image, BLACK, (50, 40), 10)
-    elif pattern == 'aimed':
-        pygame.draw.polygon(boss_image, ORANGE, [(50, 10), (90, 70), (10, 70)])
-    elif pattern == 'random':
-        pygame.draw.rect(boss_image, (255, 140, 0), boss_image.get_rect())
-        pygame.draw.circle(boss_image, BLACK, (50, 40), 15)
-    elif pattern == 'mass_acceleration':
-        pygame.draw.rect(boss_image, (255, 215, 0), boss_image.get_rect())
-        pygame.draw.line(boss_image, BLACK, (0, 40), (100, 40), 5)
-    save_image(boss_image, path)
-
-# Background Generation and Storage System
-backgrounds = {}
-backgrounds_dir = 'backgrounds'
-if not os.path.exists(backgrounds_dir):
-    os.makedirs(backgrounds_dir)
+def generate_level_background(level, width, height, rng):
+    background = pygame.Surface((width, height))
 
-# In the background creation section
-backgrounds = {}
-for level in range(1, 12):  # Include level 11
-    try:
-        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        
-        if level == 10:
-            # Pure white background for level 10
-            background.fill(WHITE)
-        elif level == 11:
-            # Dark background for final phase
-            background.fill((30, 30, 30))
-        else:
-            # Dynamic colors for levels 1-9
-            if level % 3 == 0:
-                # Blue-ish space
-                background.fill((20, 20, 40 + level * 15))
-            elif level % 3 == 1:
-                # Purple-ish space
-                background.fill((40 + level * 10, 0, 40 + level * 10))
-            else:
-                # Dark red-ish space
-                background.fill((40 + level * 10, 20, 30))
-
-            # Add stars with different sizes
-            for _ in range(100):
-                x = random.randint(0, SCREEN_WIDTH - 1)
-                y = random.randint(0, SCREEN_HEIGHT - 1)
-                size = random.randint(1, 3)
-                brightness = random.randint(180, 255)
-                pygame.draw.circle(background, (brightness, brightness, brightness), (x, y), size)
-
-            # Add random planets (2-3 per level)
-            for _ in range(random.randint(2, 3)):
-                planet_x = random.randint(50, SCREEN_WIDTH - 50)
-                planet_y = random.randint(50, SCREEN_HEIGHT - 50)
-                planet_size = random.randint(20, 40)
-                planet_color = (
-                    random.randint(100, 255),
-                    random.randint(100, 255),
-                    random.randint(100, 255)
-                )
-                # Draw planet
-                pygame.draw.circle(background, planet_color, (planet_x, planet_y), planet_size)
-                # Add some darker shading to give depth
-                pygame.draw.circle(background, 
-                    (max(planet_color[0] - 50, 0),
-                     max(planet_color[1] - 50, 0),
-                     max(planet_color[2] - 50, 0)),
-                    (planet_x - planet_size//4, planet_y - planet_size//4), 
-                    planet_size//2)
-
-        backgrounds[level] = background
-        save_image(background, os.path.join(ASSETS_DIR, 'backgrounds', f'background_level_{level}.png'))
-            
-    except Exception as e:
-        print(f"Error creating background for level {level}: {e}")
-        # Fallback background if creation fails
-        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        if level == 10:
-            background.fill(WHITE)
-        elif level == 11:
-            background.fill((30, 30, 30))
+    if level == 10:
+        # Pure white background for level 10
+        background.fill(WHITE)
+    elif level == 11:
+        # Dark background for final phase
+        background.fill((30, 30, 30))
+    else:
+        # Dynamic colors for levels 1-9
+        if level % 3 == 0:
+            # Blue-ish space
+            background.fill((20, 20, 40 + level * 15))
+        elif level % 3 == 1:
+            # Purple-ish space
+            background.fill((40 + level * 10, 0, 40 + level * 10))
         else:
-            background.fill((20 + level * 10, 20 + level * 5, 40 + level * 10))
-        backgrounds[level] = background
-
-# Setup Display
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Bullet Hell Game")
-clock = pygame.time.Clock()
+            # Dark red-ish space
+            background.fill((40 + level * 10, 20, 30))
+
+        # Add stars with different sizes
+        for _ in range(ASSET_PARAMS['stars_per_level']):
+            x = rng.randint(0, width - 1)
+            y = rng.randint(0, height - 1)
+            size = rng.randint(1, 3)
+            brightness = rng.randint(180, 255)
+            pygame.draw.circle(background, (brightness, brightness, brightness), (x, y), size)
+
+        # Add random planets (2-3 per level)
+        for _ in range(rng.randint(2, 3)):
+            planet_x = rng.randint(50, width - 50)
+            planet_y = rng.randint(50, height - 50)
+            planet_size = rng.randint(20, 40)
+            planet_color = (
+                rng.randint(100, 255),
+                rng.randint(100, 255),
+                rng.randint(100, 255)
+            )
+            # Draw planet
+            pygame.draw.circle(background, planet_color, (planet_x, planet_y), planet_size)
+            # Add some darker shading to give depth
+            pygame.draw.circle(background, 
+                (max(planet_color[0] - 50, 0),
+                 max(planet_color[1] - 50, 0),
+                 max(planet_color[2] - 50, 0)),
+                (planet_x - planet_size//4, planet_y - planet_size//4), 
+                planet_size//2)
 
-# Font
-font = pygame.font.SysFont(None, 36)
-
-# Load Backgrounds
-backgrounds = {}
-for level in range(1, 12):  # Changed range to include level 11
-    try:
-        backgrounds[level] = pygame.image.load(os.path.join(ASSETS_DIR, 'backgrounds', f'background_level_{level}.png')).convert()
-        backgrounds[level] = pygame.transform.scale(backgrounds[level], (SCREEN_WIDTH, SCREEN_HEIGHT))
-    except:
-        if level == 10:
-            # White background for level 10
-            background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            background.fill(WHITE)
-            backgrounds[level] = background
-        elif level == 11:
-            # Dark gray background for final phase
-            background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            background.fill((30, 30, 30))
-            backgrounds[level] = background
-        else:
-            backgrounds[level] = BLACK  # Fallback to black if image not found
-            
-try:
-    menu_background_image = pygame.image.load(os.path.join(ASSETS_DIR, 'backgrounds', 'menu_background.png')).convert()
-    menu_background_image = pygame.transform.scale(menu_background_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-except Exception as e:
-    print("Error loading menu background:", e)
-    menu_background_image = None
-    
-def generate_cyberpunk_background(width, height):
-    background = pygame.Surface((width, height))
-    # Create a vertical gradient from dark blue to near-black
-    for y in range(height):
-        # Interpolate between two colors (dark blue and nearly black)
-        r = 0
-        g = 0
-        b = max(0, 35 - int(35 * (y/height)))
-        pygame.draw.line(background, (r, g, b), (0, y), (width, y))
-    
-    # Add a subtle color overlay for extra neon vibe
-    overlay = pygame.Surface((width, height))
-    overlay.fill((10, 0, 30))
-    overlay.set_alpha(40)
-    background.blit(overlay, (0, 0))
-    
-    # Draw a scattering of stars
-    for _ in range(250):
-        x = random.randint(0, width-1)
-        y = random.randint(0, height-1)
-        star_color = random.choice([(255,255,255), (210,210,255), (255,200,200)])
-        pygame.draw.circle(background, star_color, (x, y), random.choice([1, 2]))
-    
-    
     return background
 
-# Generate and store the background in a global variable
-menu_background_image = generate_cyberpunk_background(SCREEN_WIDTH, SCREEN_HEIGHT)
+def generate_cyberpunk_background(width, height, rng, num_stars=250):
+    return procedural.build(
+        (width, height),
+        procedural.gradient(((0, 0, 35), (0, 0, 0))),  # Dark blue to near-black
+        procedural.tint((10, 0, 30), 40),  # Subtle colour overlay for extra neon vibe
+        procedural.stars(num_stars, seed=rng.getrandbits(32),
+                         palette=((255, 255, 255), (210, 210, 255), (255, 200, 200)), radii=(1, 2)),
+    )
+
+def build_assets(params):
+    """Draws every generated sprite and background. Only runs on an asset cache miss."""
+    rng = random.Random(params['seed'])
+    width, height = params['screen_size']
+    assets = {}
+
+    # Player: blue circle with a red dot at the centre (hitbox)
+    size = params['player_size']
+    player_image = pygame.Surface((size, size), pygame.SRCALPHA)
+    player_image.fill((0, 0, 0, 0))  # Transparent background
+    pygame.draw.circle(player_image, BLUE, (size // 2, size // 2), size // 2)
+    pygame.draw.circle(player_image, RED, (size // 2, size // 2), 3)
+    assets['player'] = player_image
+
+    # Enemy Patterns
+    size = params['enemy_size']
+    for pattern in params['enemy_patterns']:
+        enemy_image = pygame.Surface((size, size), pygame.SRCALPHA)
+        if pattern == 'aimed':
+            pygame.draw.polygon(enemy_image, GREEN, [(size // 2, 0), (size, size), (0, size)])
+        elif pattern == 'random':
+            pygame.draw.rect(enemy_image, (0, 255, 0), enemy_image.get_rect())
+            pygame.draw.circle(enemy_image, BLACK, (size // 2, size // 2), 5)
+        elif pattern == 'circle':
+            pygame.draw.circle(enemy_image, (0, 200, 0), (size // 2, size // 2), size // 2)
+            pygame.draw.circle(enemy_image, BLACK, (size // 2, size // 2), 5)
+        assets[f'enemy_{pattern}'] = enemy_image
+
+    # Boss Patterns: concentric circles, inverted for the final phase
+    for pattern in params['boss_patterns']:
+        boss_image = pygame.Surface((60, 60))
+        boss_image.fill(RED if pattern != 'final_phase' else BLACK)  # Final phase boss is black
+        pygame.draw.circle(boss_image, WHITE if pattern == 'final_phase' else RED, 
+                          (30, 30), 30)  # Outer circle
+        pygame.draw.circle(boss_image, BLACK if pattern == 'final_phase' else WHITE, 
+                          (30, 30), 20)  # Inner circle
+        assets[f'boss_{pattern}'] = pygame.transform.scale(boss_image, tuple(params['boss_size']))
+
+    # Background for every level, including the level 11 final phase
+    for level in range(1, params['levels'] + 1):
+        assets[f'background_level_{level}'] = generate_level_background(level, width, height, rng)
+
+    assets['menu_background'] = generate_cyberpunk_background(width, height, rng, params['menu_stars'])
+    return assets
 
 def draw_menu_background(screen):
     # Blit the generated background image
     screen.blit(menu_background_image, (0, 0))
 
-# Load Player Image
-try:
-    player_image = pygame.image.load(os.path.join(ASSETS_DIR, 'sprites', 'player.png')).convert_alpha()
-    player_image = pygame.transform.scale(player_image, (30, 30))
-except:
-    player_image = pygame.Surface((30, 30), pygame.SRCALPHA)
-    pygame.draw.circle(player_image, BLUE, (15, 15), 15)
-
-# Load Enemy Images based on pattern
-enemy_images = {
-    'aimed': pygame.image.load(os.path.join(ASSETS_DIR, 'sprites', 'enemy_aimed.png')).convert_alpha(),
-    'random': pygame.image.load(os.path.join(ASSETS_DIR, 'sprites', 'enemy_random.png')).convert_alpha(),
-    'circle': pygame.image.load(os.path.join(ASSETS_DIR, 'sprites', 'enemy_circle.png')).convert_alpha()
-}
-for key in enemy_images:
-    enemy_images[key] = pygame.transform.scale(enemy_images[key], (30, 30))
-
-# Load Boss Images
-boss_images = {
-    'burst_homing': pygame.Surface((60, 60)),
-    'spiral': pygame.Surface((60, 60)),
-    'circle': pygame.Surface((60, 60)),
-    'aimed': pygame.Surface((60, 60)),
-    'random': pygame.Surface((60, 60)),
-    'mass_acceleration': pygame.Surface((60, 60)),
-    'final_phase': pygame.Surface((60, 60))  # Add final phase image
-}
+# Display, font and generated images are filled in by load_assets() when the
+# game is first started, so importing this module stays cheap.
+screen = None
+clock = None
+font = None
+backgrounds = {}
+menu_background_image = None
+player_image = None
+enemy_images = {}
+boss_images = {}
+
+def load_assets():
+    """Opens the display and loads the cached sprites and backgrounds (first call only)."""
+    global screen, clock, font, backgrounds, menu_background_image
+    global player_image, enemy_images, boss_images, player
+
+    if screen is not None:
+        return
+
+    # Initialize Pygame
+    pygame.init()
+
+    # Setup Display
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Bullet Hell Game")
+    clock = pygame.time.Clock()
+
+    # Font
+    font = get_font(None, 36, system=True)
+
+    assets = asset_cache.load_or_build(ASSET_CACHE_DIR, ASSET_PARAMS, build_assets)
 
-# Initialize all boss images
-for pattern in boss_images:
-    boss_images[pattern].fill(RED if pattern != 'final_phase' else BLACK)  # Final phase boss is black
-    if level == 10 and pattern == 'mass_acceleration':
-        boss_images[pattern].fill(BLACK)  # Level 10 boss is black
-    pygame.draw.circle(boss_images[pattern], WHITE if pattern == 'final_phase' else RED, 
-                      (30, 30), 30)  # Outer circle
-    pygame.draw.circle(boss_images[pattern], BLACK if pattern == 'final_phase' else WHITE, 
-                      (30, 30), 20)  # Inner circle
+    backgrounds = {level: assets[f'background_level_{level}'].convert()
+                   for level in range(1, ASSET_PARAMS['levels'] + 1)}
+    menu_background_image = assets['menu_background'].convert()
+    player_image = assets['player'].convert_alpha()
+    enemy_images = {pattern: assets[f'enemy_{pattern}'].convert_alpha()
+                    for pattern in ASSET_PARAMS['enemy_patterns']}
+    boss_images = {pattern: assets[f'boss_{pattern}'].convert()
+                   for pattern in ASSET_PARAMS['boss_patterns']}
 
-for key in boss_images:
-    boss_images[key] = pygame.transform.scale(boss_images[key], (100, 80))
+    # Create Player
+    player = Player()
+    all_sprites.add(player)
 
 # Sprite Groups
 all_sprites   = pygame.sprite.Group()
 bullets       = pygame.sprite.Group()
 bosses        = pygame.sprite.Group()
-enemy_bullets = pygame.sprite.Group()
+# Projectiles, pickups and enemies share images from one atlas instead of each owning a Surface
+sprite_atlas = SpriteAtlas()
+enemy_bullet_pool = BulletPool(SCREEN_WIDTH, SCREEN_HEIGHT, atlas=sprite_atlas)  # Enemy bullets live in arrays, not sprites
+
+# Point and power-point drops: (name, width, height, fall speed, colour)
+PICKUP_KINDS = {
+    PICKUP_POINT: ('point', 8, 8, 2, LIGHT_BLUE),   # Falls slightly faster than power points
+    PICKUP_POWER: ('power_point', 10, 10, 1, PURPLE),
+}
+PICKUP_MAGNET_RADIUS = 0  # Pull pickups within this many pixels towards the player (0 = off)
+pickup_pool = PickupPool(SCREEN_WIDTH, SCREEN_HEIGHT, PICKUP_KINDS, atlas=sprite_atlas)
+
+# Broad-phase grid, rebuilt every frame before the collision checks
+bullet_grid = SpatialHash()
 enemies       = pygame.sprite.Group()
-power_points  = pygame.sprite.Group()
-points        = pygame.sprite.Group()
 
 # Game Variables
 level = 1
@@ -308,8 +257,31 @@ waves_per_level = 3 + (level // 2)  # Increase waves per level over time
 wave_duration = 15000  # 15 seconds per wave
 level_duration = 60000  # 60 seconds per level
 
-wave_start_time = pygame.time.get_ticks()  # Initialize wave start time
-level_start_time = pygame.time.get_ticks()
+wave_start_time = 0  # Initialize wave start time
+level_start_time = 0
+
+# Fixed-timestep simulation. Gameplay timers read sim_now(), which advances by
+# exactly SIM_STEP_MS per update however long frames take to render.
+SIM_RATE = FPS
+SIM_STEP_MS = 1000 / SIM_RATE
+MAX_FRAME_MS = 250  # Longer stalls (level banners, window drags) are dropped instead of caught up
+MAX_SIM_STEPS = 5   # Updates allowed per rendered frame
+sim_tick = 0
+sim_seed = None
+rng = random.Random()  # All gameplay randomness goes through this, see seed_simulation()
+
+def sim_now():
+    """Simulation time in ms, the fixed-step replacement for pygame.time.get_ticks()."""
+    return int(sim_tick * SIM_STEP_MS)
+
+def seed_simulation(seed=None):
+    """Restarts the simulation clock and reseeds rng. Reusing a seed replays the same run."""
+    global sim_tick, sim_seed
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    sim_seed = seed
+    sim_tick = 0
+    rng.seed(seed)
 
 # Boss Patterns per Level
 boss_patterns = {
@@ -332,6 +304,53 @@ def get_text_color(level):
         return BLACK
     return WHITE
 
+def get_sprite_theme(level):
+    return 'dark' if level == 10 else 'default'  # Level 10 draws everything black on white
+
+def get_enemy_bullet_color(level):
+    if level == 10:
+        return BLACK  # Black bullets for level 10
+    return YELLOW
+
+# Velocity helpers for batched bullet emission
+def ring_velocities(num_bullets, speed, offset=0.0):
+    """Returns (vx, vy) arrays for bullets spread evenly around a circle."""
+    angles = np.arange(num_bullets) * (2 * math.pi / num_bullets) + offset
+    return np.cos(angles) * speed, np.sin(angles) * speed
+
+def aimed_velocities(fx, fy, speed):
+    """Returns (vx, vy) arrays pointing from each (fx, fy) towards the player."""
+    dx = player.rect.centerx - np.asarray(fx, dtype=np.float32)
+    dy = player.rect.centery - np.asarray(fy, dtype=np.float32)
+    distance = np.hypot(dx, dy)
+    distance[distance == 0] = 1
+    return (dx / distance) * speed, (dy / distance) * speed
+
+# Render interpolation between the last two simulation steps
+def snapshot_positions(group):
+    for sprite in group:
+        sprite.prev_center = sprite.rect.center
+
+def interpolated_offset(sprite, alpha):
+    """Offset from the sprite's current rect to where it is drawn for blend factor `alpha`."""
+    prev = getattr(sprite, 'prev_center', None)
+    if prev is None:
+        return 0, 0
+    cx, cy = sprite.rect.center
+    return round((cx - prev[0]) * (alpha - 1)), round((cy - prev[1]) * (alpha - 1))
+
+def draw_interpolated(surface, group, alpha, dirty=None):
+    """Like Group.draw, but places each sprite between its previous and current position."""
+    blits = []
+    for sprite in group:
+        dx, dy = interpolated_offset(sprite, alpha)
+        blits.append((sprite.image, (sprite.rect.x + dx, sprite.rect.y + dy)))
+    blit_batch(surface, blits)
+    if dirty is not None and blits:
+        left, top = zip(*(pos for _, pos in blits))
+        width, height = zip(*(image.get_size() for image, _ in blits))
+        dirty.mark_many(left, top, width, height)
+
 # Player Class
 class Player(pygame.sprite.Sprite):
     def __init__(self):
@@ -360,7 +379,7 @@ class Player(pygame.sprite.Sprite):
     def update(self):
         self.speedx = 0
         self.speedy = 0
-        gpio_states = read_gpio_input()
+        gpio_states = current_input().held  # Polled once per step in BulletHellGame.step()
 
         if gpio_states.get("left"):
             self.speedx = -self.base_speed
@@ -389,7 +408,7 @@ class Player(pygame.sprite.Sprite):
             self.shoot()
 
     def shoot(self):
-        now = pygame.time.get_ticks()
+        now = sim_now()
         if now - getattr(self, 'last_shot', 0) > 250:
             self.last_shot = now
 
@@ -462,8 +481,7 @@ class Player(pygame.sprite.Sprite):
 class Bullet(pygame.sprite.Sprite):
     def __init__(self, x, y, power_level, speedx=0, speedy=-12):
         super(Bullet, self).__init__()
-        self.image = pygame.Surface((5, 10))
-        self.image.fill(RED)
+        self.image = sprite_atlas.solid('player_bullet', (5, 10), RED)
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.bottom = y
@@ -479,112 +497,44 @@ class Bullet(pygame.sprite.Sprite):
             self.rect.right < 0 or self.rect.left > SCREEN_WIDTH):
             self.kill()
 
-# Enemy Bullet Class
-class EnemyBullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, speedx, speedy, size=7, accel_x=0, accel_y=0):
-        super(EnemyBullet, self).__init__()
-        self.image = pygame.Surface((size, size))
-        if level == 10:
-            self.image.fill(BLACK)  # Black bullets for level 10
-        else:
-            self.image.fill(YELLOW)  # Original color for other levels
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.centery = y
-        self.speedx = speedx
-        self.speedy = speedy
-        self.accel_x = accel_x
-        self.accel_y = accel_y
-        self.damage = 25
-        self.grazed = False  # New attribute to track if bullet has been grazed
-
-    def update(self):
-        self.speedx += self.accel_x
-        self.speedy += self.accel_y
-        self.rect.x += self.speedx
-        self.rect.y += self.speedy
-        # Remove the bullet if it goes off-screen
-        if self.rect.right < 0 or self.rect.left > SCREEN_WIDTH:
-            self.kill()
-        if self.rect.top > SCREEN_HEIGHT or self.rect.bottom < 0:
-            self.kill()
-
-# PowerPoint Class
-class PowerPoint(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super(PowerPoint, self).__init__()
-        self.image = pygame.Surface((10, 10))
-        self.image.fill(PURPLE)
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.centery = y
-        self.speedy = 1  # Falls slowly downwards
-
-    def update(self):
-        self.rect.y += self.speedy
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
-
-# Point Class
-class Point(pygame.sprite.Sprite):
-    def __init__(self, x, y, value):
-        super(Point, self).__init__()
-        self.image = pygame.Surface((8, 8))
-        self.image.fill(LIGHT_BLUE)
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.centery = y
-        self.speedy = 2  # Falls slightly faster than power points
-        self.value = value
-
-    def update(self):
-        self.rect.y += self.speedy
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
-
 # Enemy Class
 class Enemy(pygame.sprite.Sprite):
     def __init__(self, level, pattern):
         super(Enemy, self).__init__()
-        self.image = enemy_images.get(pattern, pygame.Surface((30, 30)))
-        if isinstance(self.image, pygame.Surface):
-            self.image = enemy_images[pattern].copy()  # Create a copy of the original image
-        
         # Only make enemies black in level 10
         if level == 10:
-            self.image.fill(BLACK)
+            self.image = sprite_atlas.solid('enemy', (30, 30), BLACK, get_sprite_theme(level))
+        else:
+            self.image = sprite_atlas.image(f'enemy_{pattern}', enemy_images[pattern])
         self.rect = self.image.get_rect()
         self.speed = 2 + level * 0.2
-        self.last_shot = pygame.time.get_ticks()
+        self.last_shot = sim_now()
         self.shoot_delay = max(1000, 2000 - level * 100)
         self.hp = 100 + level * 50
         self.alive = True
         self.pattern = pattern
 
         # Spawn positions only in the top two-thirds of the screen
-        self.rect.x = random.randint(0, SCREEN_WIDTH - self.rect.width)
-        self.rect.y = random.randint(-self.rect.height, int(PLAYER_AREA_Y / 2) - self.rect.height)
+        self.rect.x = rng.randint(0, SCREEN_WIDTH - self.rect.width)
+        self.rect.y = rng.randint(-self.rect.height, int(PLAYER_AREA_Y / 2) - self.rect.height)
 
         # Movement variables
-        self.speed_change_time = pygame.time.get_ticks()
-        self.speed_change_interval = random.randint(1000, 3000)
+        self.speed_change_time = sim_now()
+        self.speed_change_interval = rng.randint(1000, 3000)
         self.base_speed = self.speed
-        self.speedx = random.choice([self.base_speed, -self.base_speed, 0])
-        self.speedy = random.choice([self.base_speed, -self.base_speed, 0])
-
-        if level == 10:
-            self.image.fill(BLACK)  # Make enemy black for level 10
+        self.speedx = rng.choice([self.base_speed, -self.base_speed, 0])
+        self.speedy = rng.choice([self.base_speed, -self.base_speed, 0])
 
     def update(self):
-        now = pygame.time.get_ticks()
+        now = sim_now()
 
         # Change speed at intervals
         if now - self.speed_change_time > self.speed_change_interval:
             self.speed_change_time = now
-            self.speed_change_interval = random.randint(1000, 3000)
+            self.speed_change_interval = rng.randint(1000, 3000)
             # Randomly choose new speeds or stop
-            self.speedx = random.choice([self.base_speed, -self.base_speed, 0])
-            self.speedy = random.choice([self.base_speed, -self.base_speed, 0])
+            self.speedx = rng.choice([self.base_speed, -self.base_speed, 0])
+            self.speedy = rng.choice([self.base_speed, -self.base_speed, 0])
 
         # Move enemy
         self.rect.x += self.speedx
@@ -617,39 +567,25 @@ class Enemy(pygame.sprite.Sprite):
                         distance = 1
                     speedx = (dx / distance) * 5
                     speedy = (dy / distance) * 5
-                    bullet = EnemyBullet(self.rect.centerx, self.rect.centery, speedx, speedy)
-                    all_sprites.add(bullet)
-                    enemy_bullets.add(bullet)
+                    enemy_bullet_pool.spawn(self.rect.centerx, self.rect.centery, speedx, speedy)
                 elif self.pattern == 'random':
                     # Shoot in a random direction
-                    angle = random.uniform(0, 2 * math.pi)
+                    angle = rng.uniform(0, 2 * math.pi)
                     speedx = math.cos(angle) * 4
                     speedy = math.sin(angle) * 4
-                    bullet = EnemyBullet(self.rect.centerx, self.rect.centery, speedx, speedy)
-                    all_sprites.add(bullet)
-                    enemy_bullets.add(bullet)
+                    enemy_bullet_pool.spawn(self.rect.centerx, self.rect.centery, speedx, speedy)
                 elif self.pattern == 'circle':
                     # Shoot bullets in all directions
-                    num_bullets = 8
-                    for i in range(num_bullets):
-                        angle = (2 * math.pi / num_bullets) * i
-                        speedx = math.cos(angle) * 3
-                        speedy = math.sin(angle) * 3
-                        bullet = EnemyBullet(self.rect.centerx, self.rect.centery, speedx, speedy)
-                        all_sprites.add(bullet)
-                        enemy_bullets.add(bullet)
+                    speedx, speedy = ring_velocities(8, 3)
+                    enemy_bullet_pool.spawn_many(self.rect.centerx, self.rect.centery, speedx, speedy)
 
     def die(self):
         # Drop power-point upon death
-        if random.random() < 0.5:  # 50% chance to drop pp
-            pp = PowerPoint(self.rect.centerx, self.rect.centery)
-            all_sprites.add(pp)
-            power_points.add(pp)
+        if rng.random() < 0.5:  # 50% chance to drop pp
+            pickup_pool.spawn(PICKUP_POWER, self.rect.centerx, self.rect.centery, 1)
         
         # Always drop points
-        point = Point(self.rect.centerx, self.rect.centery, 1000)  # 1000 points per enemy
-        all_sprites.add(point)
-        points.add(point)
+        pickup_pool.spawn(PICKUP_POINT, self.rect.centerx, self.rect.centery, 1000)  # 1000 points per enemy
         self.kill()
 
 # Boss Class
@@ -674,10 +610,10 @@ class Boss(pygame.sprite.Sprite):
         self.speedy = 1
 
         # Shooting attributes
-        self.last_shot = pygame.time.get_ticks()
+        self.last_shot = sim_now()
         self.shoot_delay = 2000  # Constant interval of 2 seconds
         self.mass_accel_interval = 100  # Spawn every 100 ms
-        self.last_mass_accel_shot = pygame.time.get_ticks()
+        self.last_mass_accel_shot = sim_now()
 
         self.is_second_phase = level == 11
         self.health = 2000 * (1.5 ** (level - 1))
@@ -705,7 +641,7 @@ class Boss(pygame.sprite.Sprite):
         self.special_attack()
 
     def shoot(self):
-        now = pygame.time.get_ticks()
+        now = sim_now()
         if self.pattern != 'mass_acceleration':
             if now - self.last_shot > self.shoot_delay:
                 self.last_shot = now
@@ -714,74 +650,39 @@ class Boss(pygame.sprite.Sprite):
                 firing_points = []
                 margin = 50
                 for _ in range(num_firing_points):
-                    fx = random.randint(margin, SCREEN_WIDTH - margin)
-                    fy = random.randint(0, int(TOP_THIRD_Y_LIMIT / 2))
+                    fx = rng.randint(margin, SCREEN_WIDTH - margin)
+                    fy = rng.randint(0, int(TOP_THIRD_Y_LIMIT / 2))
                     firing_points.append((fx, fy))
 
                 bullet_size = 15  # Larger bullets for bosses
-
-                if self.pattern == 'burst_homing':
-                    # Homing bullets shot simultaneously from spread points
-                    for point in firing_points:
-                        dx = player.rect.centerx - point[0]
-                        dy = player.rect.centery - point[1]
-                        distance = math.hypot(dx, dy)
-                        if distance == 0:
-                            distance = 1
-                        speedx = (dx / distance) * 5
-                        speedy = (dy / distance) * 5
-                        bullet = EnemyBullet(point[0], point[1], speedx, speedy, size=bullet_size)
-                        all_sprites.add(bullet)
-                        enemy_bullets.add(bullet)
-                elif self.pattern == 'spiral':
-                    # Spiral bullet pattern from spread points
-                    num_bullets = 12
-                    for point in firing_points:
-                        for i in range(num_bullets):
-                            angle = (2 * math.pi / num_bullets) * i + (now % 360) * (math.pi / 180)
-                            speedx = math.cos(angle) * 3
-                            speedy = math.sin(angle) * 3
-                            bullet = EnemyBullet(point[0], point[1], speedx, speedy, size=bullet_size)
-                            all_sprites.add(bullet)
-                            enemy_bullets.add(bullet)
-                elif self.pattern == 'circle':
-                    # Circular bullet pattern from spread points
-                    num_bullets = 16
-                    for point in firing_points:
-                        for i in range(num_bullets):
-                            angle = (2 * math.pi / num_bullets) * i
-                            speedx = math.cos(angle) * 2
-                            speedy = math.sin(angle) * 2
-                            bullet = EnemyBullet(point[0], point[1], speedx, speedy, size=bullet_size)
-                            all_sprites.add(bullet)
-                            enemy_bullets.add(bullet)
-                elif self.pattern == 'aimed':
-                    # Boss aims directly at the player from spread points
-                    for point in firing_points:
-                        dx = player.rect.centerx - point[0]
-                        dy = player.rect.centery - point[1]
-                        distance = math.hypot(dx, dy)
-                        if distance == 0:
-                            distance = 1
-                        speedx = (dx / distance) * 5
-                        speedy = (dy / distance) * 5
-                        bullet = EnemyBullet(point[0], point[1], speedx, speedy, size=bullet_size)
-                        all_sprites.add(bullet)
-                        enemy_bullets.add(bullet)
+                fx = np.array([point[0] for point in firing_points], dtype=np.float32)
+                fy = np.array([point[1] for point in firing_points], dtype=np.float32)
+
+                if self.pattern in ('burst_homing', 'aimed'):
+                    # Bullets shot simultaneously from spread points straight at the player
+                    speedx, speedy = aimed_velocities(fx, fy, 5)
+                    enemy_bullet_pool.spawn_many(fx, fy, speedx, speedy, size=bullet_size)
+                elif self.pattern in ('spiral', 'circle'):
+                    if self.pattern == 'spiral':
+                        # Spiral bullet pattern from spread points
+                        ring_x, ring_y = ring_velocities(12, 3, (now % 360) * (math.pi / 180))
+                    else:
+                        # Circular bullet pattern from spread points
+                        ring_x, ring_y = ring_velocities(16, 2)
+                    # One full ring per firing point: rows are points, columns are ring bullets
+                    enemy_bullet_pool.spawn_many(fx[:, None], fy[:, None], ring_x[None, :], ring_y[None, :],
+                                                 size=bullet_size)
                 elif self.pattern == 'random':
                     # Boss shoots bullets in random directions from spread points
                     num_random_bullets = 5
-                    for point in firing_points:
-                        for _ in range(num_random_bullets):
-                            angle = random.uniform(0, 2 * math.pi)
-                            speedx = math.cos(angle) * 4
-                            speedy = math.sin(angle) * 4
-                            bullet = EnemyBullet(point[0], point[1], speedx, speedy, size=bullet_size)
-                            all_sprites.add(bullet)
-                            enemy_bullets.add(bullet)
+                    angles = np.array([rng.uniform(0, 2 * math.pi)
+                                       for _ in range(num_firing_points * num_random_bullets)])
+                    angles = angles.reshape(num_firing_points, num_random_bullets)
+                    enemy_bullet_pool.spawn_many(fx[:, None], fy[:, None], np.cos(angles) * 4, np.sin(angles) * 4,
+                                                 size=bullet_size)
 
     def special_attack(self):
-        now = pygame.time.get_ticks()
+        now = sim_now()
         if self.pattern in ['mass_acceleration', 'final_phase']:
             if now - self.last_mass_accel_shot > self.mass_accel_interval:
                 self.last_mass_accel_shot = now
@@ -789,13 +690,14 @@ class Boss(pygame.sprite.Sprite):
                 bullet_size = 15
                 
                 # Add side spawns for second phase
-                spawn_points = [(random.randint(0, SCREEN_WIDTH), random.randint(0, int(TOP_THIRD_Y_LIMIT)))]
+                spawn_points = [(rng.randint(0, SCREEN_WIDTH), rng.randint(0, int(TOP_THIRD_Y_LIMIT)))]
                 if self.is_second_phase:
                     spawn_points.extend([
-                        (0, random.randint(0, SCREEN_HEIGHT)),         # Left side spawn
-                        (SCREEN_WIDTH, random.randint(0, SCREEN_HEIGHT))  # Right side spawn
+                        (0, rng.randint(0, SCREEN_HEIGHT)),         # Left side spawn
+                        (SCREEN_WIDTH, rng.randint(0, SCREEN_HEIGHT))  # Right side spawn
                     ])
 
+                spawn_x, spawn_y, spawn_vx, spawn_vy, spawn_ay = [], [], [], [], []
                 for spawn_point in spawn_points:
                     for _ in range(num_bullets):
                         fx, fy = spawn_point
@@ -810,20 +712,25 @@ class Boss(pygame.sprite.Sprite):
                                 speedx = -6  # Move left
                                 speedy = 0
                             else:  # Top spawns
-                                angle_variation = random.uniform(-0.2, 0.2)
+                                angle_variation = rng.uniform(-0.2, 0.2)
                                 speedx = math.sin(angle_variation) * 2
                                 speedy = 4 + abs(math.cos(angle_variation)) * 2
                         else:
                             # Normal pattern for first phase
-                            angle_variation = random.uniform(-0.2, 0.2)
+                            angle_variation = rng.uniform(-0.2, 0.2)
                             speedx = math.sin(angle_variation) * 2
                             speedy = 4 + abs(math.cos(angle_variation)) * 2
                         
                         accel_y = 0 if self.is_second_phase and (fx == 0 or fx == SCREEN_WIDTH) else 0.05
-                        
-                        bullet = EnemyBullet(fx, fy, speedx, speedy, size=bullet_size, accel_x=0, accel_y=accel_y)
-                        all_sprites.add(bullet)
-                        enemy_bullets.add(bullet)
+
+                        spawn_x.append(fx)
+                        spawn_y.append(fy)
+                        spawn_vx.append(speedx)
+                        spawn_vy.append(speedy)
+                        spawn_ay.append(accel_y)
+
+                enemy_bullet_pool.spawn_many(spawn_x, spawn_y, spawn_vx, spawn_vy,
+                                             size=bullet_size, ax=0, ay=spawn_ay)
 
     def draw_health_bar(self, surface):
         # Modify health bar colors for level 10
@@ -836,28 +743,24 @@ class Boss(pygame.sprite.Sprite):
         fill_rect = pygame.Rect(self.rect.x, self.rect.y - 15, fill, bar_height)
         outline_rect = pygame.Rect(self.rect.x, self.rect.y - 15, bar_length, bar_height)
         pygame.draw.rect(surface, bar_color, fill_rect)
-        pygame.draw.rect(surface, outline_color, outline_rect, 1)
+        return pygame.draw.rect(surface, outline_color, outline_rect, 1)
 
     def die(self):
         self.kill()
         # Clear all bullets and power-points upon boss death
         for bullet in bullets:
             bullet.kill()
-        for bullet in enemy_bullets:
-            bullet.kill()
-        for pp in power_points:
-            pp.kill()
+        enemy_bullet_pool.clear()
+        pickup_pool.kill_kind(PICKUP_POWER)
         # Despawn all remaining enemies
         for enemy in enemies:
             enemy.kill()
         
         # Drop lots of points for boss kill
-        for _ in range(10):  # Drop multiple point items
-            x = self.rect.centerx + random.randint(-50, 50)
-            y = self.rect.centery + random.randint(-30, 30)
-            point = Point(x, y, 10000)  # 10000 points per point item
-            all_sprites.add(point)
-            points.add(point)
+        drops = [(self.rect.centerx + rng.randint(-50, 50), self.rect.centery + rng.randint(-30, 30))
+                 for _ in range(10)]  # Drop multiple point items
+        xs, ys = zip(*drops)
+        pickup_pool.spawn_many(PICKUP_POINT, xs, ys, 10000)  # 10000 points per point item
 
 # Functions to display messages
 def display_game_over():
@@ -869,9 +772,9 @@ def display_game_over():
     screen.blit(overlay, (0, 0))
     
     # Draw central cyberpunk-style message
-    title = font.render("GAME OVER", True, (255, 20, 147))
-    score_text = font.render(f"Final Score: {player.score:,}", True, WHITE)
-    instr_text = font.render("Press R to Restart, C to Continue, M for Menu", True, (0, 255, 255))
+    title = render_text(font, "GAME OVER", (255, 20, 147))
+    score_text = render_text(font, f"Final Score: {player.score:,}", WHITE)
+    instr_text = render_text(font, "Press R to Restart, C to Continue, M for Menu", (0, 255, 255))
     
     title_rect = title.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 60))
     score_rect = score_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
@@ -890,15 +793,15 @@ def display_game_won():
     overlay.fill((10, 10, 40))
     screen.blit(overlay, (0, 0))
     
-    title_text = font.render("CONGRATULATIONS!", True, (0, 255, 255))
-    score_text = font.render(f"Final Score: {player.score:,}", True, WHITE)
+    title_text = render_text(font, "CONGRATULATIONS!", (0, 255, 255))
+    score_text = render_text(font, f"Final Score: {player.score:,}", WHITE)
     
     if player.continued_run:
-        status_text = font.render("*Continued Run*", True, RED)
+        status_text = render_text(font, "*Continued Run*", RED)
     else:
-        status_text = font.render("Legitimate Clear!", True, GREEN)
+        status_text = render_text(font, "Legitimate Clear!", GREEN)
         
-    instr_text = font.render("Press R to Play Again, M for Menu", True, (255, 105, 180))
+    instr_text = render_text(font, "Press R to Play Again, M for Menu", (255, 105, 180))
     
     title_rect = title_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 80))
     score_rect = score_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 20))
@@ -919,8 +822,8 @@ def display_level_completion(level):
     overlay.fill((20, 20, 40))
     screen.blit(overlay, (0, 0))
     
-    level_text = font.render(f"Level {level} Complete!", True, (0, 255, 255))
-    score_text = font.render(f"Current Score: {player.score:,}", True, WHITE)
+    level_text = render_text(font, f"Level {level} Complete!", (0, 255, 255))
+    score_text = render_text(font, f"Current Score: {player.score:,}", WHITE)
     
     level_rect = level_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 20))
     score_rect = score_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 20))
@@ -931,34 +834,35 @@ def display_level_completion(level):
     pygame.time.delay(2000)
 
 # Function to Reset the Game
-def reset_game(continue_game=False):
+def reset_game(continue_game=False, seed=None):
     global level, boss_spawned, boss_active, game_over, level_complete, game_won
     global wave_number, waves_per_level, wave_start_time, level_start_time
 
     if not continue_game:
         # Full reset
+        seed_simulation(seed)
         level = 1
         boss_spawned = False
         boss_active = False
         wave_number = 0
         waves_per_level = 3 + (level // 2)
-        wave_start_time = pygame.time.get_ticks()
-        level_start_time = pygame.time.get_ticks()
+        wave_start_time = sim_now()
+        level_start_time = sim_now()
 
         # Clear all sprites and recreate player
         all_sprites.empty()
         bullets.empty()
-        enemy_bullets.empty()
+        enemy_bullet_pool.clear()
         enemies.empty()
         bosses.empty()
-        power_points.empty()
-        points.empty()
+        pickup_pool.clear()
 
         # Reset player
         player.lives = 3
         player.power_level = 1
         player.continued_run = False
         player.score = 0
+        player.last_shot = 0
 
         # Create new player image with original colors
         player.image = pygame.Surface((30, 30), pygame.SRCALPHA)
@@ -982,13 +886,13 @@ def reset_game(continue_game=False):
 # Function to Spawn Enemy Wave
 def spawn_enemy_wave():
     global wave_start_time
-    enemy_pattern = random.choice(['aimed', 'random', 'circle'])
+    enemy_pattern = rng.choice(['aimed', 'random', 'circle'])
     num_enemies = 2 + (level - 1) * 2
     for _ in range(num_enemies):
         enemy = Enemy(level, enemy_pattern)
         all_sprites.add(enemy)
         enemies.add(enemy)
-    wave_start_time = pygame.time.get_ticks()
+    wave_start_time = sim_now()
 
 # Function to Spawn Boss
 def spawn_boss():
@@ -1002,40 +906,36 @@ def spawn_boss():
     boss_active = True
     boss_spawned = True
 
-# Create Player
-player = Player()
-all_sprites.add(player)
+player = None  # Created by load_assets()
 
 # Add score display to the HUD
 def draw_hud():
+    """Draws the HUD text and returns the rects it covered."""
     text_color = get_text_color(level)
-    lives_text = font.render(f'Lives: {player.lives}', True, text_color)
-    level_text = font.render(f'Level: {level}', True, text_color)
-    power_text = font.render(f'Power: {player.power_level}', True, text_color)
-    score_text = font.render(f'Score: {player.score:,}', True, text_color)  # Add comma formatting
+    lives_text = render_text(font, f'Lives: {player.lives}', text_color)
+    level_text = render_text(font, f'Level: {level}', text_color)
+    power_text = render_text(font, f'Power: {player.power_level}', text_color)
+    score_text = render_text(font, f'Score: {player.score:,}', text_color)  # Add comma formatting
     
-    screen.blit(lives_text, (10, 10))
-    screen.blit(level_text, (10, 50))
-    screen.blit(power_text, (10, 90))
-    screen.blit(score_text, (10, 130))  # Add score display
+    drawn = [
+        screen.blit(lives_text, (10, 10)),
+        screen.blit(level_text, (10, 50)),
+        screen.blit(power_text, (10, 90)),
+        screen.blit(score_text, (10, 130)),  # Add score display
+    ]
     
     # Add watermark if continued run
     if player.continued_run:
-        watermark = font.render(WATERMARK_TEXT, True, RED)
-        screen.blit(watermark, (SCREEN_WIDTH - watermark.get_width() - 10, 10))
+        watermark = render_text(font, WATERMARK_TEXT, RED)
+        drawn.append(screen.blit(watermark, (SCREEN_WIDTH - watermark.get_width() - 10, 10)))
+    return drawn
         
 def start_menu(screen, font, clock):
     options = ["Start Game", "Return to Main Menu"]
     selected = 0
-    title_font = pygame.font.SysFont("Arial", 72, bold=True)
-    last_gpio_states = {}  # To track previous GPIO states for debouncing
+    title_font = get_font("Arial", 72, bold=True, system=True)
     while True:
-        current_states = read_gpio_input()
-        gpio_states = {
-            key: current_states[key] and not last_gpio_states.get(key, False)
-            for key in current_states
-        }  # Only register a press if it wasn't pressed in the last state
-        last_gpio_states = current_states
+        gpio_states = poll_input().pressed  # Only register new presses
 
         if gpio_states.get("up"):
             selected = (selected - 1) % len(options)
@@ -1050,19 +950,19 @@ def start_menu(screen, font, clock):
         overlay.fill((10, 10, 40))
         screen.blit(overlay, (0, 0))
 
-        title_text = title_font.render("BULLET HELL", True, (0, 255, 255))
-        glow = title_font.render("BULLET HELL", True, (255, 20, 147))
+        title_text = render_text(title_font, "BULLET HELL", (0, 255, 255))
+        glow = render_text(title_font, "BULLET HELL", (255, 20, 147))
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
         screen.blit(glow, (title_rect.x - 2, title_rect.y - 2))
         screen.blit(title_text, title_rect)
 
         for i, option in enumerate(options):
             color = (0, 255, 255) if i == selected else (200, 200, 200)
-            option_text = font.render(option, True, color)
+            option_text = render_text(font, option, color)
             option_rect = option_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + i * 40))
             screen.blit(option_text, option_rect)
 
-        instr_text = font.render("Use UP/DOWN & SELECT", True, (255, 105, 180))
+        instr_text = render_text(font, "Use UP/DOWN & SELECT", (255, 105, 180))
         instr_rect = instr_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40))
         screen.blit(instr_text, instr_rect)
 
@@ -1070,19 +970,25 @@ def start_menu(screen, font, clock):
         clock.tick(FPS)
 
 class BulletHellGame:
-    def __init__(self):
+    def __init__(self, dirty_rects=None):
         # Initialize game attributes
         self.running = True
+        load_assets()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Bullet Hell")
         self.clock = pygame.time.Clock()
+        if dirty_rects is None:
+            dirty_rects = os.environ.get(DIRTY_RECTS_ENV, "") not in ("", "0")
+        # Only redraws and presents the regions that changed; None means full redraw and flip every frame
+        self.dirty = DirtyRectRenderer((SCREEN_WIDTH, SCREEN_HEIGHT)) if dirty_rects else None
         
         # Initialize game objects and variables
         self.init_game()
-        self.last_gpio_states = {}  # To track previous GPIO states for debouncing
+        self.gpio_states = {}
+        self.level_banner = None  # Level whose completion banner game_loop still has to show
 
     def init_game(self):
-        global player, all_sprites, bullets, enemy_bullets, enemies, bosses, power_points, points
+        global player, all_sprites, bullets, enemy_bullet_pool, enemies, bosses, pickup_pool
         global level, boss_spawned, boss_active, game_over, level_complete, game_won
         global wave_number, wave_start_time, level_start_time
         
@@ -1090,13 +996,8 @@ class BulletHellGame:
         # (Copy existing initialization code)
 
     def update_gpio_states(self):
-        """Continuously updates GPIO states for use in the game."""
-        current_states = read_gpio_input()
-        self.gpio_states = {
-            key: current_states[key] and not self.last_gpio_states.get(key, False)
-            for key in current_states
-        }  # Only register a press if it wasn't pressed in the last state
-        self.last_gpio_states = current_states
+        """Polls the input service once for this frame and keeps the new presses."""
+        self.gpio_states = poll_input().pressed
 
     def handle_menu_input(self):
         self.update_gpio_states()  # Update GPIO states dynamically
@@ -1111,16 +1012,14 @@ class BulletHellGame:
         return None
 
     def handle_events(self):
+        """Input for the game over screen. During play, step() polls instead."""
         self.update_gpio_states()
         if self.gpio_states.get("esc"):
             self.running = False
-        elif game_over:
-            if self.gpio_states.get("action1"):
-                reset_game(False)
-            elif self.gpio_states.get("action2"):
-                reset_game(True)
         elif self.gpio_states.get("action1"):
-            player.shoot()
+            reset_game(False)
+        elif self.gpio_states.get("action2"):
+            reset_game(True)
 
     def run(self):
         while True:
@@ -1132,312 +1031,217 @@ class BulletHellGame:
             self.game_loop()  # Run one game session
             
     def game_loop(self):
-        global game_over, boss_spawned, boss_active, level_complete, level, game_won
-        global wave_number, wave_start_time, level_start_time
-        wave_start_time = pygame.time.get_ticks()
-        level_start_time = pygame.time.get_ticks()
+        global wave_start_time, level_start_time
+        wave_start_time = sim_now()
+        level_start_time = sim_now()
+        accumulator = 0.0
+        profiler.start_session("bullethell")
+        self.invalidate_screen()
         while self.running:
-            self.clock.tick(FPS)
-            now = pygame.time.get_ticks()
-            self.handle_events()
+            # Render at most FPS times a second; the simulation catches up in fixed steps
+            accumulator += min(self.clock.tick(FPS), MAX_FRAME_MS)
+            profiler.tick()
             if not game_over:
-                # Enemy spawning logic
-                waves_per_level = 3 + (level // 2)
-                if not boss_spawned and not level_complete:
-                    if wave_number < waves_per_level:
-                        if now - wave_start_time > wave_duration:
-                            wave_number += 1
-                            spawn_enemy_wave()
-                        elif len(enemies) == 0:
-                            wave_number += 1
-                            spawn_enemy_wave()
-                    else:
-                        if len(enemies) == 0:
-                            spawn_boss()
-                        elif now - level_start_time > level_duration:
-                            for enemy in enemies:
-                                enemy.kill()
-                            spawn_boss()
-                elif boss_spawned and boss_active:
-                    max_enemies_during_boss = min(2 + level, 10)
-                    enemy_spawn_chance = max(0.005, 0.02 - level * 0.001)
-                    if len(enemies) < max_enemies_during_boss and random.random() < enemy_spawn_chance:
-                        enemy_pattern = random.choice(['aimed', 'random', 'circle'])
-                        enemy = Enemy(level, enemy_pattern)
-                        all_sprites.add(enemy)
-                        enemies.add(enemy)
-                    if not bosses:
-                        boss_active = False
-                        level_complete = True
-
-                # Update sprites and handle collisions/score as before
-                all_sprites.update()
-                
-                waves_per_level = 3 + (level // 2)
-
-                if not boss_spawned and not level_complete:
-                    if wave_number < waves_per_level:
-                        if now - wave_start_time > wave_duration:
-                            wave_number += 1
-                            spawn_enemy_wave()
-                        elif len(enemies) == 0:
-                            wave_number += 1
-                            spawn_enemy_wave()
-                    else:
-                        if len(enemies) == 0:
-                            spawn_boss()
-                        elif now - level_start_time > level_duration:
-                            for enemy in enemies:
-                                enemy.kill()
-                            spawn_boss()
-                elif boss_spawned and boss_active:
-                    max_enemies_during_boss = min(2 + level, 10)
-                    enemy_spawn_chance = max(0.005, 0.02 - level * 0.001)
-                    if len(enemies) < max_enemies_during_boss and random.random() < enemy_spawn_chance:
-                        enemy_pattern = random.choice(['aimed', 'random', 'circle'])
-                        enemy = Enemy(level, enemy_pattern)
-                        all_sprites.add(enemy)
-                        enemies.add(enemy)
-                    if not bosses:
-                        boss_active = False
-                        level_complete = True
-
-                enemy_hits = pygame.sprite.groupcollide(enemies, bullets, False, True)
-                for enemy, bullet_list in enemy_hits.items():
-                    for bullet in bullet_list:
-                        enemy.hp -= bullet.damage
-                        if enemy.hp <= 0:
-                            enemy.die()
-
-                boss_hits = pygame.sprite.groupcollide(bosses, bullets, False, True)
-                for boss, bullet_list in boss_hits.items():
-                    for bullet in bullet_list:
-                        boss.health -= bullet.damage
-                        if boss.health <= 0:
-                            boss.die()
-
-                player_hitbox = player.rect.center
-
-                hit = False
-                for bullet in enemy_bullets:
-                    if bullet.rect.collidepoint(player_hitbox):
-                        bullet.kill()
-                        hit = True
-                if hit:
-                    player.lives -= 1
-                    if player.lives <= 0:
-                        game_over = True
-
-                collide = False
-                for enemy in enemies:
-                    if enemy.rect.collidepoint(player_hitbox):
-                        enemy.kill()
-                        collide = True
-                if collide:
-                    player.lives -= 1
-                    if player.lives <= 0:
-                        game_over = True
-
-                pp_hits = pygame.sprite.spritecollide(player, power_points, True)
-                for pp in pp_hits:
-                    player.pp_collected += 1
-                    if player.pp_collected >= player.pp_needed:
-                        player.power_up()
-
-                for bullet in enemy_bullets:
-                    if not bullet.grazed:
-                        if bullet.rect.colliderect(player.rect):
-                            if not bullet.rect.collidepoint(player.rect.center):
-                                bullet.grazed = True
-                                point = Point(bullet.rect.centerx, bullet.rect.centery, 5000)
-                                all_sprites.add(point)
-                                points.add(point)
-
-                points_collected = pygame.sprite.spritecollide(player, points, True)
-                for point in points_collected:
-                    player.score += point.value
-
-                if level_complete:
-                    if level == 10:
-                        level = 11
-                        level_complete = False
-                        boss_spawned = False
-                        boss_active = False
-                        spawn_boss()
-                    elif level >= max_levels:
-                        game_won = True
-                        game_over = True
-                    else:
-                        level += 1
-                        level_complete = False
-                        boss_spawned = False
-                        boss_active = False
-                        wave_number = 0
-                        waves_per_level = 3 + (level // 2)
-                        level_start_time = pygame.time.get_ticks()
-                        display_level_completion(level - 1)
-
-                # Drawing code
-                if isinstance(backgrounds.get(level, BLACK), pygame.Surface):
-                    self.screen.blit(backgrounds[level], (0, 0))
-                else:
-                    self.screen.fill(backgrounds[level])
-                all_sprites.draw(self.screen)
-                pygame.draw.circle(self.screen, RED, player.rect.center, 3)
-                for boss in bosses:
-                    boss.draw_health_bar(self.screen)
-                draw_hud()
-                pygame.display.flip()
+                steps = 0
+                while (accumulator >= SIM_STEP_MS and steps < MAX_SIM_STEPS and self.running
+                       and not game_over and self.level_banner is None):
+                    self.step()
+                    accumulator -= SIM_STEP_MS
+                    steps += 1
+                if steps == MAX_SIM_STEPS:
+                    accumulator = min(accumulator, SIM_STEP_MS)  # Too far behind, let it slow down instead
+                if self.level_banner is not None:
+                    # Blocks for a while; the next frame's time is clamped to MAX_FRAME_MS
+                    display_level_completion(self.level_banner)
+                    self.level_banner = None
+                    self.invalidate_screen()
+                    continue
+                self.render(accumulator / SIM_STEP_MS)
             else:
+                with profiler.scope("input"):
+                    self.handle_events()
                 if game_won:
                     display_game_won()
                 else:
                     display_game_over()
+                self.invalidate_screen()
         # End of game_loop returns to run() to show the start menu again
 
-# Main Game Loop
-# ...existing code above remains unchanged...
-
-# Main Game Loop
-def main():
-    global game_over, boss_spawned, boss_active, level_complete, level, game_won
-    global wave_number, wave_start_time, level_start_time
-    running = True
-    wave_start_time = pygame.time.get_ticks()
-    level_start_time = pygame.time.get_ticks()
-    while running:
-        clock.tick(FPS)
-        now = pygame.time.get_ticks()
-        gpio_states = read_gpio_input()
-        if gpio_states.get("esc"):
-            running = False
-        elif game_over:
-            if gpio_states.get("action1"):
-                reset_game(False)
-            elif gpio_states.get("action2"):
-                reset_game(True)
-        if not game_over:
-            all_sprites.update()
-
-            waves_per_level = 3 + (level // 2)
-
-            if not boss_spawned and not level_complete:
-                if wave_number < waves_per_level:
-                    if now - wave_start_time > wave_duration:
-                        wave_number += 1
-                        spawn_enemy_wave()
-                    elif len(enemies) == 0:
-                        wave_number += 1
-                        spawn_enemy_wave()
-                else:
-                    if len(enemies) == 0:
-                        spawn_boss()
-                    elif now - level_start_time > level_duration:
-                        for enemy in enemies:
-                            enemy.kill()
-                        spawn_boss()
-            elif boss_spawned and boss_active:
-                max_enemies_during_boss = min(2 + level, 10)
-                enemy_spawn_chance = max(0.005, 0.02 - level * 0.001)
-                if len(enemies) < max_enemies_during_boss and random.random() < enemy_spawn_chance:
-                    enemy_pattern = random.choice(['aimed', 'random', 'circle'])
-                    enemy = Enemy(level, enemy_pattern)
-                    all_sprites.add(enemy)
-                    enemies.add(enemy)
-                if not bosses:
-                    boss_active = False
-                    level_complete = True
-
-            enemy_hits = pygame.sprite.groupcollide(enemies, bullets, False, True)
-            for enemy, bullet_list in enemy_hits.items():
-                for bullet in bullet_list:
-                    enemy.hp -= bullet.damage
-                    if enemy.hp <= 0:
-                        enemy.die()
-
-            boss_hits = pygame.sprite.groupcollide(bosses, bullets, False, True)
-            for boss, bullet_list in boss_hits.items():
-                for bullet in bullet_list:
-                    boss.health -= bullet.damage
-                    if boss.health <= 0:
-                        boss.die()
-
-            player_hitbox = player.rect.center
-
-            hit = False
-            for bullet in enemy_bullets:
-                if bullet.rect.collidepoint(player_hitbox):
-                    bullet.kill()
-                    hit = True
-            if hit:
-                player.lives -= 1
-                if player.lives <= 0:
-                    game_over = True
-
-            collide = False
-            for enemy in enemies:
-                if enemy.rect.collidepoint(player_hitbox):
-                    enemy.kill()
-                    collide = True
-            if collide:
-                player.lives -= 1
-                if player.lives <= 0:
-                    game_over = True
-
-            pp_hits = pygame.sprite.spritecollide(player, power_points, True)
-            for pp in pp_hits:
+    def update_spawning(self):
+        global boss_active, level_complete, wave_number
+        now = sim_now()
+        waves_per_level = 3 + (level // 2)
+        if not boss_spawned and not level_complete:
+            if wave_number < waves_per_level:
+                if now - wave_start_time > wave_duration:
+                    wave_number += 1
+                    spawn_enemy_wave()
+                elif len(enemies) == 0:
+                    wave_number += 1
+                    spawn_enemy_wave()
+            else:
+                if len(enemies) == 0:
+                    spawn_boss()
+                elif now - level_start_time > level_duration:
+                    for enemy in enemies:
+                        enemy.kill()
+                    spawn_boss()
+        elif boss_spawned and boss_active:
+            max_enemies_during_boss = min(2 + level, 10)
+            enemy_spawn_chance = max(0.005, 0.02 - level * 0.001)
+            if len(enemies) < max_enemies_during_boss and rng.random() < enemy_spawn_chance:
+                enemy_pattern = rng.choice(['aimed', 'random', 'circle'])
+                enemy = Enemy(level, enemy_pattern)
+                all_sprites.add(enemy)
+                enemies.add(enemy)
+            if not bosses:
+                boss_active = False
+                level_complete = True
+
+    def step(self):
+        """Advances the simulation by one fixed step of SIM_STEP_MS. Does not draw.
+
+        Input is polled once per step, so a recorded button timeline counts
+        steps rather than rendered frames and replays the same run however
+        the frames were paced.
+        """
+        global sim_tick
+        with profiler.scope("input"):
+            self.update_gpio_states()
+        if self.gpio_states.get("esc"):
+            self.running = False
+        sim_tick += 1
+        with profiler.scope("update"):
+            self.update_world()
+        with profiler.scope("collide"):
+            self.resolve_collisions()
+        self.update_progress()
+
+    def update_world(self):
+        # Spawning runs before and after the sprite update, as it always has
+        self.update_spawning()
+
+        if current_input().pressed.get("action1"):
+            player.shoot()  # A tap shorter than a step still fires
+        snapshot_positions(all_sprites)
+        all_sprites.update()
+        enemy_bullet_pool.update()
+        pickup_pool.update(player.rect.center, PICKUP_MAGNET_RADIUS)
+
+        self.update_spawning()
+
+    def resolve_collisions(self):
+        global game_over
+        bullet_grid.rebuild(bullets)
+        enemy_hits = bullet_grid.groupcollide(enemies, False, True)
+        for enemy, bullet_list in enemy_hits.items():
+            for bullet in bullet_list:
+                enemy.hp -= bullet.damage
+                if enemy.hp <= 0:
+                    enemy.die()
+
+        # Bullets killed by enemies above are skipped by the grid's group membership check
+        boss_hits = bullet_grid.groupcollide(bosses, False, True)
+        for boss, bullet_list in boss_hits.items():
+            for bullet in bullet_list:
+                boss.health -= bullet.damage
+                if boss.health <= 0:
+                    boss.die()
+
+        player_hitbox = player.rect.center
+
+        # Culling, hit and graze tests for all enemy bullets run as one batched stage
+        hit, graze_x, graze_y = enemy_bullet_pool.collide_player(player.rect)
+        if hit:
+            player.lives -= 1
+            if player.lives <= 0:
+                game_over = True
+
+        collide = False
+        for enemy in enemies:
+            if enemy.rect.collidepoint(player_hitbox):
+                enemy.kill()
+                collide = True
+        if collide:
+            player.lives -= 1
+            if player.lives <= 0:
+                game_over = True
+
+        # Grazed bullets drop points in place; they are usually collected straight away
+        pickup_pool.spawn_many(PICKUP_POINT, graze_x, graze_y, 5000)
+
+        collected = pickup_pool.collect(player.rect)
+        if PICKUP_POWER in collected:
+            for _ in range(collected[PICKUP_POWER][1]):  # Merged overflow carries several power points
                 player.pp_collected += 1
                 if player.pp_collected >= player.pp_needed:
                     player.power_up()
+        if PICKUP_POINT in collected:
+            player.score += collected[PICKUP_POINT][1]
 
-            for bullet in enemy_bullets:
-                if not bullet.grazed:
-                    if bullet.rect.colliderect(player.rect):
-                        if not bullet.rect.collidepoint(player.rect.center):
-                            bullet.grazed = True
-                            point = Point(bullet.rect.centerx, bullet.rect.centery, 5000)
-                            all_sprites.add(point)
-                            points.add(point)
-
-            points_collected = pygame.sprite.spritecollide(player, points, True)
-            for point in points_collected:
-                player.score += point.value
-
-            if level_complete:
-                if level == 10:
-                    level = 11
-                    level_complete = False
-                    boss_spawned = False
-                    boss_active = False
-                    spawn_boss()
-                elif level >= max_levels:
-                    game_won = True
-                    game_over = True
-                else:
-                    level += 1
-                    level_complete = False
-                    boss_spawned = False
-                    boss_active = False
-                    wave_number = 0
-                    waves_per_level = 3 + (level // 2)
-                    level_start_time = pygame.time.get_ticks()
-                    display_level_completion(level - 1)
-
-            if isinstance(backgrounds.get(level, BLACK), pygame.Surface):
-                screen.blit(backgrounds[level], (0, 0))
+    def update_progress(self):
+        global game_over, boss_spawned, boss_active, level_complete, level, game_won
+        global wave_number, level_start_time
+        if level_complete:
+            if level == 10:
+                level = 11
+                level_complete = False
+                boss_spawned = False
+                boss_active = False
+                spawn_boss()
+            elif level >= max_levels:
+                game_won = True
+                game_over = True
             else:
-                screen.fill(backgrounds[level])
-            all_sprites.draw(screen)
-            pygame.draw.circle(screen, RED, player.rect.center, 3)
-            for boss in bosses:
-                boss.draw_health_bar(screen)
-            draw_hud()
-            pygame.display.flip()
-        else:
-            if game_won:
-                display_game_won()
+                level += 1
+                level_complete = False
+                boss_spawned = False
+                boss_active = False
+                wave_number = 0
+                level_start_time = sim_now()
+                self.level_banner = level - 1
+
+    def invalidate_screen(self):
+        """Call after anything else has drawn over the whole screen (banners, game over)."""
+        if self.dirty is not None:
+            self.dirty.invalidate()
+
+    def render(self, alpha=1.0):
+        """Draws the current state, blended `alpha` of the way from the previous step."""
+        dirty = self.dirty
+        with profiler.scope("draw"):
+            if dirty is not None:
+                dirty.begin(self.screen, backgrounds[level])
+            elif isinstance(backgrounds.get(level, BLACK), pygame.Surface):
+                self.screen.blit(backgrounds[level], (0, 0))
             else:
-                display_game_over()
+                self.screen.fill(backgrounds[level])
+            draw_interpolated(self.screen, all_sprites, alpha, dirty)
+            pickup_pool.draw(self.screen, alpha, dirty)
+            with profiler.scope("bullets"):
+                enemy_bullet_pool.draw(self.screen, get_enemy_bullet_color(level), alpha,
+                                       get_sprite_theme(level), dirty)
+            dx, dy = interpolated_offset(player, alpha)
+            drawn = [pygame.draw.circle(self.screen, RED, (player.rect.centerx + dx, player.rect.centery + dy), 3)]
+            for boss in bosses:
+                drawn.append(boss.draw_health_bar(self.screen))
+            drawn.extend(draw_hud())
+        drawn.append(profiler.draw_overlay(self.screen))
+        with profiler.scope("flip"):
+            if dirty is None:
+                pygame.display.flip()
+                return
+            for rect in drawn:
+                if rect is not None:
+                    dirty.mark(rect)
+            dirty.present()
+
+# Main Game Loop
+def main():
+    # Run a single session without the start menu, sharing the game loop with BulletHellGame
+    game = BulletHellGame()
+    reset_game(False)
+    game.game_loop()
     return  # Removed sys.exit() to allow proper return to the start menu
 
 if __name__ == "__main__":
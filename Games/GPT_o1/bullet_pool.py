@@ -0,0 +1,192 @@
+import numpy as np
+from sprite_atlas import SpriteAtlas, blit_batch
+
+# Per-bullet fields stored as parallel arrays
+BULLET_FIELDS = {
+    'x': np.float32,
+    'y': np.float32,
+    'px': np.float32,  # Position before the last update(), for render interpolation
+    'py': np.float32,
+    'vx': np.float32,
+    'vy': np.float32,
+    'ax': np.float32,
+    'ay': np.float32,
+    'size': np.int16,
+    'grazed': np.bool_,
+    'alive': np.bool_,
+}
+
+
+class BulletPool:
+    """Structure-of-arrays store for enemy bullets.
+
+    Live bullets always occupy the first `count` slots of every array. Bullets
+    are moved, culled and drawn as whole-array operations instead of one
+    pygame Sprite per bullet. Each frame call update() and then
+    collide_player(), which also removes bullets that left the screen.
+    """
+
+    def __init__(self, width, height, capacity=512, atlas=None):
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.count = 0
+        for name, dtype in BULLET_FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.atlas = atlas if atlas is not None else SpriteAtlas()  # Shared bullet images
+        self.candidates = 0  # Bullets that reached the narrow phase in the last collide_player()
+
+    def __len__(self):
+        return self.count
+
+    def _reserve(self, extra):
+        """Grows the arrays (doubling) so that `extra` more bullets fit."""
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        new_capacity = self.capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        for name, dtype in BULLET_FIELDS.items():
+            grown = np.zeros(new_capacity, dtype=dtype)
+            grown[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, grown)
+        self.capacity = new_capacity
+
+    def spawn(self, x, y, vx, vy, size=7, ax=0.0, ay=0.0):
+        """Adds a single bullet centred on (x, y)."""
+        self._reserve(1)
+        i = self.count
+        self.x[i] = self.px[i] = x
+        self.y[i] = self.py[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.ax[i] = ax
+        self.ay[i] = ay
+        self.size[i] = size
+        self.grazed[i] = False
+        self.alive[i] = True
+        self.count += 1
+
+    def spawn_many(self, x, y, vx, vy, size=7, ax=0.0, ay=0.0):
+        """Adds a batch of bullets. Scalars are broadcast against the arrays."""
+        x, y, vx, vy, size, ax, ay = np.broadcast_arrays(x, y, vx, vy, size, ax, ay)
+        n = x.size
+        if n == 0:
+            return
+        self._reserve(n)
+        s = slice(self.count, self.count + n)
+        self.x[s] = self.px[s] = x.ravel()
+        self.y[s] = self.py[s] = y.ravel()
+        self.vx[s] = vx.ravel()
+        self.vy[s] = vy.ravel()
+        self.ax[s] = ax.ravel()
+        self.ay[s] = ay.ravel()
+        self.size[s] = size.ravel()
+        self.grazed[s] = False
+        self.alive[s] = True
+        self.count += n
+
+    def update(self):
+        """Integrates every live bullet one frame."""
+        n = self.count
+        if n == 0:
+            return
+        self.px[:n] = self.x[:n]
+        self.py[:n] = self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        vx += self.ax[:n]
+        vy += self.ay[:n]
+        self.x[:n] += vx
+        self.y[:n] += vy
+
+    def kill(self, mask):
+        """Marks the bullets selected by a boolean mask over the live range as dead."""
+        self.alive[:self.count][mask] = False
+
+    def compact(self):
+        """Moves surviving bullets to the front of the arrays."""
+        n = self.count
+        alive = self.alive[:n]
+        survivors = int(np.count_nonzero(alive))
+        if survivors == n:
+            return
+        keep = np.flatnonzero(alive)
+        for name in BULLET_FIELDS:
+            arr = getattr(self, name)
+            arr[:survivors] = arr[keep]
+        self.count = survivors
+
+    def clear(self):
+        self.count = 0
+
+    def collide_player(self, rect):
+        """Runs the culling, hit and graze tests for every live bullet in one pass.
+
+        Bullets that left the screen or cover the centre of `rect` (the
+        player's hitbox) are removed. Bullets overlapping `rect` without
+        covering its centre are flagged as grazed. Returns (hit, graze_x,
+        graze_y), where the arrays hold the positions of bullets grazed for
+        the first time this frame.
+        """
+        n = self.count
+        if n == 0:
+            self.candidates = 0
+            return False, self.x[:0], self.y[:0]
+
+        x, y = self.x[:n], self.y[:n]
+        half = self.size[:n] * 0.5
+        left, right = x - half, x + half
+        top, bottom = y - half, y + half
+
+        alive = self.alive[:n]
+        alive &= (right >= 0) & (left <= self.width) & (bottom >= 0) & (top <= self.height)
+
+        # Broad phase: only bullets level with the player reach the narrow tests
+        idx = np.flatnonzero(alive & (top < rect.bottom) & (bottom > rect.top))
+        self.candidates = idx.size
+
+        hit = False
+        graze_idx = idx[:0]
+        if idx.size:
+            cx, cy = rect.center
+            l, r = left[idx], right[idx]
+            hits = (cx >= l) & (cx < r) & (cy >= top[idx]) & (cy < bottom[idx])
+            overlaps = (l < rect.right) & (r > rect.left)
+            grazes = overlaps & ~hits & ~self.grazed[idx]
+
+            hit = bool(hits.any())
+            alive[idx[hits]] = False
+            graze_idx = idx[grazes]
+            self.grazed[graze_idx] = True
+
+        # Copy graze positions out before compaction reorders the arrays
+        graze_x, graze_y = x[graze_idx], y[graze_idx]
+        self.compact()
+        return hit, graze_x, graze_y
+
+    def draw(self, screen, color, alpha=1.0, theme='default', dirty=None):
+        """Blits every live bullet with one batched blit call per bullet size.
+
+        `alpha` blends between the positions before and after the last
+        update(), so rendering can fall between two simulation steps.
+        The drawn rects are marked on `dirty` (a DirtyRectRenderer) if given.
+        """
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        if alpha != 1.0:
+            px, py = self.px[:n], self.py[:n]
+            x = px + (x - px) * alpha
+            y = py + (y - py) * alpha
+        sizes = self.size[:n]
+        for size in np.unique(sizes):
+            mask = sizes == size
+            half = int(size) // 2
+            left = x[mask].astype(np.int32) - half
+            top = y[mask].astype(np.int32) - half
+            image = self.atlas.solid('enemy_bullet', (int(size), int(size)), color, theme)
+            blit_batch(screen, [(image, pos) for pos in zip(left.tolist(), top.tolist())])
+            if dirty is not None:
+                dirty.mark_many(left, top, int(size), int(size))
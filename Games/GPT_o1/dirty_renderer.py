@@ -0,0 +1,114 @@
+from collections import deque
+import numpy as np
+import pygame
+
+
+class DirtyRectRenderer:
+    """Redraws and presents only the screen tiles that changed since last frame.
+
+    The screen is split into `tile_size` tiles tracked in a boolean grid.
+    Every frame, begin() restores the background under the tiles that were
+    drawn to last frame. The caller then draws everything and mark()s what
+    it drew. present() pushes the union of the old and new tiles to the
+    display with display.update(). When more than `full_flip_ratio` of the
+    screen changed, or after invalidate(), it falls back to a full flip.
+    """
+
+    def __init__(self, size, tile_size=16, full_flip_ratio=0.5, history=300):
+        self.width, self.height = size
+        self.tile_size = tile_size
+        self.full_flip_ratio = full_flip_ratio
+        self.cols = -(-self.width // tile_size)
+        self.rows = -(-self.height // tile_size)
+        self._previous = np.zeros((self.rows, self.cols), dtype=bool)
+        self._current = np.zeros((self.rows, self.cols), dtype=bool)
+        self._padded = np.zeros((self.rows, self.cols + 2), dtype=np.int8)
+        self._background = None
+        self._full_redraw = True
+        self.dirty_ratio = 1.0  # Share of the screen pushed to the display last frame
+        self.full_flips = 0
+        self.history = deque(maxlen=history)
+
+    def invalidate(self):
+        """Forces a full background redraw and flip next frame (menus, banners, level changes)."""
+        self._full_redraw = True
+
+    def begin(self, screen, background):
+        """Restores the background (a Surface or a fill colour) under last frame's drawing."""
+        if background is not self._background:
+            self._background = background
+            self._full_redraw = True
+        rects = [None] if self._full_redraw else self._rects(self._previous)
+        if isinstance(background, pygame.Surface):
+            for rect in rects:
+                screen.blit(background, rect or (0, 0), rect)
+        else:
+            for rect in rects:
+                screen.fill(background, rect)
+        self._current[:] = False
+
+    def mark(self, rect):
+        """Marks one drawn rect (anything pygame.Rect accepts) as changed."""
+        rect = pygame.Rect(rect).clip(0, 0, self.width, self.height)
+        if rect.width and rect.height:
+            t = self.tile_size
+            self._current[rect.top // t:(rect.bottom - 1) // t + 1, rect.left // t:(rect.right - 1) // t + 1] = True
+
+    def mark_many(self, left, top, width, height):
+        """Marks a batch of rects given as arrays (scalars broadcast). Rects up to a tile in size are vectorised."""
+        left, top, width, height = np.broadcast_arrays(np.asarray(left, dtype=np.int32), np.asarray(top, dtype=np.int32),
+                                                       np.asarray(width, dtype=np.int32), np.asarray(height, dtype=np.int32))
+        if left.size == 0:
+            return
+        t = self.tile_size
+        small = (width <= t) & (height <= t)
+        if small.any():
+            l, tp = left[small], top[small]
+            x0 = np.clip(l // t, 0, self.cols - 1)
+            x1 = np.clip((l + width[small] - 1) // t, 0, self.cols - 1)
+            y0 = np.clip(tp // t, 0, self.rows - 1)
+            y1 = np.clip((tp + height[small] - 1) // t, 0, self.rows - 1)
+            # Off-screen rects are clipped onto edge tiles, which only costs a little extra update area
+            grid = self._current
+            grid[y0, x0] = True
+            grid[y0, x1] = True
+            grid[y1, x0] = True
+            grid[y1, x1] = True
+        for l, tp, w, h in zip(left[~small].tolist(), top[~small].tolist(),
+                               width[~small].tolist(), height[~small].tolist()):
+            self.mark((l, tp, w, h))
+
+    def present(self):
+        """Shows the frame, updating only the changed tiles when that is cheaper than a flip."""
+        changed = self._previous | self._current
+        ratio = float(np.count_nonzero(changed)) / changed.size
+        if self._full_redraw or ratio > self.full_flip_ratio:
+            pygame.display.flip()
+            self.full_flips += 1
+            self.dirty_ratio = 1.0
+        else:
+            pygame.display.update(self._rects(changed))
+            self.dirty_ratio = ratio
+        self.history.append(self.dirty_ratio)
+        self._full_redraw = False
+        self._previous, self._current = self._current, self._previous
+
+    def _rects(self, grid):
+        """Merges dirty tiles into rects: runs along each row, extended down while they repeat."""
+        t = self.tile_size
+        self._padded[:, 1:-1] = grid
+        edges = np.diff(self._padded, axis=1)
+        rows, starts = np.nonzero(edges == 1)
+        ends = np.nonzero(edges == -1)[1]  # Row-major order lines these up with the starts
+        rects = []
+        open_runs = {}
+        for row, start, end in zip(rows.tolist(), starts.tolist(), ends.tolist()):
+            rect = open_runs.get((start, end))
+            if rect is not None and rect.bottom == row * t:
+                rect.height += t
+            else:
+                rect = pygame.Rect(start * t, row * t, (end - start) * t, t)
+                rects.append(rect)
+                open_runs[(start, end)] = rect
+        # Tiles on the right and bottom edges can overhang the screen
+        return [rect.clip(0, 0, self.width, self.height) for rect in rects]
@@ -0,0 +1,168 @@
+import numpy as np
+from sprite_atlas import SpriteAtlas, blit_batch
+
+PICKUP_POINT = 0
+PICKUP_POWER = 1
+
+# Per-pickup fields stored as parallel arrays
+PICKUP_FIELDS = {
+    'x': np.float32,
+    'y': np.float32,
+    'px': np.float32,  # Position before the last update(), for render interpolation
+    'py': np.float32,
+    'vy': np.float32,
+    'value': np.int64,
+    'kind': np.int8,
+}
+
+
+class PickupPool:
+    """Fixed-capacity structure-of-arrays store for falling pickups.
+
+    Pickups fall, leave the screen and get collected as whole-array
+    operations, so dropping points never allocates a sprite. `kinds` maps a
+    kind id to (name, width, height, fall speed, colour). When the pool is full, a
+    new pickup's value is added to the newest live pickup of the same kind
+    instead. If there is none, the value is lost and counted in
+    `dropped[kind]`.
+    """
+
+    def __init__(self, width, height, kinds, capacity=1024, atlas=None):
+        self.width = width
+        self.height = height
+        self.kinds = kinds
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = dict.fromkeys(kinds, 0)
+        for name, dtype in PICKUP_FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        max_kind = max(kinds) + 1
+        self._half_w = np.zeros(max_kind, dtype=np.float32)
+        self._half_h = np.zeros(max_kind, dtype=np.float32)
+        for kind, (_, w, h, _, _) in kinds.items():
+            self._half_w[kind] = w / 2
+            self._half_h[kind] = h / 2
+        self.atlas = atlas if atlas is not None else SpriteAtlas()
+
+    def __len__(self):
+        return self.count
+
+    def spawn_many(self, kind, x, y, value):
+        """Adds pickups of one kind. Scalars are broadcast against the arrays."""
+        x, y, value = np.broadcast_arrays(x, y, value)
+        x, y, value = x.ravel(), y.ravel(), value.ravel()
+        n = x.size
+        if n == 0:
+            return
+        free = self.capacity - self.count
+        if n > free:
+            self._merge_overflow(kind, int(value[free:].sum()))
+            x, y, value = x[:free], y[:free], value[:free]
+            n = free
+            if n == 0:
+                return
+        s = slice(self.count, self.count + n)
+        self.x[s] = self.px[s] = x
+        self.y[s] = self.py[s] = y
+        self.vy[s] = self.kinds[kind][3]
+        self.value[s] = value
+        self.kind[s] = kind
+        self.count += n
+
+    def spawn(self, kind, x, y, value):
+        self.spawn_many(kind, x, y, value)
+
+    def _merge_overflow(self, kind, value):
+        same = np.flatnonzero(self.kind[:self.count] == kind)
+        if same.size:
+            self.value[same[-1]] += value
+        else:
+            self.dropped[kind] += value
+
+    def update(self, target=None, magnet_radius=0, magnet_speed=6.0):
+        """Moves every pickup one frame and drops the ones below the screen.
+
+        With a `magnet_radius`, pickups within that distance of `target`
+        (an (x, y) point, usually the player's centre) fly towards it.
+        """
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        self.px[:n] = x
+        self.py[:n] = y
+        y += self.vy[:n]
+        if magnet_radius > 0 and target is not None:
+            dx = target[0] - x
+            dy = target[1] - y
+            distance = np.hypot(dx, dy)
+            near = (distance < magnet_radius) & (distance > 0)
+            if near.any():
+                step = np.minimum(distance[near], magnet_speed) / distance[near]
+                x[near] += dx[near] * step
+                y[near] += dy[near] * step
+        top = y - self._half_h[self.kind[:n]]
+        self._keep(top <= self.height)
+
+    def collect(self, rect):
+        """Removes pickups overlapping `rect`. Returns {kind: (count, total value)}."""
+        n = self.count
+        if n == 0:
+            return {}
+        x, y, kind = self.x[:n], self.y[:n], self.kind[:n]
+        half_w, half_h = self._half_w[kind], self._half_h[kind]
+        hits = ((x - half_w < rect.right) & (x + half_w > rect.left) &
+                (y - half_h < rect.bottom) & (y + half_h > rect.top))
+        if not hits.any():
+            return {}
+        collected = {}
+        hit_kinds = kind[hits]
+        hit_values = self.value[:n][hits]
+        for k in np.unique(hit_kinds).tolist():
+            mine = hit_kinds == k
+            collected[k] = (int(np.count_nonzero(mine)), int(hit_values[mine].sum()))
+        self._keep(~hits)
+        return collected
+
+    def kill_kind(self, kind):
+        n = self.count
+        if n:
+            self._keep(self.kind[:n] != kind)
+
+    def _keep(self, mask):
+        """Compacts the arrays down to the pickups selected by `mask`."""
+        n = self.count
+        survivors = int(np.count_nonzero(mask))
+        if survivors == n:
+            return
+        keep = np.flatnonzero(mask)
+        for name in PICKUP_FIELDS:
+            arr = getattr(self, name)
+            arr[:survivors] = arr[keep]
+        self.count = survivors
+
+    def clear(self):
+        self.count = 0
+        self.dropped = dict.fromkeys(self.kinds, 0)
+
+    def draw(self, screen, alpha=1.0, dirty=None):
+        """Blits every pickup with one batched call per kind, marking them on `dirty` if given."""
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        if alpha != 1.0:
+            px, py = self.px[:n], self.py[:n]
+            x = px + (x - px) * alpha
+            y = py + (y - py) * alpha
+        kinds = self.kind[:n]
+        for kind, (name, w, h, _, color) in self.kinds.items():
+            mask = kinds == kind
+            if not mask.any():
+                continue
+            left = (x[mask] - w / 2).astype(np.int32)
+            top = (y[mask] - h / 2).astype(np.int32)
+            image = self.atlas.solid(name, (w, h), color)
+            blit_batch(screen, [(image, pos) for pos in zip(left.tolist(), top.tolist())])
+            if dirty is not None:
+                dirty.mark_many(left, top, w, h)
@@ -0,0 +1,76 @@
+class SpatialHash:
+    """Uniform-grid broad phase over the sprites of one pygame Group.
+
+    rebuild() buckets every sprite's rect into fixed-size cells, so a query
+    only tests sprites that share a cell with the query rect. The collide
+    methods mirror pygame.sprite.spritecollide/groupcollide (rect collision,
+    same return values and kill behaviour), with the indexed group as the
+    second group.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> list of (insertion index, sprite)
+        self.group = None
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, (rect.right - 1) // size,
+                rect.top // size, (rect.bottom - 1) // size)
+
+    def clear(self):
+        self.cells.clear()
+
+    def rebuild(self, group):
+        """Re-indexes every sprite in `group`. Cost is linear in the group size."""
+        self.clear()
+        self.group = group
+        for index, sprite in enumerate(group.sprites()):
+            self.insert(sprite, index)
+
+    def insert(self, sprite, index):
+        """Adds a sprite to every cell its rect overlaps."""
+        x0, x1, y0, y1 = self._cell_range(sprite.rect)
+        cells = self.cells
+        entry = (index, sprite)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [entry]
+                else:
+                    bucket.append(entry)
+
+    def query(self, rect):
+        """Returns indexed sprites sharing a cell with `rect`, in group order."""
+        x0, x1, y0, y1 = self._cell_range(rect)
+        cells = self.cells
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return [found[index] for index in sorted(found)]
+
+    def spritecollide(self, sprite, dokill):
+        """Same as pygame.sprite.spritecollide(sprite, indexed_group, dokill)."""
+        group = self.group
+        rect = sprite.rect
+        crashed = [other for other in self.query(rect)
+                   if other in group and rect.colliderect(other.rect)]
+        if dokill:
+            for other in crashed:
+                other.kill()
+        return crashed
+
+    def groupcollide(self, groupa, dokilla, dokillb):
+        """Same as pygame.sprite.groupcollide(groupa, indexed_group, dokilla, dokillb)."""
+        crashed = {}
+        for sprite in groupa.sprites():
+            collision = self.spritecollide(sprite, dokillb)
+            if collision:
+                crashed[sprite] = collision
+                if dokilla:
+                    sprite.kill()
+        return crashed
@@ -0,0 +1,87 @@
+import pygame
+
+# pygame-ce has Surface.fblits, which skips building the return list entirely
+_HAS_FBLITS = hasattr(pygame.Surface, 'fblits')
+
+
+def blit_batch(surface, sequence):
+    """Blits a list of (image, position) pairs in one call."""
+    if _HAS_FBLITS:
+        surface.fblits(sequence)
+    else:
+        surface.blits(sequence, doreturn=False)
+
+
+class SpriteAtlas:
+    """Flyweight cache of small sprite images packed into shared atlas pages.
+
+    Every image is looked up by (kind, size, colour, theme) and handed out as
+    a subsurface of a page, so entities share one image instead of each
+    allocating and filling its own Surface. Images must be treated as
+    read-only by the sprites that use them.
+    """
+
+    def __init__(self, page_size=256):
+        self.page_size = page_size
+        self._images = {}
+        self._pages = {False: [], True: []}  # per-pixel alpha -> list of [page, shelf x, shelf y, shelf height]
+
+    def __len__(self):
+        return len(self._images)
+
+    def _new_page(self, alpha):
+        flags = pygame.SRCALPHA if alpha else 0
+        page = pygame.Surface((self.page_size, self.page_size), flags)
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha() if alpha else page.convert()
+        entry = [page, 0, 0, 0]
+        self._pages[alpha].append(entry)
+        return entry
+
+    def _allocate(self, width, height, alpha):
+        """Finds room for a width x height image with simple shelf packing."""
+        if width > self.page_size or height > self.page_size:
+            flags = pygame.SRCALPHA if alpha else 0
+            return pygame.Surface((width, height), flags)  # Too big to share a page
+        pages = self._pages[alpha]
+        entry = pages[-1] if pages else self._new_page(alpha)
+        page, x, y, shelf_height = entry
+        if x + width > self.page_size:
+            # Start a new shelf below the current one
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + height > self.page_size:
+            entry = self._new_page(alpha)
+            page, x, y, shelf_height = entry
+        entry[1:] = [x + width, y, max(shelf_height, height)]
+        return page.subsurface((x, y, width, height))
+
+    def solid(self, kind, size, color, theme='default'):
+        """Returns the shared filled rectangle for (kind, size, colour, theme)."""
+        key = (kind, tuple(size), tuple(color), theme)
+        image = self._images.get(key)
+        if image is None:
+            image = self._allocate(size[0], size[1], False)
+            image.fill(color)
+            self._images[key] = image
+        return image
+
+    def image(self, kind, source, theme='default'):
+        """Returns a shared atlas copy of `source` (e.g. a generated enemy sprite)."""
+        size = source.get_size()
+        key = (kind, size, None, theme)
+        image = self._images.get(key)
+        if image is None:
+            alpha = bool(source.get_flags() & pygame.SRCALPHA)
+            image = self._allocate(size[0], size[1], alpha)
+            if alpha:
+                # Copy the pixels and alpha as-is instead of blending onto the page
+                image.fill((0, 0, 0, 0))
+                image.blit(source, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            else:
+                image.blit(source, (0, 0))
+            self._images[key] = image
+        return image
+
+    def clear(self):
+        self._images.clear()
+        self._pages = {False: [], True: []}
@@ -1,6 +1,9 @@
 import pygame
 import random
 from .character import Character
+from game_log import get_logger
+
+log = get_logger("fighting.ai")
 
 # Define AI States
 STATE_IDLE = 0
@@ -74,7 +77,8 @@ class AIOpponent(Character):
         self.last_movement_decision = 0
         self._desired_state = STATE_IDLE
 
-        print(f"AI Level {self.level}: Dodge Chance={self.dodge_chance:.2f}, Combo Chance={self.combo_chance:.2f}, Attack Freq={self.attack_frequency:.2f}") # Updated Debug Print
+        log.debug("AI Level %d: Dodge Chance=%.2f, Combo Chance=%.2f, Attack Freq=%.2f",
+                  self.level, self.dodge_chance, self.combo_chance, self.attack_frequency)
 
     def decide_action_state(self, player):
         """Decides the AI's *action* state (attack, block, dodge, idle)."""
@@ -182,7 +186,7 @@ class AIOpponent(Character):
 
                  # --- Try Directional Combos First ---
                  if random.random() < self.combo_chance:
-                     print(f"AI rolled {self.combo_chance*100:.1f}% chance and is TRYING to combo...")
+                     log.debug("AI rolled %.1f%% chance and is TRYING to combo...", self.combo_chance * 100)
                      possible_combos = []
 
                      # --- CORRECTED KEY STRUCTURE & MODIFIED FIREBALL CHECK ---
@@ -192,7 +196,7 @@ class AIOpponent(Character):
                      fireball_check_key = (fireball_dir_key, fireball_trigger)
                      # Allow Fireball attempt regardless of distance if the combo exists
                      if fireball_check_key in self.combo_moves:
-                         print(f"  - Fireball possible (No range check)") # Updated debug print
+                         log.debug("  - Fireball possible (No range check)")
                          possible_combos.append(self.combo_moves[fireball_check_key]['name'])
 
                      # Check Throw combo (Still requires melee range)
@@ -200,7 +204,7 @@ class AIOpponent(Character):
                      throw_trigger = 'punch'
                      throw_check_key = (throw_dir_key, throw_trigger)
                      if can_try_melee and throw_check_key in self.combo_moves:
-                         print(f"  - Throw possible (Range OK: {can_try_melee})")
+                         log.debug("  - Throw possible (Range OK: %s)", can_try_melee)
                          possible_combos.append(self.combo_moves[throw_check_key]['name'])
 
                      # Check SpinKick combo (Still requires melee range)
@@ -208,7 +212,7 @@ class AIOpponent(Character):
                      spinkick_trigger = 'kick'
                      spinkick_check_key = (spinkick_dir_key, spinkick_trigger)
                      if can_try_melee and spinkick_check_key in self.combo_moves:
-                         print(f"  - SpinKick possible (Range OK: {can_try_melee})")
+                         log.debug("  - SpinKick possible (Range OK: %s)", can_try_melee)
                          possible_combos.append(self.combo_moves[spinkick_check_key]['name'])
                      # --- END MODIFIED CHECKS ---
 
@@ -223,9 +227,9 @@ class AIOpponent(Character):
                          attack_info = self.attacks.get(chosen_combo_name, {})
                          self.attack_duration = attack_info.get("duration", 300)
                          action_performed_name = chosen_combo_name
-                         print(f"AI decided COMBO: {action_performed_name}")
+                         log.debug("AI decided COMBO: %s", action_performed_name)
                      else:
-                         print("AI combo attempt failed: No valid combos available/in range.")
+                         log.debug("AI combo attempt failed: No valid combos available/in range.")
 
                  # --- If no combo performed, try basic attack ---
                  if not action_performed_name and can_try_melee:
@@ -233,7 +237,7 @@ class AIOpponent(Character):
                      self.directional_combo_buffer = [] # Ensure buffer clear
                      action_performed_name = self.attack(basic_attack_type)
                      if action_performed_name:
-                         print(f"AI decided BASIC: {action_performed_name}")
+                         log.debug("AI decided BASIC: %s", action_performed_name)
 
             # If AI is in attacking state but didn't attack (e.g., cooldown), ensure it stands
             if not self.is_attacking:
@@ -1,6 +1,12 @@
 import pygame
 import os
 import math # Import the standard math module
+from .sprite_sheet import (get_sprite_sheet, ATTACK_POSES, PLAYER_PALETTE, OPPONENT_PALETTE, FACING_RIGHT, FACING_LEFT,
+                           POSE_IDLE, POSE_JUMP, POSE_CROUCH, POSE_DODGE, POSE_FIREBALL_CAST,
+                           POSE_THROW_WINDUP, POSE_THROW_EXECUTE)
+from game_log import get_logger
+
+log = get_logger("fighting.character")
 
 class Character(pygame.sprite.Sprite):
     def __init__(self, name, x, y, clock, screen_width):
@@ -11,8 +17,8 @@ class Character(pygame.sprite.Sprite):
         self.floor_level = 400
 
         # --- Sprite Generation ---
-        self.sprites = self._generate_sprites(name) # Generate sprites first
-        self.image = self.sprites['idle_right'] # Initial image
+        self.sprites = self._generate_sprites(name) # Shared sheet, drawn by the first character that needs it
+        self.image = self.sprites.frame(POSE_IDLE, FACING_RIGHT) # Initial image
         self.rect = self.image.get_rect()
         # --- End Sprite Generation ---
 
@@ -84,155 +90,32 @@ class Character(pygame.sprite.Sprite):
         self.last_direction_time = now
 
     def _generate_sprites(self, name):
-        """Generates all stick figure sprite surfaces, including animations."""
-        sprites = {}
-        base_width, base_height = 40, 70
-        crouch_height, jump_height = 50, 65
-        line_thickness = 4
-
-        # Colors (same as before)
-        if name == "Player": stick_color, head_color, attack_color = (0, 180, 255), (200, 200, 255), (255, 255, 0)
-        else: stick_color, head_color, attack_color = (255, 100, 0), (255, 180, 150), (0, 255, 255)
-
-        # Points (same as before)
-        head_radius = 10; head_center_x = base_width // 2; head_center_y = head_radius + 2
-        torso_top_y = head_center_y + head_radius; torso_bottom_y = base_height - 20; torso_x = head_center_x
-        shoulder_y = torso_top_y + 5; hip_y = torso_bottom_y
-
-        # --- Draw Functions ---
-        def draw_idle(surface):
-            pygame.draw.circle(surface, head_color, (head_center_x, head_center_y), head_radius)
-            pygame.draw.line(surface, stick_color, (torso_x, torso_top_y), (torso_x, torso_bottom_y), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x - 10, shoulder_y + 30), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x + 10, shoulder_y + 30), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, hip_y), (torso_x - 8, base_height - 2), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, hip_y), (torso_x + 8, base_height - 2), line_thickness)
-
-        def draw_jump(surface):
-            pygame.draw.circle(surface, head_color, (head_center_x, head_center_y), head_radius)
-            pygame.draw.line(surface, stick_color, (torso_x, torso_top_y), (torso_x, jump_height - 15), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x - 15, shoulder_y - 5), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x + 15, shoulder_y - 5), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, jump_height - 15), (torso_x - 5, jump_height - 2), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, jump_height - 15), (torso_x + 5, jump_height - 2), line_thickness)
-
-        def draw_crouch(surface):
-            crouch_head_y = head_radius + 10; crouch_torso_bottom = crouch_height - 10
-            pygame.draw.circle(surface, head_color, (head_center_x, crouch_head_y), head_radius)
-            pygame.draw.line(surface, stick_color, (torso_x, crouch_head_y + head_radius), (torso_x, crouch_torso_bottom), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, crouch_head_y + head_radius + 5), (torso_x - 15, crouch_head_y + head_radius + 10), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, crouch_head_y + head_radius + 5), (torso_x + 15, crouch_head_y + head_radius + 10), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, crouch_torso_bottom), (torso_x - 10, crouch_height - 2), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, crouch_torso_bottom), (torso_x + 10, crouch_height - 2), line_thickness)
-
-        def draw_punch_anim(surface, frame):
-            draw_idle(surface)
-            arm_end_x = torso_x + 5 + frame * 7
-            arm_end_y = shoulder_y + 10
-            pygame.draw.line(surface, attack_color, (torso_x, shoulder_y), (arm_end_x, arm_end_y), line_thickness + 1)
-
-        def draw_kick_anim(surface, frame):
-            draw_idle(surface)
-            leg_end_x = torso_x + frame * 6
-            leg_end_y = hip_y + 5 + frame * 2
-            pygame.draw.line(surface, stick_color, (torso_x, hip_y), (torso_x - 5, base_height - 2), line_thickness)
-            pygame.draw.line(surface, attack_color, (torso_x, hip_y), (leg_end_x, leg_end_y), line_thickness + 1)
-
-        def draw_fireball_cast(surface):
-            draw_idle(surface)
-            pygame.draw.line(surface, attack_color, (torso_x, shoulder_y), (torso_x + 15, shoulder_y + 10), line_thickness)
-            pygame.draw.line(surface, attack_color, (torso_x, shoulder_y), (torso_x + 15, shoulder_y + 20), line_thickness)
-
-        def draw_throw_windup(surface):
-            draw_idle(surface)
-            pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x - 15, shoulder_y + 5), line_thickness)
-            pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x - 15, shoulder_y + 15), line_thickness)
-
-        def draw_throw_execute(surface):
-            draw_idle(surface)
-            pygame.draw.line(surface, attack_color, (torso_x, shoulder_y), (torso_x + 18, shoulder_y + 10), line_thickness + 1)
-            pygame.draw.line(surface, attack_color, (torso_x, shoulder_y), (torso_x + 18, shoulder_y + 20), line_thickness + 1)
-
-        def draw_spinkick_anim(surface, frame):
-             draw_idle(surface)
-             angle = frame * (math.pi / 4)
-             leg_len = 25
-             leg_end_x = torso_x + int(leg_len * math.cos(angle))
-             leg_end_y = hip_y + int(leg_len * math.sin(angle))
-             pygame.draw.line(surface, attack_color, (torso_x, hip_y), (leg_end_x, leg_end_y), line_thickness + 2)
-
-        for state, draw_func, w, h in [('idle', draw_idle, base_width, base_height),
-                                       ('jump', draw_jump, base_width, jump_height),
-                                       ('crouch', draw_crouch, base_width, crouch_height)]:
-            surf = pygame.Surface([w, h], pygame.SRCALPHA)
-            draw_func(surf)
-            sprites[f'{state}_right'] = surf
-            sprites[f'{state}_left'] = pygame.transform.flip(surf, True, False)
-
-        sprites['dodge_right'] = sprites['crouch_right'].copy()
-        sprites['dodge_left'] = sprites['crouch_left'].copy()
-
-        for attack_name, draw_func, frames, w, h in [('punch', draw_punch_anim, 3, base_width + 15, base_height),
-                                                     ('kick', draw_kick_anim, 4, base_width + 15, base_height + 5),
-                                                     ('SpinKick', draw_spinkick_anim, 4, base_width + 20, base_height + 10)]:
-             anim_r, anim_l = [], []
-             for i in range(frames):
-                 surf = pygame.Surface([w, h], pygame.SRCALPHA)
-                 draw_func(surf, i)
-                 anim_r.append(surf)
-                 anim_l.append(pygame.transform.flip(surf, True, False))
-             sprites[f'{attack_name}_anim_right'] = anim_r
-             sprites[f'{attack_name}_anim_left'] = anim_l
-
-        for state, draw_func, w, h in [('Fireball_cast', draw_fireball_cast, base_width + 10, base_height),
-                                       ('Throw_windup', draw_throw_windup, base_width, base_height),
-                                       ('Throw_execute', draw_throw_execute, base_width + 15, base_height)]:
-             surf = pygame.Surface([w, h], pygame.SRCALPHA)
-             draw_func(surf)
-             sprites[f'{state}_right'] = surf
-             sprites[f'{state}_left'] = pygame.transform.flip(surf, True, False)
-
-        return sprites
+        """Returns the shared stick figure sprite sheet for this character's colours."""
+        return get_sprite_sheet(PLAYER_PALETTE if name == "Player" else OPPONENT_PALETTE)
 
     def _update_sprite(self):
         """Sets the correct sprite based on the character's state and animation frame."""
-        state = 'idle'
-        anim_list = None
-        num_frames = 1
+        pose = POSE_IDLE
 
         if self.is_stunned:
-            state = 'idle'  # Optionally, you can add a specific "stunned" sprite
-        elif self.is_jumping: state = 'jump'
-        elif self.is_dodging: state = 'dodge'
-        elif self.is_crouching: state = 'crouch'
+            pose = POSE_IDLE  # Optionally, you can add a specific "stunned" sprite
+        elif self.is_jumping: pose = POSE_JUMP
+        elif self.is_dodging: pose = POSE_DODGE
+        elif self.is_crouching: pose = POSE_CROUCH
         elif self.is_attacking:
             attack_name = self.current_attack_type
             attack_info = self.attacks.get(attack_name, {})
 
             if attack_info.get("anim_frames", 0) > 1:
-                state = attack_name
-                anim_key = f"{state}_anim_{'right' if self.facing_right else 'left'}"
-                if anim_key in self.sprites:
-                    anim_list = self.sprites[anim_key]
-                    num_frames = len(anim_list)
-                else:
-                    print(f"Warning: Animation missing for {attack_name}, key: {anim_key}")
-                    state = 'idle'
-            elif attack_name == 'Fireball': state = 'Fireball_cast'
+                pose = ATTACK_POSES.get(attack_name, POSE_IDLE)
+                if attack_name not in ATTACK_POSES:
+                    log.warning("Animation missing for %s", attack_name)
+            elif attack_name == 'Fireball': pose = POSE_FIREBALL_CAST
             elif attack_name == 'Throw':
                  progress = (pygame.time.get_ticks() - self.attack_timer) / self.attack_duration if self.attack_duration > 0 else 0
-                 state = 'Throw_execute' if progress > 0.4 else 'Throw_windup'
-            else: state = 'idle'
-
-        if anim_list:
-            frame_index = min(self.anim_index, num_frames - 1)
-            new_image = anim_list[frame_index]
-        else:
-            sprite_key = f"{state}_{'right' if self.facing_right else 'left'}"
-            if sprite_key not in self.sprites:
-                print(f"Warning: Sprite key '{sprite_key}' not found. Falling back to idle.")
-                sprite_key = f"idle_{'right' if self.facing_right else 'left'}"
-            new_image = self.sprites[sprite_key]
+                 pose = POSE_THROW_EXECUTE if progress > 0.4 else POSE_THROW_WINDUP
+
+        new_image = self.sprites.frame(pose, FACING_RIGHT if self.facing_right else FACING_LEFT, self.anim_index)
 
         if self.image is not new_image:
             current_bottom = self.rect.bottom
@@ -248,7 +131,7 @@ class Character(pygame.sprite.Sprite):
         if self.is_stunned:
             if now - self.stun_timer > self.stun_duration:
                 self.is_stunned = False
-                print(f"{self.name} recovered from stun.")
+                log.debug("%s recovered from stun.", self.name)
             else:
                 # If stunned, skip other updates (gravity, attacks, dodge timer)
                 self._update_sprite() # Keep updating sprite maybe for visual effect
@@ -295,7 +178,7 @@ class Character(pygame.sprite.Sprite):
             self.is_jumping = False
             # Optionally reset animation
             self.anim_index = 0
-            print(f"{self.name} is stunned for {duration_ms}ms!")
+            log.debug("%s is stunned for %dms!", self.name, duration_ms)
 
     def move_left(self):
         # Handles actual movement, NO buffer call here
@@ -351,10 +234,10 @@ class Character(pygame.sprite.Sprite):
                     combo_info = self.combo_moves[full_combo_key]
                     performed_attack_type = combo_info['name']
                     is_combo = True
-                    print(f"{self.name} performs COMBO: {performed_attack_type}")
+                    log.debug("%s performs COMBO: %s", self.name, performed_attack_type)
 
             if not is_combo:
-                 print(f"{self.name} attacks: {performed_attack_type}")
+                 log.debug("%s attacks: %s", self.name, performed_attack_type)
 
             self.is_attacking = True
             self.attack_timer = now
@@ -371,7 +254,7 @@ class Character(pygame.sprite.Sprite):
             return performed_attack_type
 
         elif self.is_stunned:
-             print(f"{self.name} cannot attack while stunned.") # Debug print
+             log.debug("%s cannot attack while stunned.", self.name)
              return None
 
         return None
@@ -381,7 +264,7 @@ class Character(pygame.sprite.Sprite):
             effective_damage = damage * 0.25 if self.is_crouching else damage
             self.health -= effective_damage
             if self.health < 0: self.health = 0
-            print(f"{self.name} health: {self.health}")
+            log.debug("%s health: %s", self.name, self.health)
 
     def is_alive(self):
         return self.health > 0
\ No newline at end of file
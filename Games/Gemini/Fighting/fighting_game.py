@@ -3,11 +3,19 @@ import sys
 import os
 import random
 import math
+import threading
 from .character import Character
 from .ai_opponent import AIOpponent
-from gpio_manager import read_gpio_input
+from gpio_manager import poll_input
+from profiler import profiler
+from game_log import get_logger
+import asset_cache
+from text_cache import render_text, get_font
+import procedural
 from time import sleep
 
+log = get_logger("fighting")
+
 # Add Game States
 STATE_START_MENU = 0
 STATE_LEVEL_SELECT = 1
@@ -17,9 +25,16 @@ STATE_PAUSED = 4
 STATE_GAME_OVER_WIN = 5  # New state
 STATE_GAME_OVER_LOSE = 6  # New state
 
+# Stage backgrounds are rendered once and cached on disk. Bump the version
+# whenever generate_level_background draws something different.
+BACKGROUND_GENERATOR_VERSION = 1
+BACKGROUND_SEED = 2024  # Each level draws from random.Random(BACKGROUND_SEED + level)
+BACKGROUND_LEVELS = range(0, 11)  # Practice room plus levels 1-10
+BACKGROUND_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'backgrounds')
+
 # --- Background Generation Function ---
-def generate_level_background(level, width, height, floor_level):
-    """Generates a unique background surface for the given level."""
+def generate_level_background(level, width, height, floor_level, rng=random):
+    """Generates a unique background surface for the given level, drawing its randomness from `rng`."""
     background = pygame.Surface((width, height))
     sky_height = floor_level
     ground_height = height - floor_level
@@ -41,7 +56,7 @@ def generate_level_background(level, width, height, floor_level):
         pygame.draw.circle(background, (255, 255, 0), (width - 80, 60), 40)
         # Simple Clouds
         for _ in range(3):
-            cx, cy, cr = random.randint(50, width - 50), random.randint(50, sky_height - 80), random.randint(20, 50)
+            cx, cy, cr = rng.randint(50, width - 50), rng.randint(50, sky_height - 80), rng.randint(20, 50)
             pygame.draw.circle(background, (255, 255, 255), (cx, cy), cr)
             pygame.draw.circle(background, (240, 240, 240), (cx + int(cr * 0.6), cy + int(cr * 0.1)), int(cr * 0.8))
 
@@ -50,11 +65,11 @@ def generate_level_background(level, width, height, floor_level):
         background.fill((170, 210, 240), (0, 0, width, sky_height))
         # Distant buildings (simple rectangles)
         for i in range(15):
-            b_width = random.randint(40, 100)
-            b_height = random.randint(50, sky_height - 50)
-            b_x = random.randint(-20, width - b_width + 20)
+            b_width = rng.randint(40, 100)
+            b_height = rng.randint(50, sky_height - 50)
+            b_x = rng.randint(-20, width - b_width + 20)
             b_y = sky_height - b_height
-            b_color = random.randint(80, 150)
+            b_color = rng.randint(80, 150)
             pygame.draw.rect(background, (b_color, b_color, b_color + 10), (b_x, b_y, b_width, b_height))
             # Simple windows
             for wx in range(b_x + 5, b_x + b_width - 5, 15):
@@ -77,7 +92,7 @@ def generate_level_background(level, width, height, floor_level):
         # Mountain peaks
         peaks = [(0, sky_height - 50), (100, 150), (200, sky_height - 80), (300, 100), (450, sky_height - 30), (600, 120), (700, sky_height - 100), (width, 150)]
         pygame.draw.polygon(background, (180, 180, 190), peaks)  # Darker base
-        snow_peaks = [(p[0], p[1] - random.randint(10, 40)) for p in peaks[1:-1]]  # Slightly offset snow caps
+        snow_peaks = [(p[0], p[1] - rng.randint(10, 40)) for p in peaks[1:-1]]  # Slightly offset snow caps
         snow_peaks = [peaks[0]] + snow_peaks + [peaks[-1]]
         pygame.draw.polygon(background, (240, 240, 250), snow_peaks)  # Snow caps
 
@@ -88,10 +103,10 @@ def generate_level_background(level, width, height, floor_level):
             pygame.draw.line(background, color, (0, y), (width, y))
         # Simple tree trunks in distance
         for i in range(10):
-            t_x = random.randint(0, width)
-            t_h = random.randint(sky_height // 2, sky_height)
-            t_w = random.randint(10, 30)
-            t_color = random.randint(40, 80)
+            t_x = rng.randint(0, width)
+            t_h = rng.randint(sky_height // 2, sky_height)
+            t_w = rng.randint(10, 30)
+            t_color = rng.randint(40, 80)
             pygame.draw.rect(background, (t_color, t_color - 10, t_color - 20), (t_x, sky_height - t_h, t_w, t_h))
 
     elif level == 6:  # Volcano
@@ -130,17 +145,17 @@ def generate_level_background(level, width, height, floor_level):
         pygame.draw.circle(background, (240, 240, 220), (width - 100, 70), 35)
         # Distant buildings (dark silhouettes)
         for i in range(15):
-            b_width = random.randint(40, 120)
-            b_height = random.randint(60, sky_height - 40)
-            b_x = random.randint(-20, width - b_width + 20)
+            b_width = rng.randint(40, 120)
+            b_height = rng.randint(60, sky_height - 40)
+            b_x = rng.randint(-20, width - b_width + 20)
             b_y = sky_height - b_height
-            b_color = random.randint(20, 50)
+            b_color = rng.randint(20, 50)
             pygame.draw.rect(background, (b_color, b_color, b_color + 5), (b_x, b_y, b_width, b_height))
             # Yellow windows
             for _ in range(int(b_width * b_height / 400)):  # Random number of windows
-                wx = b_x + random.randint(5, b_width - 10)
-                wy = b_y + random.randint(5, b_height - 15)
-                if random.random() < 0.7:  # Chance window is lit
+                wx = b_x + rng.randint(5, b_width - 10)
+                wy = b_y + rng.randint(5, b_height - 15)
+                if rng.random() < 0.7:  # Chance window is lit
                     pygame.draw.rect(background, (255, 255, 100), (wx, wy, 5, 8))
 
     elif level == 9:  # Space Station Interior
@@ -155,9 +170,9 @@ def generate_level_background(level, width, height, floor_level):
         window_rect = pygame.Rect(width // 2 - 150, 50, 300, 150)
         pygame.draw.rect(background, (10, 10, 20), window_rect)  # Space color
         for _ in range(20):  # Stars in window
-            sx = random.randint(window_rect.left, window_rect.right)
-            sy = random.randint(window_rect.top, window_rect.bottom)
-            pygame.draw.circle(background, (255, 255, 255), (sx, sy), random.randint(1, 2))
+            sx = rng.randint(window_rect.left, window_rect.right)
+            sy = rng.randint(window_rect.top, window_rect.bottom)
+            pygame.draw.circle(background, (255, 255, 255), (sx, sy), rng.randint(1, 2))
         pygame.draw.rect(background, (150, 155, 160), window_rect, 5)  # Window frame
 
     elif level == 10:  # Outer Space
@@ -165,16 +180,16 @@ def generate_level_background(level, width, height, floor_level):
         background.fill((0, 0, 0))
         # Stars
         for _ in range(250):
-            sx = random.randint(0, width)
-            sy = random.randint(0, height)
-            s_color = random.choice([(255, 255, 255), (200, 200, 255), (255, 200, 200)])
-            pygame.draw.circle(background, s_color, (sx, sy), random.randint(1, 2))
+            sx = rng.randint(0, width)
+            sy = rng.randint(0, height)
+            s_color = rng.choice([(255, 255, 255), (200, 200, 255), (255, 200, 200)])
+            pygame.draw.circle(background, s_color, (sx, sy), rng.randint(1, 2))
         # Simple Nebula effect (large, faint, overlapping circles)
         for _ in range(5):
-            nx = random.randint(0, width)
-            ny = random.randint(0, height // 2)
-            nr = random.randint(100, 300)
-            n_color = random.choice([(50, 0, 80, 50), (0, 50, 80, 50), (80, 30, 0, 50)])  # RGBA with low alpha
+            nx = rng.randint(0, width)
+            ny = rng.randint(0, height // 2)
+            nr = rng.randint(100, 300)
+            n_color = rng.choice([(50, 0, 80, 50), (0, 50, 80, 50), (80, 30, 0, 50)])  # RGBA with low alpha
             nebula_surf = pygame.Surface((nr * 2, nr * 2), pygame.SRCALPHA)
             pygame.draw.circle(nebula_surf, n_color, (nr, nr), nr)
             background.blit(nebula_surf, (nx - nr, ny - nr), special_flags=pygame.BLEND_RGBA_ADD)
@@ -212,9 +227,9 @@ def generate_level_background(level, width, height, floor_level):
         pygame.draw.rect(background, (60, 50, 50), ground_rect)
         # Lava cracks
         for _ in range(5):
-            lx1, ly1 = random.randint(0, width), random.randint(floor_level, height)
-            lx2, ly2 = lx1 + random.randint(-50, 50), ly1 + random.randint(-30, 30)
-            pygame.draw.line(background, (255, 100, 0), (lx1, ly1), (lx2, ly2), random.randint(2, 4))
+            lx1, ly1 = rng.randint(0, width), rng.randint(floor_level, height)
+            lx2, ly2 = lx1 + rng.randint(-50, 50), ly1 + rng.randint(-30, 30)
+            pygame.draw.line(background, (255, 100, 0), (lx1, ly1), (lx2, ly2), rng.randint(2, 4))
     elif level == 7:  # Sand
         pygame.draw.rect(background, (245, 222, 179), ground_rect)  # Sandy color
     elif level == 9:  # Station Floor (already filled)
@@ -225,18 +240,75 @@ def generate_level_background(level, width, height, floor_level):
         pygame.draw.rect(background, (30, 30, 30), ground_rect)
 
     return background
+
+class BackgroundCache:
+    """Every stage background, rendered on a worker thread and persisted with asset_cache.
+
+    warm_up() starts the worker (the start menu calls it), which loads the
+    backgrounds from disk or renders and stores them. get() is then a dict
+    lookup. If a match starts before the worker is done, only the requested
+    level is rendered on the spot, from the same seed, so it looks the same.
+    """
+
+    def __init__(self, width, height, floor_level, cache_dir=BACKGROUND_CACHE_DIR):
+        self.width = width
+        self.height = height
+        self.floor_level = floor_level
+        self.cache_dir = cache_dir
+        self.params = {
+            'version': BACKGROUND_GENERATOR_VERSION,
+            'seed': BACKGROUND_SEED,
+            'size': [width, height],
+            'floor_level': floor_level,
+            'levels': list(BACKGROUND_LEVELS),
+        }
+        self._raw = {}  # Filled in one go by the worker
+        self._ready = {}  # Display-format copies, made on the main thread
+        self._thread = None
+
+    def warm_up(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load, name="fighting-backgrounds", daemon=True)
+            self._thread.start()
+
+    def is_ready(self):
+        return bool(self._raw)
+
+    def _load(self):
+        self._raw = asset_cache.load_or_build(self.cache_dir, self.params, self._build)
+
+    def _build(self, params):
+        return {f'level_{level}': self._render(level) for level in params['levels']}
+
+    def _render(self, level):
+        rng = random.Random(BACKGROUND_SEED + level)
+        return generate_level_background(level, self.width, self.height, self.floor_level, rng)
+
+    def get(self, level):
+        background = self._ready.get(level)
+        if background is None:
+            background = self._raw.get(f'level_{level}')
+            if background is None:
+                background = self._render(level)  # Worker not finished yet
+            if pygame.display.get_surface() is not None:
+                background = background.convert()
+            self._ready[level] = background
+        return background
+
+_background_caches = {}
+
+def get_background_cache(width, height, floor_level):
+    """Returns the shared BackgroundCache for a screen size, so new FightingGame instances reuse it."""
+    key = (width, height, floor_level)
+    if key not in _background_caches:
+        _background_caches[key] = BackgroundCache(width, height, floor_level)
+    return _background_caches[key]
 # --- End Background Generation ---
 
 # --- Menu Background Helper ---
 def draw_menu_gradient(surface, color1, color2):
     """Draws a vertical gradient filling the surface."""
-    height = surface.get_height()
-    for y in range(height):
-        ratio = y / height
-        r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-        g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-        b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-        pygame.draw.line(surface, (r, g, b), (0, y), (surface.get_width(), y))
+    surface.blit(procedural.vertical_gradient(surface.get_size(), color1, color2), (0, 0))
 # --- End Menu Background Helper ---
 
 # --- Projectile Class ---
@@ -273,14 +345,14 @@ class FightingGame:
         try:
             # Use a font likely to have the symbols (adjust size as needed)
             # Common options: "Arial", "Segoe UI Symbol", "DejaVu Sans"
-            self.font = pygame.font.SysFont("Arial", 30)
-            self.title_font = pygame.font.SysFont("Arial", 60)
-            print("Using Arial font.")
+            self.font = get_font("Arial", 30, system=True)
+            self.title_font = get_font("Arial", 60, system=True)
+            log.info("Using Arial font.")
         except:
-            print("Arial font not found, falling back to default Pygame font.")
+            log.warning("Arial font not found, falling back to default Pygame font.")
             # Fallback to default if the specified font isn't found
-            self.font = pygame.font.Font(None, 32)
-            self.title_font = pygame.font.Font(None, 64)
+            self.font = get_font(None, 32)
+            self.title_font = get_font(None, 64)
         # --- End Load Fonts ---
 
         self.max_levels = 10
@@ -319,17 +391,12 @@ class FightingGame:
         # --- End Attack List Scroll State ---
 
         self.current_background = None
+        self.backgrounds = get_background_cache(self.screen_width, self.screen_height, self.floor_level)
         self.gpio_states = {}  # Initialize GPIO states
-        self.last_gpio_states = {}  # To track previous GPIO states for debouncing
 
     def update_gpio_states(self):
-        """Continuously updates GPIO states for use in the game."""
-        current_states = read_gpio_input()
-        self.gpio_states = {
-            key: current_states[key] and not self.last_gpio_states.get(key, False)
-            for key in current_states
-        }  # Only register a press if it wasn't pressed in the last state
-        self.last_gpio_states = current_states
+        """Polls the input service once for this frame and keeps the new presses."""
+        self.gpio_states = poll_input().pressed
 
     def initialize_game_session(self, level):
         """Sets up player, opponent, and background for the selected level."""
@@ -344,7 +411,7 @@ class FightingGame:
             self.opponent.combo_chance = 0.0  # Never combo
             self.opponent.health = 99999  # Effectively infinite health
             self.opponent.can_take_damage = False  # Add a flag to prevent damage logic
-            print("Initialized Practice Mode: Dummy opponent created.")
+            log.debug("Initialized Practice Mode: Dummy opponent created.")
         else:  # Normal Level Setup
             self.opponent = AIOpponent("Opponent", self.screen_width - 100, self.floor_level, self.clock, self.screen_width, self.current_level)
             self.opponent.can_take_damage = True  # Normal opponents can take damage
@@ -352,13 +419,13 @@ class FightingGame:
         self.all_sprites.empty()
         self.all_sprites.add(self.player, self.opponent)
         self.winner = None
-        self.current_background = generate_level_background(level, self.screen_width, self.screen_height, self.floor_level)
+        self.current_background = self.backgrounds.get(level)
         self.game_state = STATE_GAME_RUNNING
 
     def draw_attack_list(self):
         """Draws the screen displaying basic attacks and combos with scrolling."""
         draw_menu_gradient(self.screen, (30, 0, 30), (60, 0, 60))
-        title_text = self.title_font.render("Attack List", True, (255, 255, 0))
+        title_text = render_text(self.title_font, "Attack List", (255, 255, 0))
         title_rect = title_text.get_rect(center=(self.screen_width // 2, 60))
         self.screen.blit(title_text, title_rect)
 
@@ -398,7 +465,7 @@ class FightingGame:
                 current_y += line_height // 2
                 continue
 
-            text_surface = self.font.render(item_text, True, item_color)
+            text_surface = render_text(self.font, item_text, item_color)
             text_rect = text_surface.get_rect(center=(self.screen_width // 2, current_y))
 
             if text_rect.bottom < max_visible_y:
@@ -407,33 +474,33 @@ class FightingGame:
 
         if self.attack_list_total_items > self.attack_list_visible_items:
             if self.attack_list_scroll_offset > 0:
-                up_arrow = self.font.render("↑", True, (150, 150, 255))
+                up_arrow = render_text(self.font, "↑", (150, 150, 255))
                 up_rect = up_arrow.get_rect(center=(self.screen_width - 40, start_y))
                 self.screen.blit(up_arrow, up_rect)
             if self.attack_list_scroll_offset < self.attack_list_total_items - self.attack_list_visible_items:
-                down_arrow = self.font.render("↓", True, (150, 150, 255))
+                down_arrow = render_text(self.font, "↓", (150, 150, 255))
                 down_rect = down_arrow.get_rect(center=(self.screen_width - 40, max_visible_y - line_height // 2))
                 self.screen.blit(down_arrow, down_rect)
 
-        back_text = self.font.render("Press ESC to return", True, (200, 200, 200))
+        back_text = render_text(self.font, "Press ESC to return", (200, 200, 200))
         back_rect = back_text.get_rect(center=(self.screen_width // 2, self.screen_height - 40))
         self.screen.blit(back_text, back_rect)
 
     def draw_start_menu(self):
         draw_menu_gradient(self.screen, (0, 0, 20), (0, 0, 80))
-        title_text = self.title_font.render("Fighting Game", True, (0, 255, 255))
+        title_text = render_text(self.title_font, "Fighting Game", (0, 255, 255))
         title_rect = title_text.get_rect(center=(self.screen_width // 2, 150))
         self.screen.blit(title_text, title_rect)
         for i, option in enumerate(self.start_menu_options):
             text_color = (0, 255, 255) if i == self.selected_start_option else (180, 180, 180)
-            option_text = self.font.render(option, True, text_color)
+            option_text = render_text(self.font, option, text_color)
             option_rect = option_text.get_rect(center=(self.screen_width // 2, 250 + i * 60))
             self.screen.blit(option_text, option_rect)
 
     def draw_level_select(self):
         """Draws the level selection screen, including Practice."""
         draw_menu_gradient(self.screen, (20, 20, 0), (80, 80, 0))
-        title_text = self.title_font.render("Select Level", True, (255, 255, 255))
+        title_text = render_text(self.title_font, "Select Level", (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.screen_width // 2, 80))
         self.screen.blit(title_text, title_rect)
 
@@ -462,11 +529,11 @@ class FightingGame:
 
             # Display "P" for Practice, numbers for others
             level_display_text = "P" if level_num == 0 else str(level_num)
-            level_text = self.font.render(level_display_text, True, border_color)
+            level_text = render_text(self.font, level_display_text, border_color)
             level_rect = level_text.get_rect(center=rect.center)
             self.screen.blit(level_text, level_rect)
 
-        back_text = self.font.render("ESC to Go Back", True, (200, 200, 200))
+        back_text = render_text(self.font, "ESC to Go Back", (200, 200, 200))
         back_rect = back_text.get_rect(center=(self.screen_width // 2, self.screen_height - 50))
         self.screen.blit(back_text, back_rect)
 
@@ -479,7 +546,7 @@ class FightingGame:
         col = (0, 255, 0) if character.health > 60 else (255, 255, 0) if character.health > 30 else (255, 0, 0)
         pygame.draw.rect(surface, col, fill_rect)
         pygame.draw.rect(surface, (255, 255, 255), outline_rect, 2)
-        name_text = self.font.render(character.name, True, (255, 255, 255))
+        name_text = render_text(self.font, character.name, (255, 255, 255))
         surface.blit(name_text, (x, y + BAR_HEIGHT + 5))
 
     def draw_game_over_screen(self):
@@ -490,18 +557,18 @@ class FightingGame:
 
         # Display Win/Loss Message
         result_color = (0, 255, 0) if self.game_state == STATE_GAME_OVER_WIN else (255, 0, 0)
-        result_text = self.title_font.render(self.game_over_message, True, result_color)
+        result_text = render_text(self.title_font, self.game_over_message, result_color)
         result_rect = result_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 50))
         self.screen.blit(result_text, result_rect)
 
         # Display prompt to continue
-        prompt_text = self.font.render("Press ENTER to return to menu", True, (200, 200, 200))
+        prompt_text = render_text(self.font, "Press ENTER to return to menu", (200, 200, 200))
         prompt_rect = prompt_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 50))
         self.screen.blit(prompt_text, prompt_rect)
 
     def handle_input(self):
         """Handles player input during the game running state."""
-        self.gpio_states = read_gpio_input()  # Directly read GPIO states without debouncing
+        self.gpio_states = poll_input().held  # Held states, for continuous movement and attacks
         performed_attack_type = None
 
         keys = pygame.key.get_pressed()  # For continuous movement
@@ -678,7 +745,7 @@ class FightingGame:
 
     def handle_attack(self, attacker, defender, attack_name):
         """Processes the specific attack/combo performed."""
-        print(f"Handling attack: {attack_name}")
+        log.debug("Handling attack: %s", attack_name)
 
         # --- Handle Projectile Spawning ---
         if attack_name == "Fireball":
@@ -693,7 +760,7 @@ class FightingGame:
         # --- Get Attack Info ---
         attack_info = attacker.attacks.get(attack_name)
         if not attack_info:
-             print(f"CRITICAL WARNING: Attack info not found for '{attack_name}' in attacker.attacks!")
+             log.error("Attack info not found for '%s' in attacker.attacks!", attack_name)
              return
 
         damage = attack_info.get("damage", 0)
@@ -705,17 +772,17 @@ class FightingGame:
             if abs(attacker.rect.centerx - defender.rect.centerx) < attack_range and \
                abs(attacker.rect.centery - defender.rect.centery) < attacker.rect.height:
                 if defender.is_dodging:
-                    print(f"{attacker.name} stunned attempting throw on dodging {defender.name}!")
+                    log.debug("%s stunned attempting throw on dodging %s!", attacker.name, defender.name)
                     attacker.stun(1000) # Stun attacker for 1 second
                     return # Stop throw processing
                 # ... (rest of throw success/fail logic) ...
                 if not defender.is_dodging and not defender.is_crouching:
-                    print(f"{attacker.name} throws {defender.name}!")
+                    log.debug("%s throws %s!", attacker.name, defender.name)
                     defender.take_damage(damage)
                     throw_distance = 150
                     defender.rect.x += throw_distance if attacker.facing_right else -throw_distance
-                else: print(f"{attacker.name}'s throw failed (dodged/blocked)!")
-            else: print(f"{attacker.name}'s throw missed (out of range)!")
+                else: log.debug("%s's throw failed (dodged/blocked)!", attacker.name)
+            else: log.debug("%s's throw missed (out of range)!", attacker.name)
             return # Throw handled or missed
 
         # --- Standard Melee Damage Application (Handles Punch, Kick, SpinKick) ---
@@ -731,7 +798,7 @@ class FightingGame:
 
             # If the attack would have collided with the dodging defender
             if attack_rect.colliderect(defender.rect):
-                print(f"{attacker.name} stunned attacking dodging {defender.name} with {attack_name}!")
+                log.debug("%s stunned attacking dodging %s with %s!", attacker.name, defender.name, attack_name)
                 attacker.stun(1000) # Stun attacker for 1 second
                 return # Stop attack processing
 
@@ -752,11 +819,11 @@ class FightingGame:
         if attack_type == "Projectile":
             # Collision already confirmed before calling apply_damage for projectiles
             if defender.is_crouching: # Blocking check
-                print(f"{defender.name} blocked Projectile!")
+                log.debug("%s blocked Projectile!", defender.name)
                 defender.take_damage(damage * 0.25)
             else: # Apply full damage
                 defender.take_damage(damage)
-                print(f"{defender.name} takes {damage} damage from Projectile!")
+                log.debug("%s takes %s damage from Projectile!", defender.name, damage)
             return # Projectile damage handled
 
         # --- Handle Melee Damage (Calculate Hitbox) ---
@@ -775,11 +842,11 @@ class FightingGame:
             # Check for collision between the attack hitbox and the defender's rectangle
             if attack_rect.colliderect(defender.rect):
                  if defender.is_crouching: # Blocking check
-                     print(f"{defender.name} blocked {attack_type}!")
+                     log.debug("%s blocked %s!", defender.name, attack_type)
                      defender.take_damage(damage * 0.25)
                  else: # Apply full damage
                     defender.take_damage(damage)
-                    print(f"{defender.name} takes {damage} damage from {attack_type}!")
+                    log.debug("%s takes %s damage from %s!", defender.name, damage, attack_type)
             # else: Melee attack missed
 
     def run(self):
@@ -789,8 +856,11 @@ class FightingGame:
         if self.game_state is None: # Add a check just in case
              self.game_state = STATE_START_MENU
 
+        self.backgrounds.warm_up()  # Stage backgrounds render while the start menu is up
+        profiler.start_session("fighting")
         while self.running:
             dt = self.clock.tick(60) / 1000.0 # Delta time
+            profiler.tick()
             action = None # Action to take based on input handling
 
             # --- State Machine Logic ---
@@ -814,33 +884,36 @@ class FightingGame:
 
             elif self.game_state == STATE_GAME_RUNNING:
                 # Handle game input
-                action = self.handle_input()
+                with profiler.scope("input"):
+                    action = self.handle_input()
                 if action == "QUIT":
                      self.running = False
                      break # Exit loop immediately on QUIT
 
-                # Update Sprites
-                if self.player: self.player.update()
-                if self.opponent:
-                    opponent_action_name = self.opponent.update(self.player)
-                    if opponent_action_name:
-                        self.handle_attack(self.opponent, self.player, opponent_action_name)
-
-                # Update Projectiles
-                self.projectiles.update(self.screen_width)
-
-                # Check Projectile Collisions
-                for proj in self.projectiles:
-                    target = None
-                    if proj.owner == self.player and self.opponent:
-                        target = self.opponent
-                    elif proj.owner == self.opponent and self.player:
-                        target = self.player
-
-                    if target and pygame.sprite.collide_rect(proj, target):
-                        print(f"{target.name} hit by projectile!")
-                        self.apply_damage(target, proj.damage, proj.velocity_x > 0, proj.owner, "Projectile", 0) # Apply damage
-                        proj.kill() # Remove projectile on hit
+                with profiler.scope("update"):
+                    # Update Sprites
+                    if self.player: self.player.update()
+                    if self.opponent:
+                        opponent_action_name = self.opponent.update(self.player)
+                        if opponent_action_name:
+                            self.handle_attack(self.opponent, self.player, opponent_action_name)
+
+                    # Update Projectiles
+                    self.projectiles.update(self.screen_width)
+
+                with profiler.scope("collide"):
+                    # Check Projectile Collisions
+                    for proj in self.projectiles:
+                        target = None
+                        if proj.owner == self.player and self.opponent:
+                            target = self.opponent
+                        elif proj.owner == self.opponent and self.player:
+                            target = self.player
+
+                        if target and pygame.sprite.collide_rect(proj, target):
+                            log.debug("%s hit by projectile!", target.name)
+                            self.apply_damage(target, proj.damage, proj.velocity_x > 0, proj.owner, "Projectile", 0) # Apply damage
+                            proj.kill() # Remove projectile on hit
 
                 # --- Game Over Check (Modified for Practice) ---
                 if self.current_level != 0: # Only check game over in non-practice levels
@@ -853,17 +926,18 @@ class FightingGame:
                             self.winner = "Player"
                             self.game_over_message = "YOU WIN!"
                             self.game_state = STATE_GAME_OVER_WIN
-                        print(f"Level {self.current_level}: {self.winner} wins!")
+                        log.info("Level %d: %s wins!", self.current_level, self.winner)
 
-                # --- Drawing ---
-                if self.current_background:
-                    self.screen.blit(self.current_background, (0, 0))
-                else:
-                    self.screen.fill((0, 0, 0)) # Fallback background
-                self.all_sprites.draw(self.screen)
-                # Draw health bars
-                if self.player: self.draw_health_bar(self.screen, self.player, 10, 10)
-                if self.opponent: self.draw_health_bar(self.screen, self.opponent, self.screen_width - 210, 10)
+                with profiler.scope("draw"):
+                    # --- Drawing ---
+                    if self.current_background:
+                        self.screen.blit(self.current_background, (0, 0))
+                    else:
+                        self.screen.fill((0, 0, 0)) # Fallback background
+                    self.all_sprites.draw(self.screen)
+                    # Draw health bars
+                    if self.player: self.draw_health_bar(self.screen, self.player, 10, 10)
+                    if self.opponent: self.draw_health_bar(self.screen, self.opponent, self.screen_width - 210, 10)
 
 
             elif self.game_state == STATE_PAUSED:
@@ -872,12 +946,12 @@ class FightingGame:
                 overlay.fill((0, 0, 0, 180))
                 self.screen.blit(overlay, (0, 0))
                 # Draw pause menu options
-                pause_title = self.title_font.render("Paused", True, (255, 255, 0))
+                pause_title = render_text(self.title_font, "Paused", (255, 255, 0))
                 pause_rect = pause_title.get_rect(center=(self.screen_width // 2, 150))
                 self.screen.blit(pause_title, pause_rect)
                 for i, option in enumerate(self.pause_options):
                     text_color = (0, 255, 255) if i == self.selected_pause_option else (180, 180, 180)
-                    option_text = self.font.render(option, True, text_color)
+                    option_text = render_text(self.font, option, text_color)
                     option_rect = option_text.get_rect(center=(self.screen_width // 2, 250 + i * 60))
                     self.screen.blit(option_text, option_rect)
                 # Handle pause input
@@ -902,9 +976,11 @@ class FightingGame:
                     self.running = False
 
             # Update the display
-            pygame.display.flip()
+            profiler.draw_overlay(self.screen)
+            with profiler.scope("flip"):
+                pygame.display.flip()
 
-        print("Exiting Fighting Game run loop.") # Indicate loop exit
+        log.debug("Exiting Fighting Game run loop.")
 
     def reset_game_state(self):
         """Resets the game to the initial start menu state."""
@@ -917,4 +993,4 @@ class FightingGame:
         self.projectiles.empty()
         self.winner = None
         self.current_background = None
-        print("Fighting game state reset to start menu.")
\ No newline at end of file
+        log.debug("Fighting game state reset to start menu.")
\ No newline at end of file
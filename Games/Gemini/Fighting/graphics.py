@@ -1,4 +1,5 @@
 import pygame
+from text_cache import render_text, get_font
 
 class Graphics:
     def __init__(self, screen, clock):
@@ -6,7 +7,7 @@ class Graphics:
         self.screen_width = screen.get_width()
         self.screen_height = screen.get_height()
         self.clock = clock
-        self.font = pygame.font.Font(None, 32)
+        self.font = get_font(None, 32)
 
     def load_image(self, path):
         return pygame.image.load(path).convert_alpha()
@@ -26,7 +27,7 @@ class Graphics:
         fill_rect = pygame.Rect(x, y, fill_width, bar_height)
         pygame.draw.rect(screen, (255, 0, 0), outline_rect, 2)  # Red outline
         pygame.draw.rect(screen, (0, 255, 0), fill_rect)  # Green fill
-        health_text = self.font.render(f"{character.name}: {character.health}", True, (255, 255, 255))
+        health_text = render_text(self.font, f"{character.name}: {character.health}", (255, 255, 255))
         screen.blit(health_text, (x, y - 30))
 
     def update_display(self):
@@ -0,0 +1,173 @@
+import math
+import pygame
+
+# Pose ids. Character._update_sprite picks one of these and a facing, then
+# looks the frame up by index instead of building a string key.
+POSE_IDLE = 0
+POSE_JUMP = 1
+POSE_CROUCH = 2
+POSE_DODGE = 3
+POSE_PUNCH = 4
+POSE_KICK = 5
+POSE_SPINKICK = 6
+POSE_FIREBALL_CAST = 7
+POSE_THROW_WINDUP = 8
+POSE_THROW_EXECUTE = 9
+POSE_COUNT = 10
+
+FACING_RIGHT = 0
+FACING_LEFT = 1
+
+# Attacks with multi-frame animations
+ATTACK_POSES = {'punch': POSE_PUNCH, 'kick': POSE_KICK, 'SpinKick': POSE_SPINKICK}
+
+# (stick, head, attack) colours
+PLAYER_PALETTE = ((0, 180, 255), (200, 200, 255), (255, 255, 0))
+OPPONENT_PALETTE = ((255, 100, 0), (255, 180, 150), (0, 255, 255))
+
+
+def _draw_poses(palette, base_width, base_height, crouch_height, jump_height, line_thickness):
+    """Draws the right-facing frames of every pose. Returns {pose: [Surface, ...]}."""
+    stick_color, head_color, attack_color = palette
+
+    head_radius = 10; head_center_x = base_width // 2; head_center_y = head_radius + 2
+    torso_top_y = head_center_y + head_radius; torso_bottom_y = base_height - 20; torso_x = head_center_x
+    shoulder_y = torso_top_y + 5; hip_y = torso_bottom_y
+
+    def draw_idle(surface):
+        pygame.draw.circle(surface, head_color, (head_center_x, head_center_y), head_radius)
+        pygame.draw.line(surface, stick_color, (torso_x, torso_top_y), (torso_x, torso_bottom_y), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x - 10, shoulder_y + 30), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x + 10, shoulder_y + 30), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, hip_y), (torso_x - 8, base_height - 2), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, hip_y), (torso_x + 8, base_height - 2), line_thickness)
+
+    def draw_jump(surface):
+        pygame.draw.circle(surface, head_color, (head_center_x, head_center_y), head_radius)
+        pygame.draw.line(surface, stick_color, (torso_x, torso_top_y), (torso_x, jump_height - 15), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x - 15, shoulder_y - 5), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x + 15, shoulder_y - 5), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, jump_height - 15), (torso_x - 5, jump_height - 2), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, jump_height - 15), (torso_x + 5, jump_height - 2), line_thickness)
+
+    def draw_crouch(surface):
+        crouch_head_y = head_radius + 10; crouch_torso_bottom = crouch_height - 10
+        pygame.draw.circle(surface, head_color, (head_center_x, crouch_head_y), head_radius)
+        pygame.draw.line(surface, stick_color, (torso_x, crouch_head_y + head_radius), (torso_x, crouch_torso_bottom), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, crouch_head_y + head_radius + 5), (torso_x - 15, crouch_head_y + head_radius + 10), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, crouch_head_y + head_radius + 5), (torso_x + 15, crouch_head_y + head_radius + 10), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, crouch_torso_bottom), (torso_x - 10, crouch_height - 2), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, crouch_torso_bottom), (torso_x + 10, crouch_height - 2), line_thickness)
+
+    def draw_punch_anim(surface, frame):
+        draw_idle(surface)
+        arm_end_x = torso_x + 5 + frame * 7
+        arm_end_y = shoulder_y + 10
+        pygame.draw.line(surface, attack_color, (torso_x, shoulder_y), (arm_end_x, arm_end_y), line_thickness + 1)
+
+    def draw_kick_anim(surface, frame):
+        draw_idle(surface)
+        leg_end_x = torso_x + frame * 6
+        leg_end_y = hip_y + 5 + frame * 2
+        pygame.draw.line(surface, stick_color, (torso_x, hip_y), (torso_x - 5, base_height - 2), line_thickness)
+        pygame.draw.line(surface, attack_color, (torso_x, hip_y), (leg_end_x, leg_end_y), line_thickness + 1)
+
+    def draw_fireball_cast(surface):
+        draw_idle(surface)
+        pygame.draw.line(surface, attack_color, (torso_x, shoulder_y), (torso_x + 15, shoulder_y + 10), line_thickness)
+        pygame.draw.line(surface, attack_color, (torso_x, shoulder_y), (torso_x + 15, shoulder_y + 20), line_thickness)
+
+    def draw_throw_windup(surface):
+        draw_idle(surface)
+        pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x - 15, shoulder_y + 5), line_thickness)
+        pygame.draw.line(surface, stick_color, (torso_x, shoulder_y), (torso_x - 15, shoulder_y + 15), line_thickness)
+
+    def draw_throw_execute(surface):
+        draw_idle(surface)
+        pygame.draw.line(surface, attack_color, (torso_x, shoulder_y), (torso_x + 18, shoulder_y + 10), line_thickness + 1)
+        pygame.draw.line(surface, attack_color, (torso_x, shoulder_y), (torso_x + 18, shoulder_y + 20), line_thickness + 1)
+
+    def draw_spinkick_anim(surface, frame):
+        draw_idle(surface)
+        angle = frame * (math.pi / 4)
+        leg_len = 25
+        leg_end_x = torso_x + int(leg_len * math.cos(angle))
+        leg_end_y = hip_y + int(leg_len * math.sin(angle))
+        pygame.draw.line(surface, attack_color, (torso_x, hip_y), (leg_end_x, leg_end_y), line_thickness + 2)
+
+    poses = {}
+    for pose, draw_func, w, h in [(POSE_IDLE, draw_idle, base_width, base_height),
+                                  (POSE_JUMP, draw_jump, base_width, jump_height),
+                                  (POSE_CROUCH, draw_crouch, base_width, crouch_height),
+                                  (POSE_FIREBALL_CAST, draw_fireball_cast, base_width + 10, base_height),
+                                  (POSE_THROW_WINDUP, draw_throw_windup, base_width, base_height),
+                                  (POSE_THROW_EXECUTE, draw_throw_execute, base_width + 15, base_height)]:
+        surf = pygame.Surface([w, h], pygame.SRCALPHA)
+        draw_func(surf)
+        poses[pose] = [surf]
+
+    for pose, draw_func, frames, w, h in [(POSE_PUNCH, draw_punch_anim, 3, base_width + 15, base_height),
+                                          (POSE_KICK, draw_kick_anim, 4, base_width + 15, base_height + 5),
+                                          (POSE_SPINKICK, draw_spinkick_anim, 4, base_width + 20, base_height + 10)]:
+        poses[pose] = []
+        for i in range(frames):
+            surf = pygame.Surface([w, h], pygame.SRCALPHA)
+            draw_func(surf, i)
+            poses[pose].append(surf)
+    return poses
+
+
+class SpriteSheet:
+    """Every frame of one stick figure, in both facings, packed into a single atlas surface.
+
+    Frames are subsurfaces of the atlas stored in one list. frame(pose,
+    facing, n) finds them through a flat table of first-frame indices, so
+    picking a sprite costs two list lookups. Dodge reuses the crouch frames.
+    """
+
+    def __init__(self, palette, base_width=40, base_height=70, crouch_height=50, jump_height=65, line_thickness=4):
+        poses = _draw_poses(palette, base_width, base_height, crouch_height, jump_height, line_thickness)
+        source = [POSE_CROUCH if pose == POSE_DODGE else pose for pose in range(POSE_COUNT)]
+        drawn = [pose for pose in range(POSE_COUNT) if pose in poses]
+
+        # One row per facing, each drawn pose's frames side by side in pose order
+        right = [surf for pose in drawn for surf in poses[pose]]
+        left = [pygame.transform.flip(surf, True, False) for surf in right]
+        row_height = max(surf.get_height() for surf in right)
+        self.atlas = pygame.Surface((sum(surf.get_width() for surf in right), row_height * 2), pygame.SRCALPHA)
+        self.frames = []
+        for row, surfaces in enumerate((right, left)):
+            x = 0
+            for surf in surfaces:
+                self.atlas.blit(surf, (x, row * row_height))
+                self.frames.append(self.atlas.subsurface((x, row * row_height, surf.get_width(), surf.get_height())))
+                x += surf.get_width()
+
+        # first[pose * 2 + facing] is the index of that pose's frame 0; aliased poses share their source's frames
+        drawn_first = {}
+        index = 0
+        for pose in drawn:
+            drawn_first[pose] = index
+            index += len(poses[pose])
+        self.frame_counts = [len(poses[source[pose]]) for pose in range(POSE_COUNT)]
+        self.first = [0] * (POSE_COUNT * 2)
+        for pose in range(POSE_COUNT):
+            self.first[pose * 2 + FACING_RIGHT] = drawn_first[source[pose]]
+            self.first[pose * 2 + FACING_LEFT] = drawn_first[source[pose]] + len(right)
+
+    def frame(self, pose, facing, n=0):
+        """Returns frame `n` of a pose, holding the last frame once an animation runs out."""
+        last = self.frame_counts[pose] - 1
+        return self.frames[self.first[pose * 2 + facing] + (n if n < last else last)]
+
+
+_sheets = {}
+
+def get_sprite_sheet(palette, base_width=40, base_height=70, crouch_height=50, jump_height=65, line_thickness=4):
+    """Returns the process-wide sheet for these colours and body dimensions, drawing it on first use."""
+    key = (palette, (base_width, base_height, crouch_height, jump_height), line_thickness)
+    sheet = _sheets.get(key)
+    if sheet is None:
+        sheet = SpriteSheet(palette, base_width, base_height, crouch_height, jump_height, line_thickness)
+        _sheets[key] = sheet
+    return sheet
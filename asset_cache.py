@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import zlib
+import pygame
+from game_log import get_logger
+
+log = get_logger("asset_cache")
+
+# pygame < 2.1.3 only has the older tostring/fromstring names
+_tobytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+_frombytes = getattr(pygame.image, 'frombytes', None) or pygame.image.fromstring
+
+MANIFEST_NAME = 'manifest.json'
+_ENTRY_NAME = re.compile(r'[0-9a-f]{16}')  # params_hash() output
+
+
+def params_hash(params):
+    """Returns a short content hash of the generator parameters."""
+    blob = json.dumps(params, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def load_or_build(cache_dir, params, build):
+    """Loads the surfaces cached for `params`, generating them on a miss.
+
+    `build(params)` must return a dict of name -> Surface. Entries are stored
+    as zlib-compressed raw pixels in `cache_dir/<params hash>/`, so a hit
+    costs a file read and a decompress instead of drawing and PNG decoding.
+    Entries for other parameter sets are removed once a new one is written.
+    """
+    entry_dir = os.path.join(cache_dir, params_hash(params))
+    surfaces = _load_entry(entry_dir)
+    if surfaces is not None:
+        return surfaces
+
+    surfaces = build(params)
+    try:
+        _store_entry(cache_dir, entry_dir, params, surfaces)
+    except OSError as e:
+        # A read-only or full disk only costs us the cache, not the assets
+        log.warning("Could not write asset cache %s: %s", entry_dir, e)
+    return surfaces
+
+
+def _load_entry(entry_dir):
+    try:
+        with open(os.path.join(entry_dir, MANIFEST_NAME), 'r') as f:
+            manifest = json.load(f)
+        surfaces = {}
+        for name, info in manifest['assets'].items():
+            with open(os.path.join(entry_dir, info['file']), 'rb') as f:
+                data = zlib.decompress(f.read())
+            surfaces[name] = _frombytes(data, tuple(info['size']), info['format'])
+        return surfaces
+    except (OSError, ValueError, KeyError, zlib.error, pygame.error):
+        return None
+
+
+def _store_entry(cache_dir, entry_dir, params, surfaces):
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write into a private directory first so a crash never leaves a half-written entry
+    tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    assets = {}
+    for name, surface in surfaces.items():
+        fmt = 'RGBA' if surface.get_flags() & pygame.SRCALPHA else 'RGB'
+        file_name = f"{name}.raw.z"
+        with open(os.path.join(tmp_dir, file_name), 'wb') as f:
+            f.write(zlib.compress(_tobytes(surface, fmt), 1))
+        assets[name] = {'file': file_name, 'size': list(surface.get_size()), 'format': fmt}
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w') as f:
+        json.dump({'params': params, 'assets': assets}, f, indent=1)
+
+    shutil.rmtree(entry_dir, ignore_errors=True)
+    os.replace(tmp_dir, entry_dir)
+
+    # Drop entries built from older generator parameters. Anything else, such as
+    # another process's .tmp<pid> directory that is still being written, is left alone
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if path != entry_dir and _ENTRY_NAME.fullmatch(name) and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,216 @@
+"""Headless Bullethell benchmark.
+
+Runs each boss pattern and the enemy waves on the SDL dummy drivers for a
+fixed number of simulation steps and reports ms/frame for the update,
+collision and draw phases, the peak live enemy-bullet count and allocation
+churn per frame. With `--renderer dirty` the draw phase uses the dirty-rect
+renderer and the share of the screen it updated is reported as well.
+Results are written as JSON so runs from different commits can be
+compared:
+
+    python benchmarks/bullethell_bench.py --output before.json
+    python benchmarks/bullethell_bench.py --output after.json --compare before.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'Games', 'GPT_o1'))
+
+import numpy as np
+import pygame
+import gpio_manager
+from text_cache import text_cache
+import Bullethell as game_module
+
+PHASES = ('update', 'collision', 'draw')
+
+# Player sweeps left and right while holding fire, so player bullets and grazes are exercised too
+INPUT_TIMELINE = [
+    [0, 'action1', True],
+    [0, 'left', True],
+    [90, 'left', False],
+    [90, 'right', True],
+    [270, 'right', False],
+    [270, 'left', True],
+    [359, 'left', False],
+]
+
+
+def default_scenarios(levels, patterns, matrix):
+    """Boss patterns at the levels that use them (every level with `matrix`) and waves per level."""
+    scenarios = []
+    for pattern in patterns:
+        if matrix:
+            pattern_levels = levels
+        else:
+            pattern_levels = [lvl for lvl, p in sorted(game_module.boss_patterns.items()) if p == pattern]
+            pattern_levels = [lvl for lvl in pattern_levels if lvl in levels]
+        for lvl in pattern_levels:
+            scenarios.append(('boss', pattern, lvl))
+    for lvl in levels:
+        if lvl <= game_module.max_levels:
+            scenarios.append(('waves', None, lvl))
+    return scenarios
+
+
+def setup_scenario(kind, pattern, lvl, seed):
+    game_module.reset_game(False, seed=seed)
+    game_module.level = lvl
+    player = game_module.player
+    player.lives = 10 ** 9  # Hits are still tested and counted, the run just never ends
+    if kind == 'boss':
+        game_module.boss_spawned = True
+        game_module.boss_active = True
+        boss = game_module.Boss(lvl, pattern)
+        boss.health = boss.max_health = float('inf')
+        game_module.all_sprites.add(boss)
+        game_module.bosses.add(boss)
+    else:
+        # Waves only: keep the boss from spawning and refill the wave when it is cleared
+        game_module.boss_spawned = True
+        game_module.boss_active = False
+        game_module.spawn_enemy_wave()
+
+
+def run_scenario(game, kind, pattern, lvl, frames, warmup, seed):
+    gpio_manager.configure_input(gpio_manager.ReplayBackend(INPUT_TIMELINE, loop=True))
+    setup_scenario(kind, pattern, lvl, seed)
+    pool = game_module.enemy_bullet_pool
+    totals = dict.fromkeys(PHASES, 0.0)
+    peak_bullets = 0
+    hits = 0
+    dirty_ratios = []
+    gc_collections = 0
+    block_growth = 0
+    perf_counter = time.perf_counter
+
+    for frame in range(warmup + frames):
+        measuring = frame >= warmup
+        if kind == 'waves' and not game_module.enemies:
+            game_module.spawn_enemy_wave()
+        gpio_manager.poll_input()
+        lives_before = game_module.player.lives
+        gc_before = gc.get_stats()[0]['collections']
+        blocks_before = sys.getallocatedblocks()
+
+        t0 = perf_counter()
+        game_module.sim_tick += 1
+        game.update_world()
+        t1 = perf_counter()
+        game.resolve_collisions()
+        t2 = perf_counter()
+        game.render(1.0)
+        t3 = perf_counter()
+
+        if measuring:
+            totals['update'] += t1 - t0
+            totals['collision'] += t2 - t1
+            totals['draw'] += t3 - t2
+            block_growth += max(0, sys.getallocatedblocks() - blocks_before)
+            gc_collections += gc.get_stats()[0]['collections'] - gc_before
+            peak_bullets = max(peak_bullets, len(pool))
+            hits += lives_before - game_module.player.lives
+            if game.dirty is not None:
+                dirty_ratios.append(game.dirty.dirty_ratio)
+
+    result = {
+        'kind': kind,
+        'pattern': pattern,
+        'level': lvl,
+        'frames': frames,
+        'peak_bullets': peak_bullets,
+        'player_hits': hits,
+        'alloc_blocks_per_frame': block_growth / frames,
+        'gc_gen0_per_frame': gc_collections / frames,
+    }
+    for phase in PHASES:
+        result[f'{phase}_ms'] = totals[phase] * 1000 / frames
+    result['total_ms'] = sum(result[f'{phase}_ms'] for phase in PHASES)
+    if dirty_ratios:
+        result['dirty_pct_mean'] = float(np.mean(dirty_ratios)) * 100
+        result['dirty_pct_p95'] = float(np.percentile(dirty_ratios, 95)) * 100
+    return result
+
+
+def scenario_key(result):
+    return f"{result['kind']}:{result['pattern'] or '-'}:L{result['level']}"
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results, baseline=None):
+    dirty = any('dirty_pct_mean' in r for r in results)
+    print(f"{'scenario':32} {'update':>8} {'collide':>8} {'draw':>8} {'total':>8} {'bullets':>8} {'blocks':>8}"
+          + (f" {'dirty%':>8} {'p95':>6}" if dirty else '') + (f" {'vs base':>8}" if baseline else ''))
+    for result in results:
+        key = scenario_key(result)
+        line = (f"{key:32} {result['update_ms']:8.3f} {result['collision_ms']:8.3f} {result['draw_ms']:8.3f} "
+                f"{result['total_ms']:8.3f} {result['peak_bullets']:8d} {result['alloc_blocks_per_frame']:8.1f}")
+        if dirty:
+            line += f" {result.get('dirty_pct_mean', 100.0):8.1f} {result.get('dirty_pct_p95', 100.0):6.1f}"
+        if baseline:
+            old = baseline.get(key)
+            line += f" {result['total_ms'] / old['total_ms']:7.2f}x" if old else f" {'new':>8}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=600, help='measured simulation steps per scenario')
+    parser.add_argument('--warmup', type=int, default=60, help='steps run before measuring')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--levels', type=int, nargs='*', default=list(range(1, 12)))
+    parser.add_argument('--patterns', nargs='*', default=game_module.ASSET_PARAMS['boss_patterns'])
+    parser.add_argument('--matrix', action='store_true', help='run every boss pattern at every level')
+    parser.add_argument('--renderer', choices=('full', 'dirty'), default='full',
+                        help='redraw and flip the whole screen, or only the changed regions')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='earlier JSON results to compare total ms/frame against')
+    args = parser.parse_args()
+
+    game = game_module.BulletHellGame(dirty_rects=args.renderer == 'dirty')
+    results = []
+    for kind, pattern, lvl in default_scenarios(args.levels, args.patterns, args.matrix):
+        results.append(run_scenario(game, kind, pattern, lvl, args.frames, args.warmup, args.seed))
+
+    report = {
+        'benchmark': 'bullethell',
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'renderer': args.renderer,
+        'text_cache': text_cache.stats(),
+        'results': results,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = {scenario_key(r): r for r in json.load(f)['results']}
+    print_table(results, baseline)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
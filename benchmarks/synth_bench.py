@@ -0,0 +1,147 @@
+"""Rhythm game song synthesis benchmark.
+
+Renders every song in rythmgame.SONGS (and MusicGenerator's song) with the
+old per-note generate_square_wave loop and with the vectorised synth, and
+reports the time each takes, how much faster than real time that is, and
+how many samples the old int16 accumulation wrapped around on:
+
+    python benchmarks/synth_bench.py --output synth.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'Games', 'Claude'))
+
+import numpy as np
+import rythmgame
+import synth
+from music_generator import MusicGenerator
+
+
+def legacy_square_wave(frequency, duration, amplitude=0.3, duty_cycle=0.5, sample_rate=synth.SAMPLE_RATE):
+    num_samples = int(duration * sample_rate)
+    t = np.linspace(0, duration, num_samples, False)
+    wave = (np.sin(2 * np.pi * frequency * t) > -duty_cycle) * 2 - 1
+    return (wave * amplitude * 32767).astype(np.int16)
+
+
+def legacy_render(voices, total_samples, gain):
+    """The old per-note loop: int16 column_stack per note, accumulated in int16.
+
+    Also counts the samples where that accumulation wrapped around, by
+    repeating the sums in int32 alongside.
+    """
+    buffer = np.zeros((total_samples, 2), dtype=np.int16)
+    wide = np.zeros(total_samples, dtype=np.int32)
+    for notes, amplitude, duty in voices:
+        current = 0
+        for note, duration in notes:
+            if current >= total_samples:
+                break
+            wave = legacy_square_wave(synth.NOTE_FREQUENCIES[note], duration, amplitude, duty)
+            end = min(current + len(wave), total_samples)
+            if end > current:
+                buffer[current:end] += np.column_stack((wave[:end - current], wave[:end - current]))
+                wide[current:end] += wave[:end - current]
+            current = end
+    wrapped = int(np.count_nonzero((wide > 32767) | (wide < -32768)))
+    return (buffer * gain).astype(np.int16), wrapped
+
+
+def song_cases():
+    """(name, melody, legacy voice list) for every song the games ship."""
+    cases = []
+    for song in rythmgame.SONGS:
+        melody_notes = song.melody_func()
+        melody, bass = rythmgame.build_arrangement(melody_notes).voices
+        cases.append((song.name, melody_notes, [
+            (legacy_notes(melody), 0.15, 0.5),
+            (legacy_notes(bass), 0.1, 0.3),
+        ]))
+    return cases
+
+
+def legacy_notes(voice):
+    names = {freq: name for name, freq in synth.NOTE_FREQUENCIES.items()}
+    return [(names[freq], length / synth.SAMPLE_RATE) for freq, length in zip(voice.frequencies, voice.lengths)]
+
+
+def timed(func, repeats):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=3, help='best of this many runs is reported')
+    parser.add_argument('--chunk', type=int, default=4096, help='samples in the first chunk a streaming player would need, from a fresh arrangement')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = []
+    for name, melody, legacy_voices in song_cases():
+        arrangement = rythmgame.build_arrangement(melody)
+        legacy_s, (_, wrapped) = timed(lambda: legacy_render(legacy_voices, arrangement.total_samples, arrangement.gain),
+                                       args.repeats)
+        # A fresh arrangement each run, so the note bank is rendered every time
+        synth_s, pcm = timed(lambda: rythmgame.build_arrangement(melody).render_pcm(), args.repeats)
+        first_chunk_s, _ = timed(lambda: rythmgame.build_arrangement(melody).render_pcm(0, args.chunk), args.repeats)
+        results.append({
+            'song': name,
+            'duration_s': arrangement.duration,
+            'legacy_ms': legacy_s * 1000,
+            'synth_ms': synth_s * 1000,
+            'speedup': legacy_s / synth_s,
+            'realtime_factor': arrangement.duration / synth_s,
+            'first_chunk_ms': first_chunk_s * 1000,
+            'legacy_wrapped_samples': wrapped,
+            'peak': int(np.abs(pcm.astype(np.int32)).max()),
+        })
+
+    # MusicGenerator renders straight to a Sound, so only the synth side is timed
+    generator_s, _ = timed(lambda: MusicGenerator().generate_song(), args.repeats) if _mixer_ready() else (None, None)
+
+    print(f"{'song':16} {'secs':>6} {'legacy ms':>10} {'synth ms':>9} {'speedup':>8} {'x realtime':>11} "
+          f"{'1st chunk':>10} {'wrapped':>8}")
+    for r in results:
+        print(f"{r['song']:16} {r['duration_s']:6.1f} {r['legacy_ms']:10.1f} {r['synth_ms']:9.1f} {r['speedup']:7.1f}x "
+              f"{r['realtime_factor']:10.0f}x {r['first_chunk_ms']:9.2f}ms {r['legacy_wrapped_samples']:8d}")
+    if generator_s is not None:
+        print(f"MusicGenerator.generate_song: {generator_s * 1000:.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'benchmark': 'synth',
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'results': results,
+                'music_generator_ms': None if generator_s is None else generator_s * 1000,
+            }, f, indent=2)
+
+
+def _mixer_ready():
+    import pygame
+    try:
+        pygame.mixer.init(frequency=synth.SAMPLE_RATE, size=-16, channels=2)
+    except pygame.error:
+        return False
+    return True
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import atexit
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from collections import deque
+
+# ARCADE_LOG_LEVEL picks the threshold (DEBUG shows every gameplay event).
+# Records go to a rotating file written by a background thread. ARCADE_LOG_CONSOLE=1
+# also echoes them to stderr, which on the cabinet is the slow /dev/tty1 console.
+LOG_LEVEL_ENV = "ARCADE_LOG_LEVEL"
+LOG_FILE_ENV = "ARCADE_LOG_FILE"
+LOG_CONSOLE_ENV = "ARCADE_LOG_CONSOLE"
+DEFAULT_LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "arcade.log")
+ROOT_LOGGER = "arcade"
+
+class _RingQueue(queue.Queue):
+    """Unbounded-looking queue that keeps only the newest `capacity` records, so logging never blocks."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        super().__init__()
+
+    def _init(self, maxsize):
+        self.queue = deque(maxlen=self.capacity)
+
+class RateLimitFilter(logging.Filter):
+    """Lets each message template through at most `burst` times per `interval` seconds.
+
+    Suppressed repeats are counted and reported on the next record that gets through.
+    """
+
+    def __init__(self, burst=5, interval=1.0):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._windows = {}  # (logger, template) -> [window start, count, suppressed]
+
+    def filter(self, record):
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.msg} ({suppressed} similar suppressed)"
+            return True
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener.
+
+    The stock prepare() merges the message and traceback into text on the
+    calling thread. Records here never leave the process, so the game thread
+    only queues a copy with msg, args and exc_info untouched. Arguments are
+    formatted when the listener gets to them, so don't log objects that are
+    about to be mutated.
+    """
+
+    def prepare(self, record):
+        return copy.copy(record)
+
+_listener = None
+
+def configure_logging(level=None, log_file=None, console=None, capacity=1024,
+                      max_bytes=256 * 1024, backups=3, rate_limit=(5, 1.0)):
+    """Sets up the "arcade" logger tree. Called on first get_logger(); call it again to reconfigure."""
+    global _listener
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV) or "INFO"
+    if log_file is None:
+        log_file = os.environ.get(LOG_FILE_ENV, DEFAULT_LOG_FILE)
+    if console is None:
+        console = os.environ.get(LOG_CONSOLE_ENV, "") not in ("", "0")
+
+    shutdown_logging()
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    handlers = []
+    if log_file:
+        try:
+            os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+            handlers.append(logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups))
+        except OSError:
+            pass  # No writable log directory, keep running without the file
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # The game thread only appends to the ring; formatting and I/O happen on the listener thread
+    root = logging.getLogger(ROOT_LOGGER)
+    root.handlers.clear()
+    bad_level = None
+    if isinstance(level, str):
+        if not isinstance(logging.getLevelName(level.upper()), int):
+            bad_level, level = level, "INFO"  # A typo in the environment shouldn't stop the launcher
+        level = level.upper()
+    root.setLevel(level)
+    root.propagate = False
+    ring = _RingQueue(capacity)
+    queue_handler = _DeferredQueueHandler(ring)
+    if rate_limit:
+        # On the handler rather than the logger, so records from child loggers are limited too
+        queue_handler.addFilter(RateLimitFilter(*rate_limit))
+    root.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(ring, *handlers, respect_handler_level=True)
+    _listener.start()
+    if bad_level is not None:
+        root.warning("Unknown log level %r, using INFO", bad_level)
+    return root
+
+def shutdown_logging():
+    """Flushes queued records and stops the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+def get_logger(name):
+    """Returns the logger for one game or module, e.g. get_logger("fighting.character")."""
+    if _listener is None:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,69 @@
+import importlib
+import sys
+import threading
+from game_log import get_logger
+
+log = get_logger("registry")
+
+
+class GameEntry:
+    """One launcher menu entry.
+
+    `module` is only imported when the game is selected (or warmed up).
+    `launch(menu, module)` runs the game and returns when the player goes back
+    to the menu. `draw_graphic(menu, rect)` paints the option tile.
+    """
+
+    def __init__(self, name, module, launch, draw_graphic=None, enabled=True):
+        self.name = name
+        self.module = module
+        self.launch = launch
+        self.draw_graphic = draw_graphic
+        self.enabled = enabled
+        self.state = {}  # Per-game objects the launch callback wants to keep between runs
+        self._warm_thread = None
+
+    def is_loaded(self):
+        return self.module in sys.modules
+
+    def load(self):
+        """Imports the game module. Waits for a warm-up import that is still running."""
+        thread = self._warm_thread
+        if thread is not None:
+            thread.join()
+        return importlib.import_module(self.module)
+
+    def warm_up(self):
+        """Starts importing the game module on a background thread."""
+        if self.is_loaded() or self._warm_thread is not None:
+            return
+        self._warm_thread = threading.Thread(target=self._warm_import, daemon=True)
+        self._warm_thread.start()
+
+    def _warm_import(self):
+        try:
+            importlib.import_module(self.module)
+        except Exception as e:
+            # load() retries on the main thread and raises there
+            log.warning("Warm-up import of %s failed: %s", self.module, e)
+
+
+_registry = []
+
+
+def register_game(name, module, launch, draw_graphic=None, enabled=True):
+    entry = GameEntry(name, module, launch, draw_graphic, enabled)
+    _registry.append(entry)
+    return entry
+
+
+def get_games(include_disabled=False):
+    """Returns registered entries in registration order."""
+    return [entry for entry in _registry if include_disabled or entry.enabled]
+
+
+def get_game(name):
+    for entry in _registry:
+        if entry.name == name:
+            return entry
+    return None
@@ -1,29 +1,295 @@
-from gpiozero import Button
-from time import sleep
-
-# GPIO Pin Definitions
-GPIO_PINS = {
-    "down": Button(5, pull_up=True),
-    "left": Button(2, pull_up=True),
-    "up": Button(3, pull_up=True),
-    "right": Button(4, pull_up=True),
-    "esc": Button(6, pull_up=True),
-    "select": Button(7, pull_up=True),
-    "action1": Button(8, pull_up=True),
-    "action2": Button(9, pull_up=True),
-    "action3": Button(10, pull_up=True),
+import atexit
+import json
+import os
+from collections import deque
+from time import sleep, monotonic
+from game_log import get_logger
+
+log = get_logger("input")
+
+# GPIO Pin Definitions (BCM numbers, buttons pull the pin low)
+GPIO_PIN_NUMBERS = {
+    "down": 5,
+    "left": 2,
+    "up": 3,
+    "right": 4,
+    "esc": 6,
+    "select": 7,
+    "action1": 8,
+    "action2": 9,
+    "action3": 10,
 }
 
-def read_gpio_input():
-    """Reads GPIO input states with improved debounce logic and returns a dictionary of button states."""
-    initial_states = {key: pin.is_pressed for key, pin in GPIO_PINS.items()}
-    #sleep(0.02)  # Reduced debounce delay to 20ms for faster response
-    final_states = {key: pin.is_pressed for key, pin in GPIO_PINS.items()}
+# Environment variables that pick the input backend when nothing calls configure_input()
+INPUT_BACKEND_ENV = "ARCADE_INPUT"            # gpio (default), keyboard or replay
+REPLAY_FILE_ENV = "ARCADE_INPUT_REPLAY"       # Timeline played by the replay backend
+RECORD_FILE_ENV = "ARCADE_INPUT_RECORD"       # Write the polled edges to this timeline on cleanup
+
+class GPIOBackend:
+    """Real buttons through gpiozero. gpiozero is only imported when the backend starts."""
+
+    name = "gpio"
+
+    def __init__(self, pin_numbers=GPIO_PIN_NUMBERS):
+        self.pin_numbers = pin_numbers
+        self.pins = {}
+
+    def start(self, push):
+        from gpiozero import Button
+        for key, number in self.pin_numbers.items():
+            pin = Button(number, pull_up=True)
+            pin.when_pressed = self._edge_callback(push, key, True)
+            pin.when_released = self._edge_callback(push, key, False)
+            self.pins[key] = pin
+
+    def _edge_callback(self, push, key, is_pressed):
+        # Runs on gpiozero's thread
+        def on_edge():
+            push(key, is_pressed)
+        return on_edge
+
+    def pump(self):
+        pass  # Edges arrive through the callbacks
+
+    def read(self):
+        return {key: pin.is_pressed for key, pin in self.pins.items()}
+
+    def close(self):
+        for pin in self.pins.values():
+            pin.close()
+        self.pins = {}
+
+class KeyboardBackend:
+    """Maps keyboard keys onto the cabinet buttons for development machines."""
+
+    name = "keyboard"
+
+    def __init__(self, key_map=None):
+        import pygame
+        self._pygame = pygame
+        self.key_map = key_map or {
+            "down": pygame.K_DOWN,
+            "left": pygame.K_LEFT,
+            "up": pygame.K_UP,
+            "right": pygame.K_RIGHT,
+            "esc": pygame.K_ESCAPE,
+            "select": pygame.K_RETURN,
+            "action1": pygame.K_z,
+            "action2": pygame.K_x,
+            "action3": pygame.K_c,
+        }
+        self._held = dict.fromkeys(self.key_map, False)
+        self._push = None
+
+    def start(self, push):
+        self._push = push
+
+    def pump(self):
+        held = self.read()
+        for key, is_pressed in held.items():
+            if is_pressed != self._held[key]:
+                self._push(key, is_pressed)
+        self._held = held
+
+    def read(self):
+        pygame = self._pygame
+        try:
+            pygame.event.pump()  # Keeps key state current even in loops that never call event.get()
+            keys = pygame.key.get_pressed()
+        except pygame.error:
+            # No display yet, so no keyboard either
+            return dict.fromkeys(self.key_map, False)
+        return {key: bool(keys[code]) for key, code in self.key_map.items()}
+
+    def close(self):
+        pass
+
+class ReplayBackend:
+    """Plays back a recorded button timeline, one entry per edge.
+
+    A timeline is a JSON list of [frame, key, pressed] entries, where `frame`
+    counts poll() calls. Replays are deterministic for loops that poll once
+    per frame (Bullet Hell polls once per simulation step), so they can drive
+    headless load tests. `loop` restarts the
+    timeline after its last entry.
+    """
+
+    name = "replay"
+
+    def __init__(self, timeline, keys=GPIO_PIN_NUMBERS, loop=False):
+        self.timeline = sorted((int(frame), key, bool(pressed)) for frame, key, pressed in timeline)
+        self.keys = list(keys)
+        self.loop = loop
+        self._held = dict.fromkeys(self.keys, False)
+        self._push = None
+        self._frame = 0
+        self._next = 0
+
+    @classmethod
+    def from_file(cls, path, loop=False):
+        with open(path, 'r') as f:
+            return cls(json.load(f), loop=loop)
+
+    def start(self, push):
+        self._push = push
 
-    # Only return states that remained consistent during the debounce period
-    return {key: state for key, state in final_states.items() if state == initial_states[key]}
+    def pump(self):
+        timeline = self.timeline
+        while self._next < len(timeline) and timeline[self._next][0] <= self._frame:
+            _, key, is_pressed = timeline[self._next]
+            self._held[key] = is_pressed
+            self._push(key, is_pressed)
+            self._next += 1
+        self._frame += 1
+        if self.loop and timeline and self._next >= len(timeline):
+            self._frame = 0
+            self._next = 0
+
+    def read(self):
+        return dict(self._held)
+
+    def close(self):
+        pass
+
+class InputState:
+    """Button states for one frame.
+
+    `held` is the state after the frame's edges were applied. `pressed` and
+    `released` are True for buttons with at least one edge of that kind since
+    the previous poll, so a tap shorter than a frame still shows up as pressed.
+    `events` holds the raw (timestamp, key, is_pressed) edges in arrival order.
+    """
+
+    def __init__(self, held, pressed, released, events=()):
+        self.held = held
+        self.pressed = pressed
+        self.released = released
+        self.events = events
+
+class InputService:
+    """Collects button edges from an input backend instead of polling pins.
+
+    Backends push edges, possibly from another thread, into a bounded deque
+    (append and popleft are atomic, so no lock is needed). The game loop calls
+    poll() once per frame to drain the edges into an InputState; everything
+    else in that frame reads current().
+    """
+
+    def __init__(self, backend, max_events=256, record_path=None):
+        self.backend = backend
+        self._events = deque(maxlen=max_events)  # Oldest edges are dropped if nobody polls
+        self._frame = 0
+        self.record_path = record_path
+        self._recording = [] if record_path else None
+        backend.start(self._push)
+        self._held = backend.read()
+        self._state = InputState(dict(self._held), dict.fromkeys(self._held, False),
+                                 dict.fromkeys(self._held, False))
+
+    def _push(self, key, is_pressed):
+        self._events.append((monotonic(), key, is_pressed))
+
+    def poll(self):
+        """Drains pending edges and returns the new InputState."""
+        self.backend.pump()
+        held = self._held
+        pressed = dict.fromkeys(held, False)
+        released = dict.fromkeys(held, False)
+        events = []
+        popleft = self._events.popleft
+        while True:
+            try:
+                event = popleft()
+            except IndexError:
+                break
+            events.append(event)
+            _, key, is_pressed = event
+            held[key] = is_pressed
+            if is_pressed:
+                pressed[key] = True
+            else:
+                released[key] = True
+            if self._recording is not None:
+                self._recording.append([self._frame, key, is_pressed])
+        self._frame += 1
+        self._state = InputState(dict(held), pressed, released, events)
+        return self._state
+
+    def current(self):
+        """Returns the InputState from the last poll() without draining anything."""
+        return self._state
+
+    def close(self):
+        if self._recording is not None:
+            with open(self.record_path, 'w') as f:
+                json.dump(self._recording, f)
+        self.backend.close()
+
+def create_backend(name=None):
+    """Builds the backend named by `name` or $ARCADE_INPUT.
+
+    Without an explicit choice, GPIO is tried first and the keyboard is used
+    when gpiozero or the pins are unavailable (e.g. on a dev machine).
+    """
+    explicit = name or os.environ.get(INPUT_BACKEND_ENV)
+    name = (explicit or "gpio").lower()
+    if name == "keyboard":
+        return KeyboardBackend()
+    if name == "replay":
+        path = os.environ.get(REPLAY_FILE_ENV)
+        if not path:
+            raise ValueError(f"{INPUT_BACKEND_ENV}=replay needs a timeline in ${REPLAY_FILE_ENV}")
+        return ReplayBackend.from_file(path)
+    if name != "gpio":
+        raise ValueError(f"Unknown input backend: {name}")
+
+    backend = GPIOBackend()
+    if explicit:
+        return backend
+    try:
+        backend.start(lambda key, is_pressed: None)  # Probe the pins once
+    except Exception as e:
+        log.warning("GPIO input unavailable (%s), using the keyboard", e)
+        backend.close()
+        return KeyboardBackend()
+    backend.close()
+    return backend
+
+input_service = None
+
+def configure_input(backend=None, max_events=256, record_path=None):
+    """Replaces the shared input service. `backend` is a backend object or name."""
+    global input_service
+    if input_service is not None:
+        input_service.close()
+    if backend is None or isinstance(backend, str):
+        backend = create_backend(backend)
+    input_service = InputService(backend, max_events, record_path or os.environ.get(RECORD_FILE_ENV))
+    return input_service
+
+def get_input_service():
+    """Returns the shared input service, creating it on first use."""
+    if input_service is None:
+        configure_input()
+    return input_service
+
+def poll_input():
+    """Advances the shared input service by one frame. Call once per frame from the active loop."""
+    return get_input_service().poll()
+
+def current_input():
+    """Returns the shared input state for the current frame."""
+    return get_input_service().current()
+
+def read_gpio_input():
+    """Reads the backend directly and returns a dictionary of button states (kept for older callers)."""
+    return get_input_service().backend.read()
 
 def cleanup_gpio():
     """Cleans up all GPIO resources."""
-    for pin in GPIO_PINS.values():
-        pin.close()
\ No newline at end of file
+    global input_service
+    if input_service is not None:
+        input_service.close()
+        input_service = None
+
+atexit.register(cleanup_gpio)
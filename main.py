@@ -3,7 +3,10 @@ import sys
 import os
 import random
 import subprocess
-from gpio_manager import read_gpio_input
+from gpio_manager import poll_input
+from game_registry import register_game, get_game, get_games
+from text_cache import render_text, get_font
+import procedural
 from time import sleep
 
 # Removed update_game_from_github and configure_wifi functions
@@ -16,10 +19,57 @@ sys.path.append(os.path.join(GAMES_DIR, 'GPT_o1'))
 sys.path.append(os.path.join(GAMES_DIR, 'Claude'))
 sys.path.append(os.path.join(GAMES_DIR, 'Gemini', 'Fighting'))  # Corrected path
 
-# Import the games
-from Games.GPT_o1.Bullethell import BulletHellGame
-from Games.Claude.rythmgame import main as rhythm_game_main
-from Games.Gemini.Fighting.fighting_game import FightingGame
+# Games are registered by module path and only imported when selected
+def launch_bullet_hell(menu, module):
+    sleep(0.5)
+    state = get_game("Bullet Hell").state
+    if 'game' not in state:
+        state['game'] = module.BulletHellGame()  # Built once, so its assets only load when needed
+    state['game'].run()
+
+def launch_rhythm_game(menu, module):
+    module.main()
+
+def launch_fighting_game(menu, module):
+    sleep(0.5)
+    fighting_game = module.FightingGame(menu.screen, menu.clock)
+    fighting_game.run()
+
+def draw_bullet_hell_graphic(menu, rect):
+    # Space themed graphic filling the entire rectangle.
+    menu.screen.blit(procedural.vertical_gradient(rect.size, (10, 10, 20), (10, 10, 55)), rect.topleft)
+    planet_center = (rect.centerx, rect.centery)
+    planet_radius = min(rect.width, rect.height) // 3
+    pygame.draw.circle(menu.screen, (100, 50, 150), planet_center, planet_radius)
+    pygame.draw.circle(menu.screen, (0, 255, 255), planet_center, planet_radius, 3)
+
+def draw_rhythm_game_graphic(menu, rect):
+    # Vaporwave themed graphic filling the rectangle.
+    menu.screen.fill((20, 0, 40), rect)
+    num_lines = 6
+    for i in range(1, num_lines):
+        y = rect.top + i * rect.height // num_lines
+        pygame.draw.line(menu.screen, (255, 105, 180), (rect.left, y), (rect.right, y), 2)
+        x = rect.left + i * rect.width // num_lines
+        pygame.draw.line(menu.screen, (255, 105, 180), (x, rect.top), (x, rect.bottom), 2)
+    sun_center = (rect.centerx, rect.bottom - rect.height//4)
+    sun_radius = min(rect.width, rect.height) // 5
+    pygame.draw.circle(menu.screen, (255, 100, 100), sun_center, sun_radius)
+    pygame.draw.circle(menu.screen, (255, 255, 0), sun_center, sun_radius, 3)
+
+def draw_fighting_game_graphic(menu, rect):
+    # Fighting game themed graphic filling the rectangle.
+    menu.screen.fill((50, 50, 50), rect)
+    pygame.draw.rect(menu.screen, (255, 0, 0), rect, 5, border_radius=10)
+    text = render_text(menu.small_font, "Fighting Game", menu.WHITE)
+    text_rect = text.get_rect(center=(rect.centerx, rect.centery))
+    menu.screen.blit(text, text_rect)
+
+register_game("Bullet Hell", "Games.GPT_o1.Bullethell", launch_bullet_hell, draw_bullet_hell_graphic)
+register_game("Rhythm Game", "Games.Claude.rythmgame", launch_rhythm_game, draw_rhythm_game_graphic,
+              enabled=False)  # Removed Rhythm Game
+register_game("Fighting Game", "Games.Gemini.Fighting.fighting_game", launch_fighting_game,
+              draw_fighting_game_graphic)
 
 class GameMenu:
     def __init__(self, screen, clock):
@@ -34,78 +84,45 @@ class GameMenu:
         self.GRAY = (128, 128, 128)
         self.SELECTED_COLOR = (0, 255, 0)
         
-        # Menu options
-        self.options = ["Bullet Hell", "Fighting Game"]  # Removed Rhythm Game
+        # Menu options come from the game registry
+        self.options = [entry.name for entry in get_games()]
         self.selected = 0
+        self.warm_up = True  # Import the highlighted game in the background
         
         # Font
-        self.font = pygame.font.Font(None, 64)
-        self.small_font = pygame.font.Font(None, 32)
+        self.font = get_font(None, 64)
+        self.small_font = get_font(None, 32)
         
         # Game states
         self.running = True
         self.in_menu = True
         self.clock = clock
 
-        self.last_gpio_states = {}  # To track previous GPIO states for debouncing
+        self.gpio_states = {}
 
     def update_gpio_states(self):
-        """Continuously updates GPIO states for use in the game."""
-        current_states = read_gpio_input()
-        self.gpio_states = {
-            key: current_states[key] and not self.last_gpio_states.get(key, False)
-            for key in current_states
-        }  # Only register a press if it wasn't pressed in the last state
-        self.last_gpio_states = current_states
+        """Polls the input service once for this frame; menus act on new presses only."""
+        self.gpio_states = poll_input().pressed
 
     def draw_background(self):
-        # Retro styled background: vertical gradient only.
-        for y in range(self.SCREEN_HEIGHT):
-            # Gradient from dark purple to navy-blue for retro feel
-            r = 40
-            g = max(0, 20 - y // 30)
-            b = min(150 + y // 2, 255)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (self.SCREEN_WIDTH, y))
+        # Retro styled background: vertical gradient only, from dark purple to navy-blue.
+        # Blue saturates ~44% of the way down, as the old per-scanline formula did.
+        background = procedural.build((self.SCREEN_WIDTH, self.SCREEN_HEIGHT),
+                                      procedural.gradient(((40, 20, 150), (40, 13, 255), (40, 4, 255)),
+                                                          (0.0, 0.44, 1.0)))
+        self.screen.blit(background, (0, 0))
 
     def draw_option_graphic(self, option, rect):
-        if option == "Bullet Hell":
-            # Space themed graphic filling the entire rectangle.
-            for y in range(rect.top, rect.bottom):
-                intensity = 20 + int(35 * ((y - rect.top) / rect.height))
-                pygame.draw.line(self.screen, (10, 10, intensity), (rect.left, y), (rect.right, y))
-            planet_center = (rect.centerx, rect.centery)
-            planet_radius = min(rect.width, rect.height) // 3
-            pygame.draw.circle(self.screen, (100, 50, 150), planet_center, planet_radius)
-            pygame.draw.circle(self.screen, (0, 255, 255), planet_center, planet_radius, 3)
-        
-        elif option == "Rhythm Game":
-            # Vaporwave themed graphic filling the rectangle.
-            self.screen.fill((20, 0, 40), rect)
-            num_lines = 6
-            for i in range(1, num_lines):
-                y = rect.top + i * rect.height // num_lines
-                pygame.draw.line(self.screen, (255, 105, 180), (rect.left, y), (rect.right, y), 2)
-                x = rect.left + i * rect.width // num_lines
-                pygame.draw.line(self.screen, (255, 105, 180), (x, rect.top), (x, rect.bottom), 2)
-            sun_center = (rect.centerx, rect.bottom - rect.height//4)
-            sun_radius = min(rect.width, rect.height) // 5
-            pygame.draw.circle(self.screen, (255, 100, 100), sun_center, sun_radius)
-            pygame.draw.circle(self.screen, (255, 255, 0), sun_center, sun_radius, 3)
-
-        elif option == "Fighting Game":
-            # Fighting game themed graphic filling the rectangle.
-            self.screen.fill((50, 50, 50), rect)
-            pygame.draw.rect(self.screen, (255, 0, 0), rect, 5, border_radius=10)
-            text = self.small_font.render("Fighting Game", True, self.WHITE)
-            text_rect = text.get_rect(center=(rect.centerx, rect.centery))
-            self.screen.blit(text, text_rect)
+        entry = get_game(option)
+        if entry is not None and entry.draw_graphic is not None:
+            entry.draw_graphic(self, rect)
 
     def draw_menu(self):
         self.draw_background()
         
         # Draw title with neon effect.
-        title_text = self.font.render("Game Selection", True, (0, 255, 255))
-        glow = self.font.render("Game Selection", True, (255, 20, 147))
+        title_text = render_text(self.font, "Game Selection", (0, 255, 255))
+        glow = render_text(self.font, "Game Selection", (255, 20, 147))
         title_rect = title_text.get_rect(center=(self.SCREEN_WIDTH/2, 80))
         self.screen.blit(glow, (title_rect.x+2, title_rect.y+2))
         self.screen.blit(title_text, title_rect)
@@ -119,12 +136,12 @@ class GameMenu:
             border_color = self.SELECTED_COLOR if i == self.selected else self.WHITE
             pygame.draw.rect(self.screen, border_color, rect, 3, border_radius=10)
             self.draw_option_graphic(option, rect)
-            text = self.small_font.render(option, True, border_color)
+            text = render_text(self.small_font, option, border_color)
             text_rect = text.get_rect(center=(rect.centerx, rect.centery))
             self.screen.blit(text, text_rect)
 
         # Draw instructions for game selection.
-        instructions = self.small_font.render("Press UP/DOWN to select, ENTER to start", True, self.WHITE)
+        instructions = render_text(self.small_font, "Press UP/DOWN to select, ENTER to start", self.WHITE)
         instr_rect = instructions.get_rect(center=(self.SCREEN_WIDTH//2, self.SCREEN_HEIGHT - 30))
         self.screen.blit(instructions, instr_rect)
                 
@@ -141,25 +158,17 @@ class GameMenu:
         return None
 
     def run(self):
-        bullet_hell_game = BulletHellGame()
         while self.running:
             if self.in_menu:
+                if self.warm_up:
+                    get_game(self.options[self.selected]).warm_up()
                 self.draw_menu()
                 action = self.handle_input()
-                if action == "Bullet Hell":
-                    sleep(0.5)
-                    self.in_menu = False
-                    bullet_hell_game.run()
-                    self.in_menu = True
-                elif action == "Rhythm Game":
-                    self.in_menu = False
-                    rhythm_game_main()
-                    self.in_menu = True
-                elif action == "Fighting Game":
-                    sleep(0.5)
+                entry = get_game(action) if action else None
+                if entry is not None:
+                    module = entry.load()
                     self.in_menu = False
-                    fighting_game = FightingGame(self.screen, self.clock)
-                    fighting_game.run()
+                    entry.launch(self, module)
                     self.in_menu = True
                 elif action == "Exit" or action == "QUIT":
                     self.running = False
@@ -0,0 +1,99 @@
+from functools import lru_cache
+
+import numpy as np
+import pygame
+
+# Backgrounds are built from layer specs, e.g.
+#     build((800, 480), gradient(((0, 0, 20), (0, 0, 80))), stars(200, seed=1))
+# Every spec is a plain tuple, so build() memoises on (size, layers) and a
+# background is only generated the first time it is asked for.
+
+def gradient(colors, positions=None):
+    """Vertical gradient through `colors`, spaced evenly unless `positions` (0..1, ascending) are given."""
+    colors = tuple(tuple(c) for c in colors)
+    if positions is None:
+        positions = tuple(i / (len(colors) - 1) for i in range(len(colors)))
+    return ('gradient', colors, tuple(positions))
+
+def tint(color, alpha):
+    """Blends `color` over everything below it, like blitting a filled surface with set_alpha(alpha)."""
+    return ('tint', tuple(color), alpha)
+
+def stars(count, seed=0, palette=((255, 255, 255),), radii=(1,)):
+    """`count` stars at seeded random positions, each with a random palette colour and radius."""
+    return ('stars', count, seed, tuple(tuple(c) for c in palette), tuple(radii))
+
+def converging_lines(color, spacing, top_y, target):
+    """Lines from every `spacing` px along row `top_y` to one `target` point (a perspective floor grid)."""
+    return ('lines', tuple(color), spacing, top_y, tuple(target))
+
+def _apply_gradient(pixels, colors, positions):
+    height = pixels.shape[1]
+    ratio = np.arange(height) / height
+    rows = np.stack([np.interp(ratio, positions, [c[i] for c in colors]) for i in range(3)], axis=1)
+    pixels[:] = rows.astype(np.uint8)[np.newaxis, :, :]
+
+def _apply_tint(pixels, color, alpha):
+    # Same integer blend SDL uses for per-surface alpha
+    blended = pixels.astype(np.int32)
+    blended += ((np.array(color, dtype=np.int32) - blended) * alpha) >> 8
+    pixels[:] = blended
+
+@lru_cache(maxsize=None)
+def _disc_offsets(radius):
+    """Pixel offsets pygame.draw.circle fills for a circle of `radius`."""
+    size = radius * 2 + 1
+    stamp = pygame.Surface((size, size))
+    pygame.draw.circle(stamp, (255, 255, 255), (radius, radius), radius)
+    xs, ys = np.nonzero(pygame.surfarray.pixels_red(stamp))
+    return xs - radius, ys - radius
+
+def _apply_stars(pixels, count, seed, palette, radii):
+    width, height = pixels.shape[:2]
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, width, count)
+    y = rng.integers(0, height, count)
+    colors = np.array(palette, dtype=np.uint8)[rng.integers(0, len(palette), count)]
+    radius = np.array(radii)[rng.integers(0, len(radii), count)]
+    for r in np.unique(radius).tolist():
+        mine = radius == r
+        dx, dy = _disc_offsets(r)
+        px = (x[mine][:, np.newaxis] + dx).ravel()
+        py = (y[mine][:, np.newaxis] + dy).ravel()
+        color = np.repeat(colors[mine], dx.size, axis=0)
+        inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        pixels[px[inside], py[inside]] = color[inside]
+
+def _apply_lines(pixels, color, spacing, top_y, target):
+    width = pixels.shape[0]
+    starts = np.arange(0, width + 1, spacing)
+    tx, ty = target
+    # Enough samples per line to touch every pixel along its longer axis
+    steps = int(max(np.abs(starts - tx).max(), abs(ty - top_y))) + 1
+    t = np.linspace(0.0, 1.0, steps)
+    px = np.rint(starts[:, np.newaxis] + (tx - starts[:, np.newaxis]) * t).astype(np.int64).ravel()
+    py = np.rint(top_y + (ty - top_y) * t).astype(np.int64)
+    py = np.broadcast_to(py, (starts.size, steps)).ravel()
+    inside = (px >= 0) & (px < width) & (py >= 0) & (py < pixels.shape[1])
+    pixels[px[inside], py[inside]] = color
+
+_LAYERS = {
+    'gradient': _apply_gradient,
+    'tint': _apply_tint,
+    'stars': _apply_stars,
+    'lines': _apply_lines,
+}
+
+@lru_cache(maxsize=32)
+def build(size, *layers):
+    """Renders the layers bottom to top onto a black surface. Results are shared: copy() before drawing on one."""
+    pixels = np.zeros((size[0], size[1], 3), dtype=np.uint8)
+    for kind, *args in layers:
+        _LAYERS[kind](pixels, *args)
+    return pygame.surfarray.make_surface(pixels)
+
+def vertical_gradient(size, top, bottom):
+    return build(tuple(size), gradient((top, bottom)))
+
+def clear_cache():
+    build.cache_clear()
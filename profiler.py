@@ -0,0 +1,200 @@
+import atexit
+import csv
+import json
+import os
+from collections import deque
+from time import perf_counter
+
+# ARCADE_PROFILE=1 records frame timings, ARCADE_PROFILE=overlay also shows them on screen.
+# ARCADE_PROFILE_DUMP=frames.json (or .csv) writes the recorded frames on exit.
+PROFILE_ENV = "ARCADE_PROFILE"
+PROFILE_DUMP_ENV = "ARCADE_PROFILE_DUMP"
+
+class _NullScope:
+    """Returned by scope() while profiling is off, so `with` blocks cost one call."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SCOPE = _NullScope()
+
+class _Scope:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        stack = self.profiler._stack
+        self.path = f"{stack[-1]}/{self.name}" if stack else self.name
+        stack.append(self.path)
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = perf_counter() - self.start
+        profiler = self.profiler
+        profiler._stack.pop()
+        scopes = profiler._current
+        scopes[self.path] = scopes.get(self.path, 0.0) + elapsed
+        return False
+
+class FrameProfiler:
+    """Per-frame timings for named, nestable scopes.
+
+    Call tick() once at the top of each frame and wrap hot paths in
+    `with profiler.scope("update"):`. Nested scopes are recorded as
+    "update/collide". The last `history` frames are kept in a ring buffer
+    for the overlay and for dump().
+    """
+
+    def __init__(self, history=300, enabled=False, overlay=False, dump_path=None):
+        self.history = history
+        self.enabled = enabled
+        self.overlay_visible = overlay
+        self.dump_path = dump_path
+        self.session = None
+        self.frames = deque(maxlen=history)  # (session, frame ms, {scope path: ms})
+        self._stack = []
+        self._current = {}
+        self._frame_start = None
+        self._stats = {}
+        self._stats_age = 0
+        self._font = None
+        self._toggle_key_down = False
+
+    def scope(self, name):
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def start_session(self, name):
+        """Marks the frames that follow as belonging to one game or screen."""
+        if not self.enabled:
+            return
+        self.session = name
+        self._frame_start = None
+        self._current = {}
+
+    def tick(self):
+        """Closes the previous frame and starts timing the next one."""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        if self._frame_start is not None:
+            scopes = {path: seconds * 1000 for path, seconds in self._current.items()}
+            self.frames.append((self.session, (now - self._frame_start) * 1000, scopes))
+            self._stats_age += 1
+        self._frame_start = now
+        self._current = {}
+        self._stack.clear()
+        self._poll_toggle_key()
+
+    def _poll_toggle_key(self):
+        # F3 toggles the overlay on keyboards; the cabinet uses ARCADE_PROFILE=overlay
+        import pygame
+        try:
+            down = pygame.key.get_pressed()[pygame.K_F3]
+        except pygame.error:
+            return
+        if down and not self._toggle_key_down:
+            self.overlay_visible = not self.overlay_visible
+        self._toggle_key_down = down
+
+    def stats(self):
+        """Returns {name: {mean, p50, p95, p99, max}} in ms for the frame total and every scope."""
+        import numpy as np
+        if not self.frames:
+            return {}
+        columns = {"frame": [frame_ms for _, frame_ms, _ in self.frames]}
+        for _, _, scopes in self.frames:
+            for path in scopes:
+                columns.setdefault(path, None)
+        for path in columns:
+            if path != "frame":
+                columns[path] = [scopes.get(path, 0.0) for _, _, scopes in self.frames]
+        stats = {}
+        for path, values in columns.items():
+            values = np.asarray(values)
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            stats[path] = {
+                "mean": float(values.mean()),
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(values.max()),
+            }
+        return stats
+
+    def draw_overlay(self, surface):
+        """Draws the frame-time graph and per-scope stats in the top-right corner. Returns the panel rect."""
+        if not (self.enabled and self.overlay_visible) or not self.frames:
+            return None
+        import pygame
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+        # Percentiles are recomputed twice a second, not every frame
+        if self._stats_age >= 30 or not self._stats:
+            self._stats = self.stats()
+            self._stats_age = 0
+
+        width, height = 200, 60
+        rows = [name for name in self._stats if name != "frame"]
+        panel = pygame.Rect(surface.get_width() - width - 10, 10, width, height + 16 * (len(rows) + 1) + 6)
+        backdrop = pygame.Surface(panel.size, pygame.SRCALPHA)
+        backdrop.fill((0, 0, 0, 170))
+        surface.blit(backdrop, panel.topleft)
+
+        # One bar per recorded frame; the line marks the 60 FPS budget
+        budget = 1000 / 60
+        scale = height / (budget * 2)
+        frames = list(self.frames)[-width:]
+        for i, (_, frame_ms, _) in enumerate(frames):
+            bar = min(height, frame_ms * scale)
+            color = (0, 220, 0) if frame_ms <= budget else (230, 60, 60)
+            x = panel.left + width - len(frames) + i
+            pygame.draw.line(surface, color, (x, panel.top + height), (x, panel.top + height - bar))
+        budget_y = panel.top + height - budget * scale
+        pygame.draw.line(surface, (255, 255, 0), (panel.left, budget_y), (panel.right, budget_y))
+
+        y = panel.top + height + 4
+        for name in ["frame"] + rows:
+            s = self._stats[name]
+            label = f"{name[-14:]:14} {s['mean']:5.2f} p95 {s['p95']:5.2f} p99 {s['p99']:5.2f}"
+            surface.blit(self._font.render(label, True, (255, 255, 255)), (panel.left + 4, y))
+            y += 16
+        return panel
+
+    def dump(self, path=None):
+        """Writes the recorded frames as JSON or CSV (picked by the file extension)."""
+        path = path or self.dump_path
+        if not path or not self.frames:
+            return
+        paths = sorted({p for _, _, scopes in self.frames for p in scopes})
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "session", "frame_ms"] + paths)
+                for i, (session, frame_ms, scopes) in enumerate(self.frames):
+                    writer.writerow([i, session, f"{frame_ms:.4f}"] + [f"{scopes.get(p, 0.0):.4f}" for p in paths])
+        else:
+            with open(path, "w") as f:
+                json.dump({
+                    "stats": self.stats(),
+                    "frames": [{"session": session, "frame_ms": frame_ms, "scopes": scopes}
+                               for session, frame_ms, scopes in self.frames],
+                }, f, indent=1)
+
+def _from_environment():
+    mode = os.environ.get(PROFILE_ENV, "").lower()
+    enabled = mode not in ("", "0", "off", "false")
+    frame_profiler = FrameProfiler(enabled=enabled, overlay=mode == "overlay",
+                                   dump_path=os.environ.get(PROFILE_DUMP_ENV))
+    if enabled and frame_profiler.dump_path:
+        atexit.register(frame_profiler.dump)
+    return frame_profiler
+
+# Shared by every game so the launcher and the games record into one buffer
+profiler = _from_environment()
@@ -0,0 +1,96 @@
+from collections import OrderedDict
+
+import pygame
+
+# Rendered text is kept until the cache holds this many bytes of pixels
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+class TextCache:
+    """LRU cache of rendered text surfaces plus a cache of Font objects.
+
+    HUDs and menus redraw the same handful of strings every frame, so
+    render() keys each surface on (font, text, colour, antialias,
+    background) and only calls Font.render on a miss. The least recently
+    used surfaces are evicted once `max_bytes` is exceeded. Returned
+    surfaces are shared: copy() one before changing it (e.g. set_alpha).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces = OrderedDict()
+        self._fonts = {}
+        self._quit_hooked = False
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def font(self, name=None, size=36, bold=False, italic=False, system=False):
+        """Returns a shared Font. `system=True` looks the name up with SysFont."""
+        key = (name, size, bold, italic, system)
+        font = self._fonts.get(key)
+        if font is None:
+            if not self._quit_hooked:
+                # Fonts die with pygame.quit(), and games call it before handing back to the launcher
+                pygame.register_quit(self._forget_fonts)
+                self._quit_hooked = True
+            if system:
+                font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+            else:
+                font = pygame.font.Font(name, size)
+                font.set_bold(bold)
+                font.set_italic(italic)
+            self._fonts[key] = font
+        return font
+
+    def render(self, font, text, color, antialias=True, background=None):
+        """Font.render with caching. The result must be treated as read-only."""
+        key = (font, text, tuple(color), antialias, None if background is None else tuple(background))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self._surfaces[key] = surface
+        self.bytes += surface.get_pitch() * surface.get_height()
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, old = self._surfaces.popitem(last=False)
+            self.bytes -= old.get_pitch() * old.get_height()
+            self.evictions += 1
+        return surface
+
+    def _forget_fonts(self):
+        self.clear()
+        self._fonts.clear()
+        self._quit_hooked = False
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._surfaces),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "fonts": len(self._fonts),
+        }
+
+    def clear(self):
+        """Drops every rendered surface (fonts are kept)."""
+        self._surfaces.clear()
+        self.bytes = 0
+
+# Shared by every game so menus and HUDs reuse each other's fonts and text
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True, background=None):
+    return text_cache.render(font, text, color, antialias, background)
+
+def get_font(name=None, size=36, bold=False, italic=False, system=False):
+    return text_cache.font(name, size, bold, italic, system)